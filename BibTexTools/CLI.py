@@ -1,6 +1,30 @@
+import os
+import time
+
 import click
 from BibTexTools.parser import Parser
-from BibTexTools.cleaner import Cleaner
+from BibTexTools.cleaner import DBLP_URL, Cleaner
+from BibTexTools.dedupe import THRESHOLD
+from BibTexTools.cache import DEFAULT_CACHE_DIR, DBLPCache
+from BibTexTools.client import (
+    CONNECT_TIMEOUT,
+    CRAWL_DELAY,
+    READ_TIMEOUT,
+    RETRIES,
+    HTTPClient,
+)
+from BibTexTools.journal import CleanJournal, FingerprintStore, default_journal_path
+from BibTexTools.metrics import Metrics
+from BibTexTools.snapshot import SnapshotCache
+from BibTexTools.offline import DBLPDump
+from BibTexTools.watch import (
+    DEBOUNCE,
+    FORMATS,
+    POLL_INTERVAL,
+    BuildError,
+    FileWatcher,
+    HotBibliography,
+)
 
 
 @click.group()
@@ -14,42 +38,318 @@ def cli():
 @click.option(
     "--keep_unknown", "-u", is_flag=True, help="Keep enties that can not be cleaned"
 )
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of publications requested concurrently",
+)
+@click.option(
+    "--cache_dir",
+    type=click.Path(file_okay=False),
+    default=DEFAULT_CACHE_DIR,
+    show_default=True,
+    help="Directory of the dblp response cache",
+)
+@click.option("--no_cache", is_flag=True, help="Do not cache dblp responses")
+@click.option(
+    "--connect_timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=CONNECT_TIMEOUT,
+    show_default=True,
+    help="Seconds to connect to dblp",
+)
+@click.option(
+    "--read_timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=READ_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for a dblp response",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=RETRIES,
+    show_default=True,
+    help="Number of retries of a failed request",
+)
+@click.option(
+    "--journal",
+    type=click.Path(dir_okay=False),
+    help="Checkpoint journal of the resolved entries  [default: a file per INPUT in "
+    "~/.cache/BibTexTools/journals]",
+)
+@click.option(
+    "--resume", "-r", is_flag=True, help="Skip entries resolved by an earlier run"
+)
+@click.option(
+    "--from_hit",
+    is_flag=True,
+    help="Build entries from the dblp search results, one request per entry",
+)
+@click.option(
+    "--dump",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Resolve entries offline from a dblp.xml(.gz) dump or its index",
+)
+@click.option(
+    "--fingerprints",
+    type=click.Path(dir_okay=False),
+    help="Sidecar file of cleaned entries, unchanged entries are not cleaned again",
+)
+@click.option(
+    "--base_url",
+    default=DBLP_URL,
+    show_default=True,
+    help="dblp instance to search, e.g. a local mock server, other instances are not cached",
+)
+@click.option(
+    "--crawl_delay",
+    type=click.FloatRange(min=0),
+    default=CRAWL_DELAY,
+    show_default=True,
+    help="Minimal average seconds between two requests, keep the default for dblp.org",
+)
+@click.option(
+    "--stats",
+    type=click.File("w"),
+    help="Write the time per stage, counters and request latencies as JSON",
+)
+@click.option(
+    "--profile", is_flag=True, help="Include the peak memory per stage in the stats"
+)
+@click.option(
+    "--no_snapshot",
+    is_flag=True,
+    help="Parse the input again instead of loading the snapshot of an earlier run",
+)
 @click.argument("output", type=click.File("w"))
-def clean(input, keep_keys, keep_unknown, output):
+def clean(
+    input,
+    keep_keys,
+    keep_unknown,
+    workers,
+    cache_dir,
+    no_cache,
+    connect_timeout,
+    read_timeout,
+    retries,
+    journal,
+    resume,
+    from_hit,
+    dump,
+    fingerprints,
+    base_url,
+    crawl_delay,
+    stats,
+    profile,
+    no_snapshot,
+    output,
+):
     """Clean a BibTex bibliography"""
+    metrics = Metrics(trace_memory=profile)
     # parse
-    parser_obj = Parser()
-    bib = parser_obj.from_file(input)
+    with metrics.stage("parse") as stage:
+        parser_obj = Parser()
+        snapshots = None if no_snapshot else SnapshotCache()
+        bib = parser_obj.from_file(input, snapshots=snapshots)
+        stage["entries"] = len(bib)
 
     # process
     click.echo(
         "Requesting citation metadata for {num_publications} publications, this may take a while..."
     )
-    cleaner_obj = Cleaner(keep_keys=keep_keys, keep_unknown=keep_unknown)
-    processed_bib = cleaner_obj.clean(bib)
+    dump_obj = None
+    if dump:
+        click.echo("Opening the dblp dump, the first run indexes it...")
+        dump_obj = DBLPDump.from_dump(dump)
+    # responses of a mock server must not end up in the cache of dblp
+    cache = None if no_cache or base_url != DBLP_URL else DBLPCache(cache_dir)
+    client = HTTPClient(
+        crawl_delay=crawl_delay,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries=retries,
+        pool_size=workers,
+    )
+    cleaner_obj = Cleaner(
+        keep_keys=keep_keys,
+        keep_unknown=keep_unknown,
+        workers=workers,
+        cache=cache,
+        client=client,
+        from_hit=from_hit,
+        dump=dump_obj,
+        base_url=base_url,
+        metrics=metrics,
+    )
+    journal_obj = CleanJournal(journal or default_journal_path(input), resume=resume)
+    if len(journal_obj):
+        click.echo(f"Resuming, {len(journal_obj)} entries were already resolved")
+    fingerprint_store = FingerprintStore(fingerprints) if fingerprints else None
+    with metrics.stage("clean", len(bib)):
+        processed_bib = cleaner_obj.clean(
+            bib, journal=journal_obj, fingerprints=fingerprint_store
+        )
+    client.close()
+    if cache:
+        cache.close()
+    if dump_obj:
+        dump_obj.close()
+    summary = client.stats.summary()
+    click.echo(
+        f"{summary['requests']} requests, {summary['retries']} retries, "
+        f"{summary['failures']} failures, latency p50 {summary['latency_p50']:.3f}s, "
+        f"p95 {summary['latency_p95']:.3f}s, max {summary['latency_max']:.3f}s",
+        err=True,
+    )
 
     # write
-    bibtex_str = processed_bib.to_bibtex()
-    output.write(bibtex_str)
+    with metrics.stage("write", len(processed_bib)):
+        processed_bib.write_bibtex(output)
+    if fingerprint_store:
+        fingerprint_store.save()
+    journal_obj.remove()
+    if stats:
+        metrics.write(stats, requests=client.stats)
 
 
 @cli.command()
 @click.argument("input", type=click.Path(exists=True))
 @click.option("--middle_names", "-m", is_flag=True, help="Include the middle names")
+@click.option(
+    "--stats",
+    type=click.File("w"),
+    help="Write the time per stage as JSON",
+)
+@click.option(
+    "--profile", is_flag=True, help="Include the peak memory per stage in the stats"
+)
+@click.option(
+    "--no_snapshot",
+    is_flag=True,
+    help="Parse the input again instead of loading the snapshot of an earlier run",
+)
 @click.argument("output", type=click.File("w"))
-def abbreviate_authors(input, middle_names, output):
+def abbreviate_authors(input, middle_names, stats, profile, no_snapshot, output):
     """Abbreviate the author names of a BibTex bibliography"""
+    metrics = Metrics(trace_memory=profile)
+    # parse
+    with metrics.stage("parse") as stage:
+        parser_obj = Parser()
+        snapshots = None if no_snapshot else SnapshotCache()
+        bib = parser_obj.from_file(input, snapshots=snapshots)
+        stage["entries"] = len(bib)
+
+    # process
+    with metrics.stage("abbreviate", len(bib)):
+        processed_bib = bib.abbreviate_names(middle_names)
+
+    # write
+    with metrics.stage("write", len(processed_bib)):
+        processed_bib.write_bibtex(output)
+    if stats:
+        metrics.write(stats)
+
+
+@cli.command()
+@click.argument("input", type=click.Path(exists=True))
+@click.option(
+    "--threshold",
+    "-t",
+    type=click.FloatRange(min=0, max=1),
+    default=THRESHOLD,
+    show_default=True,
+    help="Minimal similarity of the titles",
+)
+@click.option(
+    "--merge", "-m", is_flag=True, help="Add the fields of the removed duplicates"
+)
+@click.option(
+    "--no_snapshot",
+    is_flag=True,
+    help="Parse the input again instead of loading the snapshot of an earlier run",
+)
+@click.argument("output", type=click.File("w"))
+def dedupe(input, threshold, merge, no_snapshot, output):
+    """Remove duplicate entries from a BibTex bibliography"""
     # parse
     parser_obj = Parser()
-    bib = parser_obj.from_file(input)
+    snapshots = None if no_snapshot else SnapshotCache()
+    bib = parser_obj.from_file(input, snapshots=snapshots)
 
     # process
-    processed_bib = bib.abbreviate_names(middle_names)
+    groups = bib.find_duplicates(threshold)
+    for group in groups:
+        click.echo(" = ".join(entry.key.value for entry in group), err=True)  # type: ignore
+    click.echo(f"{len(groups)} groups of duplicates found", err=True)
+    processed_bib = bib.remove_duplicates(merge=merge, groups=groups)
 
     # write
-    bibtex_str = processed_bib.to_bibtex()
-    output.write(bibtex_str)
+    processed_bib.write_bibtex(output)
+
+
+@cli.command()
+@click.argument("input", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "-f",
+    "format_",
+    type=click.Choice(list(FORMATS)),
+    default="bibtex",
+    show_default=True,
+    help="Format of the output",
+)
+@click.option("--abbreviate", "-a", is_flag=True, help="Abbreviate the author names")
+@click.option("--middle_names", "-m", is_flag=True, help="Include the middle names")
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=POLL_INTERVAL,
+    show_default=True,
+    help="Seconds between two checks of the input",
+)
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0),
+    default=DEBOUNCE,
+    show_default=True,
+    help="Seconds the input has to stay unchanged before the output is written",
+)
+@click.argument("output", type=click.Path(dir_okay=False))
+def watch(input, format_, abbreviate, middle_names, interval, debounce, output):
+    """Write a BibTex bibliography again whenever it changes"""
+    if os.path.abspath(input) == os.path.abspath(output):
+        raise click.BadParameter("must differ from INPUT", param_hint="OUTPUT")
+    hot = HotBibliography(
+        input, output, format=format_, abbreviate=abbreviate, middle=middle_names
+    )
+    # watch before the first build to notice changes made while it runs
+    watcher = FileWatcher(input, interval=interval, debounce=debounce)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                changes = hot.build()
+            except (OSError, BuildError) as error:
+                click.echo(f"Could not update {output}: {error}", err=True)
+            else:
+                if changes is not None:
+                    _, removed, added = changes
+                    seconds = time.perf_counter() - start
+                    click.echo(
+                        f"{output} updated in {seconds:.2f}s, {len(hot.bibliography)} entries "
+                        f"({removed} removed, {added} added)",
+                        err=True,
+                    )
+            watcher.wait()
+    except KeyboardInterrupt:
+        pass
 
 
 cli.add_command(clean)
 cli.add_command(abbreviate_authors)
+cli.add_command(dedupe)
+cli.add_command(watch)
@@ -1,8 +1,13 @@
 from __future__ import annotations
-import json
+import sys
+import threading
 import warnings
-from dataclasses import dataclass, field
-from typing import Dict, List, Union, Any
+from collections import OrderedDict
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from BibTexTools import dedupe
+from BibTexTools.index import BibliographyIndex, YearRange
+from BibTexTools.writer import BibTexWriter, JSONLinesWriter, JSONWriter, RenderCache
 
 STANDARD_FIELDS = [
     "address",
@@ -29,6 +34,8 @@ STANDARD_FIELDS = [
     "type",
     "key",
 ]
+_STANDARD_FIELD_NAMES = frozenset(STANDARD_FIELDS)  # constant time lookups when parsing
+AUTHOR_POOL_SIZE = 100000  # distinct names kept by the author pool
 
 
 def extract_content_of_field(field_value: str) -> str:
@@ -46,13 +53,28 @@ def extract_content_of_field(field_value: str) -> str:
 
 
 class Author:
-    """Author name object."""
+    """Author name object.
+
+    Authors are interned by an `AuthorPool` and shared between entries, so they must not be
+    changed after they are created. `abbreviate` returns a new author instead.
+    """
 
-    def __init__(self, first, last):
+    __slots__ = ("first", "last", "mid", "name_string")
+
+    def __init__(
+        self,
+        first: str,
+        last: str,
+        mid: Optional[List[str]] = None,
+        name_string: Optional[str] = None,
+    ):
         self.first = first
         self.last = last
-        self.mid = []
-        self.name_string = self.make_name()
+        self.mid = mid if mid is not None else []
+        self.name_string = name_string if name_string is not None else self.make_name()
+
+    def __repr__(self) -> str:
+        return f"Author({self.name_string!r})"
 
     def make_name(self):
         return " ".join([self.first] + self.mid + [self.last])
@@ -64,7 +86,7 @@ class Author:
             middle (bool): True if the middle names should also be abbreviated.
 
         Returns:
-            str: Full abbreviated name string.
+            Author: New author with the abbreviated names.
         """
 
         def _abbreviate_name(name: str) -> str:
@@ -90,31 +112,155 @@ class Author:
             last = self.last.split(" ")[0]
         else:
             last = self.last
-        first_full = self.first
-        self.first = _abbreviate_name(self.first)
-        self.first_full = first_full
-        name_short = last + ", " + self.first
+        first = _abbreviate_name(self.first)
+        name_short = last + ", " + first
 
+        mid = self.mid
         if middle:
-            mid_short = []
-            for name in self.mid:
-                mid_short.append(_abbreviate_name(name))
-                name_short += " " + _abbreviate_name(name)
-            self.mid_full = self.mid
-            self.mid = mid_short
+            mid = [_abbreviate_name(name) for name in self.mid]
+            for name in mid:
+                name_short += " " + name
 
         if " Jr." in self.last:
             name_short += " Jr."
 
-        self.name_string_full = self.name_string
-        self.name_string = name_short
+        return Author(first, self.last, mid, name_short)
 
-        return self
+
+def parse_author(name: str) -> Author:
+    """Split a single name of an author list into an author object.
+
+    Args:
+        name (str): Name as "First Mid Last" or "Last, Mid, First".
+
+    Returns:
+        Author: Author object.
+    """
+    if "," in name:
+        author_parts = name.split(", ")
+
+        last = author_parts[0]
+        mid = author_parts[1:-1]
+        first = author_parts[-1]
+    else:
+        author_parts = name.split(
+            " "
+        )  # if author name is not comma seperated names are in order
+        first = author_parts[0]
+        mid = []
+        last = author_parts[-1]
+        for part in author_parts[1:-1]:
+            if part.lower() == "von":
+                last = part + " " + last
+            else:
+                mid.append(part)
+    # the name string has always left out the middle names
+    return Author(first, last, mid, " ".join([first, last]))
+
+
+class AuthorPool:
+    """Bounded pool of interned authors with memoized abbreviations.
+
+    The same name string always yields the same author object, and the abbreviation of an
+    author is computed once and then looked up. Both tables keep the `maxsize` most recently
+    used items. The pool is thread-safe.
+    """
+
+    def __init__(self, maxsize: int = AUTHOR_POOL_SIZE):
+        """Create an empty pool.
+
+        Args:
+            maxsize (int, optional): Maximal number of authors and of abbreviations kept.
+                Defaults to AUTHOR_POOL_SIZE.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._authors: OrderedDict[str, Author] = OrderedDict()
+        self._abbreviations: OrderedDict[Tuple, Author] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._authors)
+
+    def _lookup(self, table: OrderedDict, key: Any) -> Optional[Author]:
+        with self._lock:
+            author = table.get(key)
+            if author is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                table.move_to_end(key)
+            return author
+
+    def _store(self, table: OrderedDict, key: Any, author: Author) -> Author:
+        with self._lock:
+            # another thread may have stored the key in the meantime
+            author = table.setdefault(key, author)
+            if len(table) > self.maxsize:
+                table.popitem(last=False)
+            return author
+
+    def get(self, name: str) -> Author:
+        """Look up the author of a name string, parse it on the first use.
+
+        Args:
+            name (str): Name of an author as it appears in an author list.
+
+        Returns:
+            Author: Interned author object.
+        """
+        author = self._lookup(self._authors, name)
+        if author is None:
+            author = self._store(self._authors, name, parse_author(name))
+        return author
+
+    def abbreviate(self, author: Author, middle: bool) -> Author:
+        """Abbreviate an author, computing every abbreviation once.
+
+        Args:
+            author (Author): Author to be abbreviated.
+            middle (bool): True if the middle names should also be abbreviated.
+
+        Returns:
+            Author: Interned abbreviated author.
+        """
+        key = (author.first, tuple(author.mid), author.last, author.name_string, middle)
+        abbreviated = self._lookup(self._abbreviations, key)
+        if abbreviated is None:
+            abbreviated = self._store(
+                self._abbreviations, key, author.abbreviate(middle)
+            )
+        return abbreviated
+
+    def clear(self):
+        """Remove all authors and abbreviations."""
+        with self._lock:
+            self._authors.clear()
+            self._abbreviations.clear()
+
+
+# shared by the author fields of all bibliographies
+AUTHOR_POOL = AuthorPool()
+
+
+def warn_nonstandard_field(field_name: str):
+    """Warn if a field name is not one of the standard BibTex fields.
+
+    Args:
+        field_name (str): Name of the field.
+    """
+    if field_name not in _STANDARD_FIELD_NAMES:
+        warnings.warn(
+            UserWarning(f'Warning: "{field_name}" is not a standard Bibtex field')
+        )
 
 
 class Field:
     """BibTex field object containing a field name and a field value."""
 
+    __slots__ = ("name", "value")
+
     def __init__(self, name, value):
         self.name: str = name
         self.value: str = value
@@ -140,46 +286,42 @@ class Field:
 
 
 class Author_field(Field):
-    """Dedicated field for the author information."""
+    """Dedicated field for the author information.
+
+    The value is only split into author objects when the author list is used for the first time.
+    The field is serialized from the raw value until a new author list is assigned, changing the
+    list in place is not tracked.
+    """
+
+    __slots__ = ("_author_list", "_modified")
 
     def __init__(self, name, value):
         super().__init__(name, value)
-        self.author_list = self.split_authorlist()
+        self._author_list: Optional[List[Author]] = None
+        self._modified = False
+
+    @property
+    def author_list(self) -> List[Author]:
+        """List of author objects, split from the value on first access."""
+        if self._author_list is None:
+            self._author_list = self.split_authorlist()
+        return self._author_list
+
+    @author_list.setter
+    def author_list(self, author_list: List[Author]):
+        self._author_list = author_list
+        self._modified = True
 
     def split_authorlist(self) -> List[Author]:
         """Create a list of author objects from the value of the field.
 
+        Equal names share one author object from `AUTHOR_POOL`.
+
         Returns:
             List[Author]: List of author objects.
         """
-        author_list = []
         authors_str = extract_content_of_field(self.value)
-
-        for author in authors_str.split(" and "):
-            if "," in author:
-                author_parts = author.split(", ")
-
-                last = author_parts[0]
-                mid = author_parts[1:-1]
-                first = author_parts[-1]
-            else:
-                author_parts = author.split(
-                    " "
-                )  # if author name is not comma seperated names are in order
-                first = author_parts[0]
-                mid = []
-                last = author_parts[-1]
-                for name in author_parts[1:-1]:
-                    if name.lower() == "von":
-                        last = name + " " + last
-                    else:
-                        mid.append(name)
-
-            author_obj = Author(first, last)
-            author_obj.mid = mid
-            author_list.append(author_obj)
-
-        return author_list
+        return [AUTHOR_POOL.get(author) for author in authors_str.split(" and ")]
 
     def abbreviate(self, middle: bool) -> Author_field:
         """Abbreviate all authors from the author list.
@@ -188,21 +330,23 @@ class Author_field(Field):
             middle (bool): True if middle names should be included.
 
         Returns:
-            List[str]: List of abbreviated author names.
+            Author_field: New field with the abbreviated author list, this field is unchanged.
         """
-        author_list_abbreviated = []
-        for author in self.author_list:
-            author_list_abbreviated.append(author.abbreviate(middle))
-
-        self.author_list_abbreviated = author_list_abbreviated
-        return self
+        field = Author_field(self.name, self.value)
+        field.author_list = [
+            AUTHOR_POOL.abbreviate(author, middle) for author in self.author_list
+        ]
+        return field
 
     def to_bibtex(self) -> str:
-        """Serielize into a BibTex string.
+        """Serielize into a BibTex string. Fields without an assigned author list are serialized
+        from the raw value, reading the author list does not change the output.
 
         Returns:
             str: Field as BibTex string.
         """
+        if not self._modified:
+            return super().to_bibtex()
         return (
             self.name
             + " = {"
@@ -225,18 +369,73 @@ class Author_field(Field):
 class Journal_field(Field):
     """Dedicated field for journal information."""
 
+    __slots__ = ()
+
     def __init__(self, name, value):
         super().__init__(name, value)
 
     # def abbreviate(TODO):
 
 
-@dataclass
+# dedicated field classes, all other fields are plain fields
+FIELD_CLASSES: Dict[str, type] = {"author": Author_field, "journal": Journal_field}
+
+
 class Entry:
-    """Entry class representing a document in a BibTex bibliography."""
+    """Entry class representing a document in a BibTex bibliography.
 
-    string: str = ""
-    fields: List[str] = field(default_factory=list)
+    The fields are stored in a per-entry table with interned field names and can be accessed as
+    attributes, e.g. `entry.title.value`.
+    """
+
+    __slots__ = ("string", "_fields", "__dict__")
+    _fields: Dict[str, Field]
+
+    def __init__(self, string: str = ""):
+        object.__setattr__(self, "_fields", {})
+        self.string = string
+
+    @property
+    def fields(self) -> List[str]:
+        """Names of all fields in the order they were added."""
+        return list(self._fields)
+
+    def __getattr__(self, name: str) -> Field:
+        try:
+            return object.__getattribute__(self, "_fields")[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in Entry.__slots__ and name in self._fields:
+            self._fields[name] = value
+        else:
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Entry):
+            return NotImplemented
+        return self.string == other.string and [
+            (name, field.value) for name, field in self._fields.items()
+        ] == [(name, field.value) for name, field in other._fields.items()]
+
+    def __repr__(self) -> str:
+        return f"Entry(string={self.string!r}, fields={self.fields!r})"
+
+    def __copy__(self) -> Entry:
+        """Copy the entry with its own field table.
+
+        The fields themselves are shared, so operations like `abbreviate_names` that replace
+        fields leave the original entry unchanged, while changing the value of a field changes
+        both entries.
+        """
+        entry = type(self).__new__(type(self))
+        object.__setattr__(entry, "_fields", dict(self._fields))
+        object.__setattr__(entry, "string", self.string)
+        entry.__dict__.update(self.__dict__)
+        return entry
 
     def add_field(self, field_name: str, value: str):
         """Add a field to the entry to store information about the document. The field is added
@@ -246,20 +445,46 @@ class Entry:
             field_name (str): Field type.
             value (str): Value of the field.
         """
-        if field_name not in STANDARD_FIELDS:
-            warnings.warn(
-                UserWarning(f'Warning: "{field_name}" is not a standard Bibtex field')
+        warn_nonstandard_field(field_name)
+        field_name = sys.intern(field_name)
+        self._fields[field_name] = FIELD_CLASSES.get(field_name, Field)(
+            field_name, value
+        )
+
+    def copy_field(self, field: Field):
+        """Add a copy of a field of another entry, replacing a field of the same name. The name
+        is not checked again.
+
+        Args:
+            field (Field): Field to copy, it stays unchanged when the copy is changed.
+        """
+        copied = type(field)(field.name, field.value)
+        if isinstance(field, Author_field) and field._modified:
+            author_field = Author_field(field.name, field.value)
+            author_field.author_list = list(field.author_list)
+            copied = author_field
+        self._fields[field.name] = copied
+
+    @classmethod
+    def from_fields(cls, fields: Iterable[Tuple[str, str]], string: str = "") -> Entry:
+        """Create an entry from field names and values without checking the names.
+
+        Args:
+            fields (Iterable[Tuple[str, str]]): Field names and values, including the "type" and
+                "key" pseudo fields.
+            string (str, optional): Raw string of the entry. Defaults to "".
+
+        Returns:
+            Entry: Entry with the fields in the given order.
+        """
+        entry = cls(string)
+        entry_fields = entry._fields
+        for field_name, value in fields:
+            field_name = sys.intern(field_name)
+            entry_fields[field_name] = FIELD_CLASSES.get(field_name, Field)(
+                field_name, value
             )
-        if field_name == "author":
-            field = Author_field(field_name, value)
-            setattr(self, field_name, field)
-        elif field_name == "journal":
-            field = Journal_field(field_name, value)  # type: ignore
-            setattr(self, field_name, field)
-        else:
-            field = Field(field_name, value)  # type: ignore
-            setattr(self, field_name, field)
-        self.fields.append(field_name)
+        return entry
 
     def to_bibtex(self, fields: List[str] = []) -> str:
         """Serialize the full Entry object into a BibTex string.
@@ -274,7 +499,7 @@ class Entry:
         for field in fields:
             if field in ["key", "type"]:
                 continue
-            bibtex.append(self.__getattribute__(field).to_bibtex())
+            bibtex.append(getattr(self, field).to_bibtex())
 
         return ",\n".join(
             ["@" + self.type.value + "{" + self.key.value] + bibtex + ["}"]  # type: ignore
@@ -291,10 +516,10 @@ class Entry:
         if fields == []:
             fields = self.fields
 
-        for field in set(fields):
+        for field in dict.fromkeys(fields):  # unique fields in their order
             if field == "key":
                 continue
-            bibtex = {**bibtex, **self.__getattribute__(field).to_dict()}  # join dicts
+            bibtex.update(getattr(self, field).to_dict())
         return {self.key.value: bibtex}  # type: ignore
 
     def abbreviate_names(self, middle: bool) -> Entry:
@@ -316,11 +541,296 @@ class Entry:
     #   TODO
 
 
-@dataclass
+class EntryList(list):
+    """List of entries that keeps the citation-key index of its bibliography in sync.
+
+    Entries removed by `del bibliography[key]` are dropped from the list before it is changed,
+    also through references to the list that were taken before the removal.
+    """
+
+    __slots__ = ("_bibliography",)
+
+    def __init__(self, bibliography: Bibliography, entries: Iterable[Entry] = ()):
+        super().__init__(entries)
+        self._bibliography = bibliography
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def _compact(self):
+        if self._bibliography._removed:
+            self._bibliography._compact()
+
+    def append(self, entry: Entry):
+        self._compact()
+        super().append(entry)
+        self._bibliography._index_entry(entry)
+
+    def extend(self, entries: Iterable[Entry]):
+        self._compact()
+        entries = list(entries)
+        super().extend(entries)
+        for entry in entries:
+            self._bibliography._index_entry(entry)
+
+    def __iadd__(self, entries: Iterable[Entry]) -> EntryList:  # type: ignore
+        self.extend(entries)
+        return self
+
+    def insert(self, index: int, entry: Entry):  # type: ignore
+        self._compact()
+        super().insert(index, entry)
+        self._bibliography._index_entry(entry)
+
+    def __setitem__(self, index, value):
+        self._compact()
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        added = list(value) if isinstance(index, slice) else [value]
+        super().__setitem__(index, added if isinstance(index, slice) else value)
+        for entry in removed:
+            self._bibliography._unindex_entry(entry)
+        for entry in added:
+            self._bibliography._index_entry(entry)
+
+    def __delitem__(self, index):
+        self._compact()
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for entry in removed:
+            self._bibliography._unindex_entry(entry)
+
+    def pop(self, index: int = -1) -> Entry:  # type: ignore
+        self._compact()
+        entry = super().pop(index)
+        self._bibliography._unindex_entry(entry)
+        return entry
+
+    def remove(self, entry: Entry):
+        self._compact()
+        del self[self.index(entry)]
+
+    def clear(self):
+        super().clear()
+        self._bibliography._removed.clear()
+        self._bibliography._keys.clear()
+        self._bibliography._secondary = None
+
+
 class Bibliography:
-    """Bibliography object representing the full BibTex bibliography."""
+    """Bibliography object representing the full BibTex bibliography.
+
+    The entries are indexed by their citation key, the index is kept in sync with the `entries`
+    list. Entries can be looked up with `bibliography[key]`, checked with `key in bibliography`
+    and removed with `del bibliography[key]`. Secondary indexes over year, author, type and venue
+    are built by the first `query` and kept in sync from then on.
+    """
+
+    def __init__(self, entries: Optional[List[Entry]] = None):
+        self.entries = entries if entries is not None else []
+
+    @property
+    def entries(self) -> List[Entry]:
+        """List of all entries in the bibliography."""
+        if self._removed:
+            self._compact()
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries: List[Entry]):
+        self._keys: Dict[str, List[Entry]] = {}
+        self._removed: Set[int] = set()  # ids of entries removed from the index only
+        self._secondary: Optional[BibliographyIndex] = None
+        self._entries = EntryList(self, entries)
+        for entry in self._entries:
+            self._index_entry(entry)
+
+    def __reduce__(self):
+        return (type(self), (list(self.entries),))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Bibliography):
+            return NotImplemented
+        return list(self.entries) == list(other.entries)
+
+    def __repr__(self) -> str:
+        return f"Bibliography(entries={list(self.entries)!r})"
+
+    def __len__(self) -> int:
+        return len(self._entries) - len(self._removed)
+
+    def __iter__(self) -> Iterator[Entry]:
+        return iter(self.entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __getitem__(self, key: str) -> Entry:
+        """Return the first entry with the given citation key.
+
+        Args:
+            key (str): Citation key.
+
+        Raises:
+            KeyError: No entry has the citation key.
+
+        Returns:
+            Entry: Entry with the citation key.
+        """
+        return self._keys[key][0]
+
+    def __delitem__(self, key: str):
+        """Remove all entries with the given citation key.
+
+        The entries are dropped from the index right away and from the `entries` list the next
+        time it is used, so removing many entries does not shift the list every time.
+
+        Args:
+            key (str): Citation key.
+
+        Raises:
+            KeyError: No entry has the citation key.
+        """
+        for entry in self._keys.pop(key):
+            self._removed.add(id(entry))
+            if self._secondary is not None:
+                self._secondary.remove(entry)
+
+    def get(self, key: str, default: Optional[Entry] = None) -> Optional[Entry]:
+        """Return the first entry with the given citation key or a default value.
+
+        Args:
+            key (str): Citation key.
+            default (Optional[Entry], optional): Value returned for unknown keys. Defaults to None.
+
+        Returns:
+            Optional[Entry]: Entry with the citation key or the default value.
+        """
+        entries = self._keys.get(key)
+        return entries[0] if entries else default
+
+    def add_entry(self, entry: Entry):
+        """Append an entry to the bibliography and add it to the index.
+
+        Args:
+            entry (Entry): Entry to be added.
+        """
+        self.entries.append(entry)
+
+    def duplicate_keys(self) -> List[str]:
+        """Find all citation keys that are used by more than one entry.
+
+        Returns:
+            List[str]: Duplicated citation keys.
+        """
+        return [key for key, entries in self._keys.items() if len(entries) > 1]
+
+    def find_duplicates(self, threshold: float = dedupe.THRESHOLD) -> List[List[Entry]]:
+        """Find entries describing the same publication under different keys or spellings.
+
+        Titles are compared after removing case, braces, LaTeX commands and accents. Candidate
+        pairs are found by MinHash/LSH over the title shingles in near-linear time and verified
+        by the title similarity, the year and the author last names.
+
+        Args:
+            threshold (float, optional): Minimal Jaccard similarity of the title shingles.
+                Defaults to dedupe.THRESHOLD.
+
+        Returns:
+            List[List[Entry]]: Groups of duplicates in the order of the entries.
+        """
+        return dedupe.find_duplicates(self.entries, threshold)
+
+    def remove_duplicates(
+        self,
+        threshold: float = dedupe.THRESHOLD,
+        merge: bool = False,
+        groups: Optional[List[List[Entry]]] = None,
+    ) -> Bibliography:
+        """Keep only the first entry of every group of duplicates.
 
-    entries: List[Entry] = field(default_factory=list)
+        Args:
+            threshold (float, optional): Minimal Jaccard similarity of the title shingles.
+                Defaults to dedupe.THRESHOLD.
+            merge (bool, optional): Add the fields only the dropped duplicates have to the kept
+                entry. Defaults to False.
+            groups (Optional[List[List[Entry]]], optional): Groups found by `find_duplicates`
+                before. Defaults to finding the groups.
+
+        Returns:
+            Bibliography: The bibliography without duplicates.
+        """
+        dropped: Set[int] = set()
+        if groups is None:
+            groups = self.find_duplicates(threshold)
+        for group in groups:
+            if merge:
+                dedupe.merge_entries(group)
+            dropped.update(id(entry) for entry in group[1:])
+        self.entries = [entry for entry in self.entries if id(entry) not in dropped]
+        return self
+
+    def build_indexes(self):
+        """Build the secondary indexes over year, author last name, type and venue."""
+        self._secondary = BibliographyIndex()
+        for entry in self.entries:
+            self._secondary.add(entry)
+
+    def query(
+        self,
+        author: Optional[str] = None,
+        year: Optional[YearRange] = None,
+        entry_type: Optional[str] = None,
+        venue: Optional[str] = None,
+    ) -> List[Entry]:
+        """Select entries by author, year, type and venue using the secondary indexes.
+
+        The cost depends on the number of matching entries, not on the size of the bibliography.
+        Names, types and venues are compared case-insensitively and without braces or accents.
+
+        Args:
+            author (Optional[str], optional): Last name of one of the authors. Defaults to None.
+            year (Optional[YearRange], optional): Year or inclusive (first, last) range of years,
+                a bound may be None. Defaults to None.
+            entry_type (Optional[str], optional): BibTex type, e.g. "article". Defaults to None.
+            venue (Optional[str], optional): Journal or booktitle. Defaults to None.
+
+        Returns:
+            List[Entry]: Matching entries in the order they were added.
+        """
+        if self._secondary is None:
+            self.build_indexes()
+        return self._secondary.query(author, year, entry_type, venue)  # type: ignore
+
+    def reindex(self):
+        """Rebuild the index, e.g. after citation keys were changed in place."""
+        self.entries = list(self.entries)
+
+    def _index_entry(self, entry: Entry):
+        key = entry._fields.get("key")  # without the cost of a failed attribute lookup
+        if key is not None:
+            self._keys.setdefault(key.value, []).append(entry)
+        if self._secondary is not None:
+            self._secondary.add(entry)
+
+    def _unindex_entry(self, entry: Entry):
+        if self._secondary is not None:
+            self._secondary.remove(entry)
+        key = entry._fields.get("key")
+        if key is None or key.value not in self._keys:
+            return
+        entries = self._keys[key.value]
+        for position, indexed_entry in enumerate(entries):
+            if indexed_entry is entry:
+                del entries[position]
+                break
+        if not entries:
+            del self._keys[key.value]
+
+    def _compact(self):
+        removed = self._removed
+        self._removed = set()
+        entries = [entry for entry in self._entries if id(entry) not in removed]
+        list.__setitem__(self._entries, slice(None), entries)
 
     def to_bibtex(self, fields: List[str] = []) -> str:
         """Serialize the bibliography object into a BibTex string.
@@ -334,6 +844,23 @@ class Bibliography:
             bibtex.append(entry.to_bibtex(fields))
         return "\n\n\n".join(bibtex)
 
+    def write_bibtex(
+        self,
+        fileobj: IO[str],
+        fields: List[str] = [],
+        cache: Optional[RenderCache] = None,
+    ):
+        """Write the bibliography entry by entry as BibTex into a file object.
+
+        Args:
+            fileobj (IO[str]): File object opened in text mode.
+            fields (List[str], optional): Fields to be written. Defaults to all fields.
+            cache (Optional[RenderCache], optional): Rendered entries of earlier writes.
+                Defaults to None.
+        """
+        assert len(self.entries) >= 1
+        BibTexWriter(fileobj, fields, cache=cache).write_all(self.entries)
+
     def to_bib(self, path: str, fields: List[str] = []):
         """Write the bibliography into a .bib file.
 
@@ -341,7 +868,38 @@ class Bibliography:
             path (str): Path to the bib file to write to.
         """
         with open(path, "w") as fout:
-            fout.write(self.to_bibtex(fields))
+            self.write_bibtex(fout, fields)
+
+    def write_json(
+        self,
+        fileobj: IO[str],
+        fields: List[str] = [],
+        cache: Optional[RenderCache] = None,
+    ):
+        """Write the bibliography entry by entry as JSON object into a file object.
+
+        Like in a dictionary, entries with a duplicated citation key are written once, at the
+        position of the first entry with the key and with the fields of the last one.
+
+        Args:
+            fileobj (IO[str]): File object opened in text mode.
+            fields (List[str], optional): Fields to be written. Defaults to all fields.
+            cache (Optional[RenderCache], optional): Rendered entries of earlier writes.
+                Defaults to None.
+        """
+        assert len(self.entries) >= 1
+        duplicates = set(self.duplicate_keys())
+        written = set()
+
+        with JSONWriter(fileobj, fields, cache=cache) as writer:
+            for entry in self.entries:
+                key = entry.key.value  # type: ignore
+                if key in duplicates:
+                    if key in written:
+                        continue
+                    written.add(key)
+                    entry = self._keys[key][-1]
+                writer.write(entry)
 
     def to_json(self, path: str, fields: List[str] = []):
         """Write the bibliography into a JSON file.
@@ -349,13 +907,34 @@ class Bibliography:
         Args:
             path (str): Path to the JSON file.
         """
-        bibtex: Dict[str, Any] = {}
+        with open(path, "w") as fout:
+            self.write_json(fout, fields)
+
+    def write_jsonl(
+        self,
+        fileobj: IO[str],
+        fields: List[str] = [],
+        cache: Optional[RenderCache] = None,
+    ):
+        """Write the bibliography as JSON Lines, one entry per line, into a file object.
+
+        Args:
+            fileobj (IO[str]): File object opened in text mode.
+            fields (List[str], optional): Fields to be written. Defaults to all fields.
+            cache (Optional[RenderCache], optional): Rendered entries of earlier writes.
+                Defaults to None.
+        """
         assert len(self.entries) >= 1
-        for entry in self.entries:
-            bibtex = {**bibtex, **entry.to_dict(fields)}
+        JSONLinesWriter(fileobj, fields, cache=cache).write_all(self.entries)
+
+    def to_jsonl(self, path: str, fields: List[str] = []):
+        """Write the bibliography into a JSON Lines file with one entry per line.
 
+        Args:
+            path (str): Path to the JSON Lines file.
+        """
         with open(path, "w") as fout:
-            json.dump(bibtex, fout, indent=4)
+            self.write_jsonl(fout, fields)
 
     def abbreviate_names(self, middle: bool) -> Bibliography:
         """Abbreviate all author names from all entries.
@@ -0,0 +1,172 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "BibTexTools")
+CACHE_FILE = "dblp.sqlite"
+TTL = 30 * 24 * 60 * 60  # seconds
+NEGATIVE_TTL = 24 * 60 * 60  # seconds
+MAX_ENTRIES = 100000
+EVICTION_RATIO = 0.9  # share of the entries kept after an eviction
+
+SEARCH = "search"
+BIBTEX = "bibtex"
+
+
+class DBLPCache:
+    """Persistent SQLite cache for dblp search results and BibTex responses.
+
+    Search results are stored as title -> search hit, where titles that dblp does not know are
+    cached as negative results with their own, usually shorter, time to live. BibTex responses
+    are stored as publication URL -> BibTex string. Expired entries are ignored, and once the cache
+    holds more than `max_entries` entries the least recently used ones are evicted. The cache
+    can be shared by multiple threads.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        ttl: float = TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        """Open or create the cache.
+
+        Args:
+            directory (str, optional): Directory of the cache file. Defaults to DEFAULT_CACHE_DIR.
+            ttl (float, optional): Seconds a response is valid. Defaults to TTL.
+            negative_ttl (float, optional): Seconds an unknown title is valid. Defaults to NEGATIVE_TTL.
+            max_entries (int, optional): Maximal number of cached responses. Defaults to MAX_ENTRIES.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, CACHE_FILE)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT, "
+                "created REAL NOT NULL, accessed REAL NOT NULL, "
+                "PRIMARY KEY (kind, key))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+        self._size = self._count()
+
+    def _count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _get(self, kind: str, key: str) -> Tuple[bool, Optional[str]]:
+        """Look up a response.
+
+        Args:
+            kind (str): Kind of the response, SEARCH or BIBTEX.
+            key (str): Title or URL.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether a valid response was found and its value, None for
+                negative results.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created FROM responses WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+            if row is not None:
+                value, created = row
+                ttl = self.ttl if value is not None else self.negative_ttl
+                if now - created <= ttl:
+                    with self._connection:
+                        self._connection.execute(
+                            "UPDATE responses SET accessed = ? WHERE kind = ? AND key = ?",
+                            (now, kind, key),
+                        )
+                    self.hits += 1
+                    return True, value
+            self.misses += 1
+            return False, None
+
+    def _put(self, kind: str, key: str, value: Optional[str]):
+        """Store a response and evict the least recently used responses if the cache is full.
+
+        Args:
+            kind (str): Kind of the response, SEARCH or BIBTEX.
+            key (str): Title or URL.
+            value (Optional[str]): Response or None for negative results.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (kind, key, value, now, now),
+            )
+            self._size += 1
+            if self._size > self.max_entries:
+                self._size = self._count()
+            if self._size > self.max_entries:
+                keep = int(self.max_entries * EVICTION_RATIO)
+                self._connection.execute(
+                    "DELETE FROM responses WHERE rowid IN ("
+                    "SELECT rowid FROM responses ORDER BY accessed LIMIT ?)",
+                    (self._size - keep,),
+                )
+                self._size = keep
+
+    def get_search(self, title: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Look up the dblp search hit for a title.
+
+        Args:
+            title (str): Searched title.
+
+        Returns:
+            Tuple[bool, Optional[Dict[str, Any]]]: Whether the title is cached and the "info"
+                object of the best hit, None if dblp does not know the title.
+        """
+        found, value = self._get(SEARCH, title)
+        return found, json.loads(value) if value is not None else None
+
+    def put_search(self, title: str, info: Optional[Dict[str, Any]]):
+        """Store the dblp search hit for a title.
+
+        Args:
+            title (str): Searched title.
+            info (Optional[Dict[str, Any]]): "info" object of the best hit or None if dblp does
+                not know the title.
+        """
+        self._put(SEARCH, title, json.dumps(info) if info is not None else None)
+
+    def get_bibtex(self, url: str) -> Optional[str]:
+        """Look up the BibTex string of a publication.
+
+        Args:
+            url (str): URL of the publication site at dblp.
+
+        Returns:
+            Optional[str]: BibTex string or None if it is not cached.
+        """
+        return self._get(BIBTEX, url)[1]
+
+    def put_bibtex(self, url: str, bibtex: str):
+        """Store the BibTex string of a publication.
+
+        Args:
+            url (str): URL of the publication site at dblp.
+            bibtex (str): BibTex string.
+        """
+        self._put(BIBTEX, url, bibtex)
+
+    def close(self):
+        """Close the cache file."""
+        with self._lock:
+            self._connection.close()
@@ -1,85 +1,337 @@
+from __future__ import annotations
 import logging
-import time
-from typing import Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import requests
-
-from BibTexTools.bibliography import Bibliography
+from BibTexTools.bibliography import Bibliography, Entry
+from BibTexTools.cache import DBLPCache
+from BibTexTools.client import CRAWL_DELAY, HTTPClient
+from BibTexTools.journal import CleanJournal, FingerprintStore
+from BibTexTools.metrics import Metrics
 from BibTexTools.parser import Parser
 
+if TYPE_CHECKING:
+    from BibTexTools.offline import DBLPDump
+
+DBLP_URL = "https://dblp.org"
+BIBSOURCE = "dblp computer science bibliography, https://dblp.org"
+HIT_TYPES = {
+    "Journal Articles": "article",
+    "Conference and Workshop Papers": "inproceedings",
+}
+VENUE_FIELDS = {"article": "journal", "inproceedings": "booktitle"}
+REQUIRED_FIELDS = ["author", "title", "year"]
+# dblp numbers homonymous authors, e.g. "Wei Wang 0001"
+DISAMBIGUATION = re.compile(r"\s+\d{4}$")
+LATEX_SPECIAL = re.compile(r"(?<!\\)([&%#])")
+
+
+class DBLPUnavailable(Exception):
+    """dblp could not be reached or did not answer a request successfully."""
+
+
+def _hit_text(value: Any) -> Optional[str]:
+    """Take the text of a search hit value, which may be a list of values."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("text")
+    if value is None:
+        return None
+    return LATEX_SPECIAL.sub(r"\\\1", " ".join(str(value).split()))
+
+
+def entry_from_hit(info: Dict[str, Any]) -> Optional[Entry]:
+    """Build an entry from the "info" object of a dblp search hit.
+
+    The fields mirror the BibTex export of dblp, apart from fields the search API does not
+    provide like editors, publishers or the full proceedings title, where the short venue name
+    is used instead.
+
+    Args:
+        info (Dict[str, Any]): "info" object of a search hit.
+
+    Returns:
+        Optional[Entry]: Entry or None if the publication type or a required field is not
+            available in the hit.
+    """
+    key = info.get("key", "")
+    entry_type = HIT_TYPES.get(info.get("type", ""))
+    if key.startswith("journals/"):
+        # e.g. CoRR preprints are listed as informal publications
+        entry_type = "article"
+    if entry_type is None or isinstance(info.get("venue"), list):
+        return None
+
+    authors = info.get("authors", {}).get("author", [])
+    if isinstance(authors, dict):
+        authors = [authors]
+    names: List[str] = [
+        DISAMBIGUATION.sub("", _hit_text(author) or "") for author in authors
+    ]
+    title = _hit_text(info.get("title"))
+    fields = {
+        "author": " and ".join(name for name in names if name),
+        "title": title[:-1] if title and title.endswith(".") else title,
+        VENUE_FIELDS[entry_type]: _hit_text(info.get("venue")),
+        "volume": _hit_text(info.get("volume")),
+        "number": _hit_text(info.get("number")),
+        "pages": (_hit_text(info.get("pages")) or "").replace("-", "--") or None,
+        "year": _hit_text(info.get("year")),
+        "url": _hit_text(info.get("ee")),
+        "doi": _hit_text(info.get("doi")),
+        "biburl": info["url"] + ".bib",
+        "bibsource": BIBSOURCE,
+    }
+    if not all(fields[name] for name in REQUIRED_FIELDS + [VENUE_FIELDS[entry_type]]):
+        return None
+
+    entry = Entry()
+    entry.add_field("type", entry_type)
+    entry.add_field("key", "DBLP:" + key)
+    for name, value in fields.items():
+        if value:
+            entry.add_field(name, "{" + value + "}")
+    return entry
+
 
 class Cleaner:
     """Clean a bibliography by searchin the title in the DBLP."""
 
-    def __init__(self, keep_keys: bool = False, keep_unknown: bool = False):
+    def __init__(
+        self,
+        keep_keys: bool = False,
+        keep_unknown: bool = False,
+        workers: int = 1,
+        crawl_delay: float = CRAWL_DELAY,
+        cache: Optional[DBLPCache] = None,
+        client: Optional[HTTPClient] = None,
+        from_hit: bool = False,
+        dump: Optional[DBLPDump] = None,
+        base_url: str = DBLP_URL,
+        metrics: Optional[Metrics] = None,
+    ):
+        """Create a cleaner.
+
+        Args:
+            keep_keys (bool, optional): Keep the original citation keys. Defaults to False.
+            keep_unknown (bool, optional): Keep entries that can not be cleaned. Defaults to False.
+            workers (int, optional): Number of entries resolved concurrently. Defaults to 1.
+            crawl_delay (float, optional): Minimal average number of seconds between two requests
+                to dblp, shared by all workers. Defaults to CRAWL_DELAY.
+            cache (Optional[DBLPCache], optional): Cache for the dblp responses. Defaults to None.
+            client (Optional[HTTPClient], optional): Client to send the requests with, the crawl
+                delay is ignored if it is given. Defaults to a client with a connection per worker.
+            from_hit (bool, optional): Build the cleaned entries from the search hits and only
+                request the BibTex export of dblp if a hit lacks required fields. This halves the
+                number of requests, but the entries lack editors, publishers and full proceedings
+                titles. Defaults to False.
+            dump (Optional[DBLPDump], optional): Index of a local dblp dump, if given entries
+                are resolved from the dump without any requests. Defaults to None.
+            base_url (str, optional): URL of the dblp instance to search, e.g. a local mock
+                server. Defaults to DBLP_URL.
+            metrics (Optional[Metrics], optional): Metrics counting cache and journal hits and
+                the entries dblp does not know or that could not be requested. Defaults to None.
+        """
         self.keep_keys = keep_keys
         self.keep_unknown = keep_unknown
+        self.workers = workers
+        self.cache = cache
+        self.from_hit = from_hit
+        self.dump = dump
+        self.base_url = base_url.rstrip("/")
+        self.metrics = metrics
+        self.client = client or HTTPClient(
+            crawl_delay=crawl_delay, pool_size=max(workers, 1)
+        )
+
+    def _count(self, name: str):
+        if self.metrics is not None:
+            self.metrics.count(name)
 
-    def _search_publication(self, title: str) -> Optional[str]:
-        """Search the DBLP with title and retrieve the publication URL of the best match.
+    def _search_hit(self, title: str) -> Optional[Dict[str, Any]]:
+        """Search the DBLP with title and retrieve the "info" object of the best match.
 
         Args:
             title (str): The title of the publication.
 
         Returns:
-            str: URL of the publication site at DBLP or None if an error occured.
+            Optional[Dict[str, Any]]: Information about the publication or None if dblp does not
+                know the title.
+
+        Raises:
+            DBLPUnavailable: If the search request failed.
         """
-        url = f"https://dblp.org/search/publ/api?q={title}&format=json"
-        result = requests.get(url)
+        if self.cache:
+            found, info = self.cache.get_search(title)
+            self._count("cache_hits" if found else "cache_misses")
+            if found:
+                if info is None:
+                    logging.info(
+                        f'Info: Publication with the title "{title}" could not be found.'
+                    )
+                return info
+
+        result = self.client.get(
+            f"{self.base_url}/search/publ/api", params={"q": title, "format": "json"}
+        )
 
-        if result.status_code != 200:
+        if result is None or result.status_code != 200:
             logging.info(
                 f'Info: Publication with the title "{title}" could not be found.'
             )
-            return None
+            raise DBLPUnavailable(title)
 
-        if result.json()["result"]["hits"].get("hit"):
-            return result.json()["result"]["hits"]["hit"][0]["info"]["url"]
-        else:
+        hits = result.json()["result"]["hits"].get("hit")
+        info = hits[0]["info"] if hits else None
+        if self.cache:
+            self.cache.put_search(title, info)
+        if info is None:
             logging.info(
                 f'Info: Publication with the title "{title}" could not be found.'
             )
-            return None
+        return info
 
-    def _get_dblp_bibtext(self, url: str) -> Optional[str]:
+    def _get_dblp_bibtext(self, url: str) -> str:
         """Get the bibtext reference from a dblp publikation site URL.
         Args:
             url (str): URL to the publication site.
         Returns:
-            Optional[str]: Bibtex reference for the publication or None if an error occurred.
+            str: Bibtex reference for the publication.
+
+        Raises:
+            DBLPUnavailable: If the BibTex reference could not be retrieved.
         """
-        r = requests.get(url + ".bib")
-        if r.status_code == 200:
+        if self.cache:
+            if bibtex := self.cache.get_bibtex(url):
+                self._count("cache_hits")
+                return bibtex
+            self._count("cache_misses")
+
+        r = self.client.get(url + ".bib")
+        if r is not None and r.status_code == 200:
+            if self.cache:
+                self.cache.put_bibtex(url, r.text)
             return r.text
         else:
             logging.error(f'Error: Could not retrieve citation frum URL:"{url}".')
-            return None
+            raise DBLPUnavailable(url)
+
+    def _resolve_entry(
+        self, entry: Entry, journal: Optional[CleanJournal] = None
+    ) -> Optional[Entry]:
+        """Retrieve the dblp entry of an entry, from the journal if it was resolved before.
+
+        Args:
+            entry (Entry): Entry to be resolved.
+            journal (Optional[CleanJournal], optional): Checkpoint journal. Defaults to None.
+
+        Returns:
+            Optional[Entry]: dblp entry or None if dblp does not know the entry or is unavailable.
+        """
+        if journal is not None:
+            found, bibtex = journal.get(entry)
+            if found:
+                self._count("journal_hits")
+                return Parser().parse(bibtex).entries[0] if bibtex else None
+
+        title = entry.title.value  # type: ignore
+        try:
+            dblp_entry = None
+            if self.dump is not None:
+                dblp_entry = self.dump.lookup(title)
+                if dblp_entry is None:
+                    logging.info(
+                        f'Info: Publication with the title "{title}" could not be found.'
+                    )
+            elif info := self._search_hit(title):
+                if self.from_hit:
+                    dblp_entry = entry_from_hit(info)
+                if dblp_entry is None:
+                    dblp_citation = self._get_dblp_bibtext(info["url"])
+                    dblp_entry = Parser().parse(dblp_citation).entries[0]
+        except DBLPUnavailable:
+            self._count("unavailable")
+            return None  # not journaled, so a resumed run tries again
+        self._count("resolved" if dblp_entry else "not_found")
+        if journal is not None:
+            journal.record(entry, dblp_entry.to_bibtex() if dblp_entry else None)
+        return dblp_entry
 
-    def clean(self, bibliography: Bibliography) -> Bibliography:
+    def _clean_entry(
+        self,
+        entry: Entry,
+        journal: Optional[CleanJournal] = None,
+        fingerprints: Optional[FingerprintStore] = None,
+    ) -> Optional[Entry]:
+        """Resolve a single entry at dblp.
+
+        Args:
+            entry (Entry): Entry to be cleaned.
+            journal (Optional[CleanJournal], optional): Checkpoint journal. Defaults to None.
+            fingerprints (Optional[FingerprintStore], optional): Fingerprints of the entries
+                cleaned before. Defaults to None.
+
+        Returns:
+            Optional[Entry]: Cleaned entry, the original entry if it can not be cleaned and unknown
+                entries are kept or None.
+        """
+        if fingerprints is not None and fingerprints.is_clean(entry):
+            self._count("fingerprint_hits")
+            return entry
+        if cleaned_entry := self._resolve_entry(entry, journal):
+            if self.keep_keys:
+                cleaned_entry.key.value = entry.key.value  # type: ignore
+            if fingerprints is not None:
+                fingerprints.add(cleaned_entry)
+            return cleaned_entry
+        if self.keep_unknown:
+            return entry
+        return None
+
+    def clean(
+        self,
+        bibliography: Bibliography,
+        journal: Optional[CleanJournal] = None,
+        fingerprints: Optional[FingerprintStore] = None,
+    ) -> Bibliography:
         """Clean a given bibliography with by searching the title in the DBLP and retrieving the citation from th ebest match.
 
+        With more than one worker the entries are resolved concurrently by a thread pool, the
+        cleaned bibliography keeps the order of the input. If a journal is given, every resolved
+        entry is recorded in it as soon as it is resolved and entries recorded by an earlier run
+        are not requested again. If a fingerprint store is given, entries that an earlier run
+        produced and that were not edited since are kept as they are without any requests, and
+        the fingerprints of all cleaned entries are added to the store.
+
         Args:
             bibliography (Bibliography): Bibliography to be cleaned.
+            journal (Optional[CleanJournal], optional): Checkpoint journal. Defaults to None.
+            fingerprints (Optional[FingerprintStore], optional): Fingerprints of the entries
+                cleaned before. Defaults to None.
 
         Returns:
             Bibliography: Cleaned bibliography.
         """
         cleaned_bib = Bibliography()
-        parser = Parser()
         assert len(bibliography.entries) > 0
 
-        for entry in bibliography.entries:
-            if publication_url := self._search_publication(entry.title.value):  # type: ignore
-                if dblp_citation := self._get_dblp_bibtext(publication_url):
-                    cleaned_entry = parser.parse(dblp_citation)
-                    cleaned_entry = cleaned_entry.entries[0]  # type: ignore
-                    if self.keep_keys:
-                        cleaned_entry.key.value = entry.key.value  # type: ignore
-                    cleaned_bib.entries.append(cleaned_entry)  # type: ignore
-                elif self.keep_unknown:
-                    cleaned_bib.entries.append(entry)
-            elif self.keep_unknown:
-                cleaned_bib.entries.append(entry)
-
-            time.sleep(1)  # abide dblp crawl-delay
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                cleaned_entries = list(
+                    executor.map(
+                        lambda entry: self._clean_entry(entry, journal, fingerprints),
+                        bibliography.entries,
+                    )
+                )
+        else:
+            cleaned_entries = [
+                self._clean_entry(entry, journal, fingerprints)
+                for entry in bibliography.entries
+            ]
+
+        for cleaned_entry in cleaned_entries:
+            if cleaned_entry is not None:
+                cleaned_bib.add_entry(cleaned_entry)
         return cleaned_bib
@@ -0,0 +1,235 @@
+import email.utils
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CRAWL_DELAY = 1.0  # seconds between two requests to dblp
+CONNECT_TIMEOUT = 5.0  # seconds
+READ_TIMEOUT = 30.0  # seconds
+RETRIES = 3
+BACKOFF = 1.0  # seconds before the first retry, doubled for every further retry
+MAX_BACKOFF = 60.0  # seconds
+POOL_SIZE = 10
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of requests across all threads."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Create a token bucket.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            burst (int, optional): Maximal number of tokens in the bucket. Defaults to 1.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Take a token from the bucket, wait until one is available if the bucket is empty."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1  # reserve the token, waiting threads queue up behind it
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """Take a token from the bucket without waiting.
+
+        Returns:
+            bool: Whether a token was available.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile of a list of values.
+
+    Args:
+        values (List[float]): Values, they do not need to be sorted.
+        share (float): Percentile between 0 and 1.
+
+    Returns:
+        float: Percentile or 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(share * len(ordered) + 0.5) - 1))]
+
+
+class RequestStats:
+    """Thread-safe counters and latencies of the requests sent by a client."""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, retry: bool = False, failure: bool = False):
+        """Record a sent request.
+
+        Args:
+            latency (float): Seconds until the response or the error.
+            retry (bool, optional): The request will be retried. Defaults to False.
+            failure (bool, optional): The request failed for good. Defaults to False.
+        """
+        with self._lock:
+            self.requests += 1
+            self.retries += retry
+            self.failures += failure
+            self.latencies.append(latency)
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the requests.
+
+        Returns:
+            Dict[str, Any]: Number of requests, retries and failures and latency statistics in
+                seconds.
+        """
+        with self._lock:
+            latencies = list(self.latencies)
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p50": percentile(latencies, 0.5),
+            "latency_p95": percentile(latencies, 0.95),
+            "latency_p99": percentile(latencies, 0.99),
+            "latency_max": max(latencies, default=0.0),
+        }
+
+
+def retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Read the seconds to wait from the Retry-After header of a response.
+
+    Args:
+        response (Optional[requests.Response]): Response or None if the request failed.
+
+    Returns:
+        Optional[float]: Seconds to wait or None if the header is missing or invalid.
+    """
+    if response is None or "Retry-After" not in response.headers:
+        return None
+    value = response.headers["Retry-After"].strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class HTTPClient:
+    """Rate-limited HTTP client with connection pooling, timeouts and retries.
+
+    All requests share one `requests.Session`, so connections to dblp are reused. Requests that
+    fail, e.g. time out or fail to connect, or are answered with 429 or a 5xx status are retried
+    with exponential backoff, a Retry-After header of the response takes precedence.
+    """
+
+    def __init__(
+        self,
+        crawl_delay: float = CRAWL_DELAY,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        pool_size: int = POOL_SIZE,
+        session: Optional[requests.Session] = None,
+    ):
+        """Create a client.
+
+        Args:
+            crawl_delay (float, optional): Minimal average number of seconds between two requests,
+                0 disables the rate limit. Defaults to CRAWL_DELAY.
+            connect_timeout (float, optional): Seconds to establish a connection. Defaults to
+                CONNECT_TIMEOUT.
+            read_timeout (float, optional): Seconds to wait for the response. Defaults to
+                READ_TIMEOUT.
+            retries (int, optional): Number of retries of a failed request. Defaults to RETRIES.
+            backoff (float, optional): Seconds before the first retry. Defaults to BACKOFF.
+            max_backoff (float, optional): Maximal seconds between two retries. Defaults to
+                MAX_BACKOFF.
+            pool_size (int, optional): Number of pooled connections. Defaults to POOL_SIZE.
+            session (Optional[requests.Session], optional): Session to send the requests with.
+                Defaults to a new session.
+        """
+        self.limiter = RateLimiter(1 / crawl_delay) if crawl_delay > 0 else None
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = RequestStats()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def get(
+        self, url: str, params: Optional[Dict[str, str]] = None
+    ) -> Optional[requests.Response]:
+        """Send a GET request once the rate limiter allows it and retry it if it fails.
+
+        Args:
+            url (str): URL to request.
+            params (Optional[Dict[str, str]], optional): Query parameters. Defaults to None.
+
+        Returns:
+            Optional[requests.Response]: Last response or None if no response was received.
+        """
+        response = None
+        for attempt in range(self.retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException:
+                # any failed request, e.g. a timeout, a dropped connection or a redirect loop
+                response = None
+            latency = time.monotonic() - start
+
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                self.stats.record(latency)
+                return response
+            if attempt == self.retries:
+                self.stats.record(latency, failure=True)
+                return response
+
+            self.stats.record(latency, retry=True)
+            delay = retry_after(response)
+            if delay is None:
+                delay = self.backoff * 2**attempt
+            time.sleep(min(delay, self.max_backoff))
+        return response
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+import re
+import zlib
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+from BibTexTools.index import get_year, normalize_name, normalize_text
+
+if TYPE_CHECKING:
+    from BibTexTools.bibliography import Entry
+
+SHINGLE_SIZE = 3  # characters
+NUM_PERM = 48
+BANDS = 12  # rows per band = NUM_PERM // BANDS
+THRESHOLD = 0.7  # minimal Jaccard similarity of the title shingles
+AUTHOR_THRESHOLD = 0.5  # minimal Jaccard similarity of the author last names
+EMPTY = 1 << 32  # larger than any hash value
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def shingles(title: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Split a normalized title into overlapping character shingles.
+
+    Args:
+        title (str): Title of an entry.
+        size (int, optional): Number of characters per shingle. Defaults to SHINGLE_SIZE.
+
+    Returns:
+        Set[str]: Shingles of the title, ignoring case, LaTeX markup, accents and punctuation.
+    """
+    text = NON_ALPHANUMERIC.sub(" ", normalize_text(title)).strip()
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(first: Set, second: Set) -> float:
+    """Jaccard similarity of two sets, 0.0 if both are empty."""
+    if not first and not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    """MinHash signatures with locality-sensitive hashing in bands.
+
+    The signatures use one permutation hashing: every item is hashed once and the hash space is
+    split into `num_perm` bins, each bin keeping its minimal hash. Empty bins borrow the value of
+    the next non-empty bin, so a signature costs one hash per item instead of one per item and
+    permutation. Two sets with Jaccard similarity s share a band with probability about
+    1 - (1 - s^r)^b for b bands of r rows, so similar titles become candidate pairs without
+    comparing all pairs.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        """Create a hasher.
+
+        Args:
+            num_perm (int, optional): Length of the signatures. Defaults to NUM_PERM.
+            bands (int, optional): Number of bands, must divide `num_perm`. Defaults to BANDS.
+            seed (int, optional): Seed of the hash function. Defaults to 1.
+        """
+        assert num_perm % bands == 0
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+
+    def signature(self, items: Set[str]) -> List[int]:
+        """Compute the MinHash signature of a non-empty set."""
+        num_perm = self.num_perm
+        bins = [EMPTY] * num_perm
+        seed = self.seed
+        for item in items:
+            value, position = divmod(zlib.crc32(item.encode("utf-8"), seed), num_perm)
+            if value < bins[position]:
+                bins[position] = value
+        if EMPTY in bins:  # densify by rotation
+            signature = list(bins)
+            for i in range(num_perm):
+                if bins[i] == EMPTY:
+                    distance = next(
+                        d
+                        for d in range(1, num_perm)
+                        if bins[(i + d) % num_perm] != EMPTY
+                    )
+                    signature[i] = distance * EMPTY + bins[(i + distance) % num_perm]
+            return signature
+        return bins
+
+    def band_keys(self, signature: List[int]) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Split a signature into the bucket keys of its bands."""
+        return [
+            (band, tuple(signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+
+def _author_names(entry: Entry) -> Set[str]:
+    if "author" not in entry.fields:
+        return set()
+    return {
+        normalize_name(author.last)
+        for author in entry.author.author_list  # type: ignore
+        if author.last
+    }
+
+
+def _find(parents: List[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def find_duplicates(
+    entries: Sequence[Entry],
+    threshold: float = THRESHOLD,
+    hasher: Optional[MinHasher] = None,
+) -> List[List[Entry]]:
+    """Group entries describing the same publication.
+
+    Candidate pairs are entries whose title signatures share an LSH band. A candidate pair is a
+    duplicate if the Jaccard similarity of the title shingles reaches the threshold, the years
+    of both groups agree and the author last names overlap, where a missing year or author list
+    matches any.
+
+    Args:
+        entries (Sequence[Entry]): Entries to be compared.
+        threshold (float, optional): Minimal Jaccard similarity of the titles. Defaults to
+            THRESHOLD.
+        hasher (Optional[MinHasher], optional): MinHasher for the title signatures. Defaults to
+            a new MinHasher.
+
+    Returns:
+        List[List[Entry]]: Groups of at least two duplicates in the order of the entries.
+    """
+    hasher = hasher or MinHasher()
+    title_shingles: List[Set[str]] = []
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for i, entry in enumerate(entries):
+        title = getattr(entry, "title", None)
+        items = shingles(title.value) if title is not None else set()
+        title_shingles.append(items)
+        if items:
+            for band_key in hasher.band_keys(hasher.signature(items)):
+                buckets.setdefault(band_key, []).append(i)
+
+    years = [get_year(entry) for entry in entries]
+    # year of the group of each root, entries without a year may join any group
+    group_years = list(years)
+    authors: Dict[int, Set[str]] = {}
+    parents = list(range(len(entries)))
+    checked: Set[Tuple[int, int]] = set()
+    for bucket in buckets.values():
+        for position, i in enumerate(bucket):
+            for j in bucket[position + 1 :]:
+                root_i, root_j = _find(parents, i), _find(parents, j)
+                if root_i == root_j or (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if jaccard(title_shingles[i], title_shingles[j]) < threshold:
+                    continue
+                year_i, year_j = group_years[root_i], group_years[root_j]
+                if year_i and year_j and year_i != year_j:
+                    continue
+                for k in (i, j):
+                    if k not in authors:
+                        authors[k] = _author_names(entries[k])
+                if (
+                    authors[i]
+                    and authors[j]
+                    and jaccard(authors[i], authors[j]) < AUTHOR_THRESHOLD
+                ):
+                    continue
+                root = min(root_i, root_j)
+                parents[max(root_i, root_j)] = root
+                group_years[root] = year_i or year_j
+
+    groups: Dict[int, List[Entry]] = {}
+    for i, entry in enumerate(entries):
+        groups.setdefault(_find(parents, i), []).append(entry)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def merge_entries(group: List[Entry]) -> Entry:
+    """Merge duplicates into the first entry by adding copies of the fields only the others have.
+
+    Args:
+        group (List[Entry]): Duplicates, the first entry is kept.
+
+    Returns:
+        Entry: First entry with the merged fields.
+    """
+    kept = group[0]
+    for duplicate in group[1:]:
+        for name in duplicate.fields:
+            if name not in kept.fields:
+                kept.copy_field(getattr(duplicate, name))
+    return kept
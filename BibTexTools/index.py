@@ -0,0 +1,229 @@
+from __future__ import annotations
+import bisect
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from BibTexTools.bibliography import Entry
+
+YearRange = Union[int, Tuple[Optional[int], Optional[int]]]
+
+LATEX_COMMAND = re.compile(r"\\[a-zA-Z]+\s*|\\.")
+YEAR = re.compile(r"\d{4}")
+NAME_PARTICLES = {"von", "van", "der", "den", "de", "di", "du", "la", "le", "del"}
+NAME_SUFFIXES = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv"}
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a field value for comparisons by removing LaTeX commands, braces and accents.
+
+    Args:
+        text (str): Text to be normalized.
+
+    Returns:
+        str: Lower case text without accents and with single spaces.
+    """
+    text = LATEX_COMMAND.sub("", text).replace("{", "").replace("}", "")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+def normalize_name(last_name: str) -> str:
+    """Normalize an author last name without name particles like "von" and suffixes like "Jr.".
+
+    Args:
+        last_name (str): Last name of an author.
+
+    Returns:
+        str: Normalized last name.
+    """
+    parts = normalize_text(last_name).split(" ")
+    core = [part for part in parts if part not in NAME_PARTICLES | NAME_SUFFIXES]
+    return " ".join(core or parts)
+
+
+def get_year(entry: Entry) -> Optional[int]:
+    """Extract the year of an entry as number."""
+    year = getattr(entry, "year", None)
+    match = YEAR.search(year.value) if year is not None else None
+    return int(match.group()) if match else None
+
+
+def get_venue(entry: Entry) -> Optional[str]:
+    """Extract the normalized journal or booktitle of an entry."""
+    venue = getattr(entry, "journal", None) or getattr(entry, "booktitle", None)
+    return normalize_text(venue.value) if venue is not None else None
+
+
+class BibliographyIndex:
+    """Secondary indexes over the entries of a bibliography.
+
+    The entries are bucketed by year, by the normalized last names of their authors, by type and
+    by venue. Every bucket is an insertion ordered mapping of entry sequence numbers to entries, so
+    entries can be added and removed in constant time and a query only touches the entries of the
+    smallest matching bucket. An entry object that is added more than once, e.g. because it
+    appears twice in the entry list, is indexed once and stays indexed until it was removed as
+    often as it was added.
+    """
+
+    def __init__(self):
+        self._next_seq = 0
+        self._seqs: Dict[int, int] = {}  # id of the entry -> sequence number
+        self._entries: Dict[int, Entry] = {}
+        self._years: Dict[int, Dict[int, Entry]] = {}
+        self._sorted_years: List[int] = []
+        self._authors: Dict[str, Dict[int, Entry]] = {}
+        self._types: Dict[str, Dict[int, Entry]] = {}
+        self._venues: Dict[str, Dict[int, Entry]] = {}
+        self._entry_years: Dict[int, int] = {}  # sequence number -> year
+        # sequence number -> buckets of the string based indexes, fields may change later
+        self._entry_keys: Dict[int, List[Tuple[Dict[str, Dict[int, Entry]], str]]] = {}
+        self._additional: Dict[int, int] = {}  # sequence number -> further additions
+
+    def _keys(self, entry: Entry) -> List[Tuple[Dict[str, Dict[int, Entry]], str]]:
+        """Collect the buckets of the string based indexes an entry belongs to."""
+        keys = []
+        if "author" in entry.fields:
+            for author in entry.author.author_list:  # type: ignore
+                keys.append((self._authors, normalize_name(author.last)))
+        entry_type = getattr(entry, "type", None)
+        if entry_type is not None:
+            keys.append((self._types, entry_type.value.lower()))
+        venue = get_venue(entry)
+        if venue:
+            keys.append((self._venues, venue))
+        return keys
+
+    def add(self, entry: Entry):
+        """Add an entry to all indexes.
+
+        Args:
+            entry (Entry): Entry to be added.
+        """
+        seq = self._seqs.get(id(entry))
+        if seq is not None:
+            self._additional[seq] = self._additional.get(seq, 0) + 1
+            return
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs[id(entry)] = seq
+        self._entries[seq] = entry
+
+        year = get_year(entry)
+        if year is not None:
+            if year not in self._years:
+                bisect.insort(self._sorted_years, year)
+            self._years.setdefault(year, {})[seq] = entry
+            self._entry_years[seq] = year
+        keys = self._keys(entry)
+        if keys:
+            self._entry_keys[seq] = keys
+        for index, key in keys:
+            index.setdefault(key, {})[seq] = entry
+
+    def remove(self, entry: Entry):
+        """Remove an entry from all indexes it was added to, even if its fields changed since.
+
+        Args:
+            entry (Entry): Entry to be removed.
+        """
+        seq = self._seqs.get(id(entry))
+        if seq is None:
+            return
+        additional = self._additional.pop(seq, 0)
+        if additional:
+            if additional > 1:
+                self._additional[seq] = additional - 1
+            return
+        del self._seqs[id(entry)]
+        del self._entries[seq]
+
+        year = self._entry_years.pop(seq, None)
+        if year is not None:
+            self._discard(self._years, year, seq)  # type: ignore
+            if year not in self._years:
+                del self._sorted_years[bisect.bisect_left(self._sorted_years, year)]
+        for index, key in self._entry_keys.pop(seq, []):
+            self._discard(index, key, seq)
+
+    @staticmethod
+    def _discard(index: Dict, key: Union[str, int], seq: int):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(seq, None)
+            if not bucket:
+                del index[key]
+
+    def query(
+        self,
+        author: Optional[str] = None,
+        year: Optional[YearRange] = None,
+        entry_type: Optional[str] = None,
+        venue: Optional[str] = None,
+    ) -> List[Entry]:
+        """Select the entries matching all given criteria.
+
+        Args:
+            author (Optional[str], optional): Last name of one of the authors. Defaults to None.
+            year (Optional[YearRange], optional): Year or inclusive range of years, a bound of
+                the range may be None. Defaults to None.
+            entry_type (Optional[str], optional): BibTex type, e.g. "article". Defaults to None.
+            venue (Optional[str], optional): Journal or booktitle. Defaults to None.
+
+        Returns:
+            List[Entry]: Matching entries in the order they were added.
+        """
+        buckets: List[Dict[int, Entry]] = []
+        if author is not None:
+            buckets.append(self._authors.get(normalize_name(author), {}))
+        if entry_type is not None:
+            buckets.append(self._types.get(entry_type.lower(), {}))
+        if venue is not None:
+            buckets.append(self._venues.get(normalize_text(venue), {}))
+
+        year_buckets: List[Dict[int, Entry]] = []
+        low = high = None
+        if year is not None:
+            low, high = year if isinstance(year, tuple) else (year, year)
+            first = (
+                bisect.bisect_left(self._sorted_years, low) if low is not None else 0
+            )
+            last = (
+                bisect.bisect_right(self._sorted_years, high)
+                if high is not None
+                else len(self._sorted_years)
+            )
+            year_buckets = [self._years[y] for y in self._sorted_years[first:last]]
+
+        if buckets:  # walk the smallest bucket and check the remaining criteria
+            buckets.sort(key=len)
+            year_size = sum(len(bucket) for bucket in year_buckets)
+            if year is None or len(buckets[0]) <= year_size:
+                candidates = buckets[0]
+            else:
+                candidates = {
+                    s: e for bucket in year_buckets for s, e in bucket.items()
+                }
+                year = None
+        elif year is not None:
+            candidates = {s: e for bucket in year_buckets for s, e in bucket.items()}
+            year = None
+        else:
+            candidates = self._entries
+
+        results = []
+        for seq in sorted(candidates):
+            if not all(seq in bucket for bucket in buckets):
+                continue
+            if year is not None:
+                entry_year = self._entry_years.get(seq)
+                if entry_year is None:
+                    continue
+                if (low is not None and entry_year < low) or (
+                    high is not None and entry_year > high
+                ):
+                    continue
+            results.append(candidates[seq])
+        return results
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from BibTexTools.bibliography import Entry
+from BibTexTools.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_JOURNAL_DIR = os.path.join(DEFAULT_CACHE_DIR, "journals")
+
+
+def fingerprint(entry: Entry) -> str:
+    """Hash the BibTex string of an entry.
+
+    Whitespace is collapsed before hashing, so an entry keeps its fingerprint when it is written
+    to a file and parsed again.
+
+    Args:
+        entry (Entry): Entry to be hashed.
+
+    Returns:
+        str: Hex digest identifying the entry independent of its position in the bibliography.
+    """
+    return hashlib.sha1(" ".join(entry.to_bibtex().split()).encode("utf-8")).hexdigest()
+
+
+def default_journal_path(input_path: str, directory: str = DEFAULT_JOURNAL_DIR) -> str:
+    """Path of the journal of cleaning a file if no journal is given.
+
+    The journal is kept in the user cache instead of next to the input, which may be read-only.
+
+    Args:
+        input_path (str): Path of the input BibTex file.
+        directory (str, optional): Directory of the journals. Defaults to DEFAULT_JOURNAL_DIR.
+
+    Returns:
+        str: Path of the journal, the same for every run on the same input file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = hashlib.sha1(os.path.abspath(input_path).encode("utf-8")).hexdigest()
+    return os.path.join(directory, name + ".journal")
+
+
+class CleanJournal:
+    """Append-only checkpoint journal of a clean run.
+
+    Every resolved entry is written as one JSON line holding the fingerprint of the input entry
+    and the BibTex string retrieved from dblp, or null if dblp does not know the entry. Lines are
+    flushed to disk as soon as an entry is resolved, so a killed run can be resumed from the
+    journal. A partially written last line is ignored when the journal is loaded.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """Open a journal.
+
+        Args:
+            path (str): Path of the journal file.
+            resume (bool, optional): Load the records of an existing journal instead of starting a
+                new one. Defaults to False.
+        """
+        self.path = path
+        self._records: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+        complete = True
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    complete = line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._records[record["fingerprint"]] = record["bibtex"]
+
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if not complete:
+            self._file.write("\n")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, entry: Entry) -> Tuple[bool, Optional[str]]:
+        """Look up the result of an entry.
+
+        Args:
+            entry (Entry): Input entry.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the entry was resolved before and the BibTex string
+                from dblp, None if dblp does not know the entry.
+        """
+        key = fingerprint(entry)
+        with self._lock:
+            if key in self._records:
+                return True, self._records[key]
+        return False, None
+
+    def record(self, entry: Entry, bibtex: Optional[str]):
+        """Append the result of an entry and flush it to disk.
+
+        Args:
+            entry (Entry): Input entry.
+            bibtex (Optional[str]): BibTex string from dblp or None if dblp does not know the entry.
+        """
+        key = fingerprint(entry)
+        line = json.dumps({"fingerprint": key, "bibtex": bibtex}) + "\n"
+        with self._lock:
+            self._records[key] = bibtex
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
+
+    def remove(self):
+        """Close and delete the journal file once the run is finished."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class FingerprintStore:
+    """Sidecar file with the fingerprints of the entries a clean run produced.
+
+    Entries of a later run whose fingerprint is in the store are already clean and do not need
+    to be sent to dblp again. The file holds one fingerprint per line and is rewritten with the
+    fingerprints of the latest run only, so entries that were edited since are cleaned again.
+    """
+
+    def __init__(self, path: str):
+        """Load the fingerprints of the previous run if the file exists.
+
+        Args:
+            path (str): Path of the sidecar file.
+        """
+        self.path = path
+        self.known: Set[str] = set()
+        self.current: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fingerprint_file:
+                self.known = {line.strip() for line in fingerprint_file if line.strip()}
+
+    def is_clean(self, entry: Entry) -> bool:
+        """Check whether an entry is unchanged since an earlier run cleaned it.
+
+        Args:
+            entry (Entry): Input entry.
+
+        Returns:
+            bool: The entry was produced by an earlier run and was not edited since.
+        """
+        key = fingerprint(entry)
+        if key in self.known:
+            self.current.add(key)
+            return True
+        return False
+
+    def add(self, entry: Entry):
+        """Record a cleaned entry.
+
+        Args:
+            entry (Entry): Entry as it is written to the cleaned bibliography.
+        """
+        self.current.add(fingerprint(entry))
+
+    def save(self):
+        """Replace the sidecar file with the fingerprints of this run."""
+        partial_path = self.path + ".partial"
+        with open(partial_path, "w", encoding="utf-8") as fingerprint_file:
+            fingerprint_file.writelines(key + "\n" for key in sorted(self.current))
+        os.replace(partial_path, self.path)
@@ -0,0 +1,127 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, Optional
+
+from BibTexTools.client import RequestStats
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident memory of the process in MB or None if it can not be determined."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return max_rss / 1e6 if sys.platform == "darwin" else max_rss / 1e3
+
+
+class Metrics:
+    """Wall time, throughput and memory of the stages of a run and counters of events.
+
+    Stages are timed with `stage`, events like cache hits are counted with `count` from any
+    thread. With `trace_memory` the peak memory allocated by Python during every stage is traced
+    with tracemalloc, which slows the run down considerably.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """Create empty metrics.
+
+        Args:
+            trace_memory (bool, optional): Trace the peak memory of every stage. Defaults to False.
+        """
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: int = 1):
+        """Increase a counter.
+
+        Args:
+            name (str): Name of the counter, e.g. "cache_hits".
+            value (int, optional): Amount to add. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(
+        self, name: str, entries: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Time a stage of the run.
+
+        Args:
+            name (str): Name of the stage, e.g. "parse".
+            entries (Optional[int], optional): Number of processed entries, it can also be set
+                as "entries" of the yielded record once it is known. Defaults to None.
+
+        Yields:
+            Dict[str, Any]: Record of the stage, completed when the stage ends.
+        """
+        record: Dict[str, Any] = {"entries": entries}
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            record["seconds"] = seconds
+            if record["entries"] is not None:
+                record["entries_per_second"] = (
+                    record["entries"] / seconds if seconds > 0 else None
+                )
+            if self.trace_memory:
+                record["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+                if started_tracing:
+                    tracemalloc.stop()
+            with self._lock:
+                self.stages[name] = record
+
+    def report(self, requests: Optional[RequestStats] = None) -> Dict[str, Any]:
+        """Summarize the metrics.
+
+        Args:
+            requests (Optional[RequestStats], optional): Statistics of the HTTP requests of the
+                run. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable report with the stages, the counters, the total
+                seconds, the peak resident memory and the request statistics if given.
+        """
+        with self._lock:
+            report: Dict[str, Any] = {
+                "stages": {name: dict(record) for name, record in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+        report["seconds"] = sum(
+            record["seconds"] for record in report["stages"].values()
+        )
+        report["max_rss_mb"] = max_rss_mb()
+        if requests is not None:
+            report["requests"] = requests.summary()
+        return report
+
+    def write(self, file: IO[str], requests: Optional[RequestStats] = None):
+        """Write the report as JSON.
+
+        Args:
+            file (IO[str]): File to write to.
+            requests (Optional[RequestStats], optional): Statistics of the HTTP requests of the
+                run. Defaults to None.
+        """
+        json.dump(self.report(requests), file, indent=4)
+        file.write("\n")
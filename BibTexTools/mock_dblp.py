@@ -0,0 +1,327 @@
+"""Local stand-in for the dblp API to load-test the cleaner without sending requests to dblp.org.
+
+Run a server from the repository root, e.g.
+    python -m BibTexTools.mock_dblp BibTexTools/tests/data/cleaned.bib --latency 0.05 --error_rate 0.1
+and clean against it with `BibTexTools clean --base_url http://127.0.0.1:8000 ...`.
+
+`DBLPSession` answers the same requests in-process for the tests and the benchmarks.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from BibTexTools.bibliography import Bibliography, Entry, extract_content_of_field
+from BibTexTools.cleaner import DBLP_URL
+from BibTexTools.client import RateLimiter
+from BibTexTools.index import normalize_text
+from BibTexTools.parser import Parser
+
+HIT_TYPES = {
+    "article": "Journal Articles",
+    "inproceedings": "Conference and Workshop Papers",
+    "proceedings": "Editorship",
+    "book": "Books and Theses",
+}
+INFO_FIELDS = ["title", "volume", "number", "pages", "year", "doi"]
+
+
+def search_key(title: str) -> str:
+    """Normalize a title like a search query."""
+    return normalize_text(title).rstrip(".")
+
+
+def hit_info(entry: Entry, url: str) -> Dict[str, Any]:
+    """Build the "info" object of a dblp search hit for an entry.
+
+    Args:
+        entry (Entry): Entry of the corpus.
+        url (str): URL of the publication site.
+
+    Returns:
+        Dict[str, Any]: "info" object like the dblp search API returns it.
+    """
+    info: Dict[str, Any] = {
+        "type": HIT_TYPES.get(entry.type.value, "Informal and Other Publications"),  # type: ignore
+        "key": entry.key.value.replace("DBLP:", "", 1),  # type: ignore
+        "url": url,
+    }
+    if "author" in entry.fields:
+        names = extract_content_of_field(entry.author.value).split(" and ")  # type: ignore
+        info["authors"] = {"author": [{"text": " ".join(n.split())} for n in names]}
+    for name in INFO_FIELDS:
+        if name in entry.fields:
+            value = extract_content_of_field(getattr(entry, name).value)
+            info[name] = " ".join(value.split())
+    if "title" in info:
+        info["title"] += "."
+    if "pages" in info:
+        info["pages"] = info["pages"].replace("--", "-")
+    venue = getattr(entry, "journal", None) or getattr(entry, "booktitle", None)
+    if venue is not None:
+        info["venue"] = " ".join(extract_content_of_field(venue.value).split())
+    if "url" in entry.fields:
+        info["ee"] = extract_content_of_field(entry.url.value)  # type: ignore
+    return info
+
+
+def index_corpus(
+    corpus: Bibliography, base_url: str
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Build the search hits and the BibTex exports of the publications of a corpus.
+
+    Args:
+        corpus (Bibliography): Publications known to the mock.
+        base_url (str): URL of the mock, the publication sites are below it.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]: "info" objects by normalized title and
+            BibTex strings by path.
+    """
+    hits: Dict[str, Dict[str, Any]] = {}
+    bibtex: Dict[str, str] = {}
+    for entry in corpus.entries:
+        key = entry.key.value.replace("DBLP:", "", 1)  # type: ignore
+        url = f"{base_url}/rec/{key}"
+        hits.setdefault(search_key(entry.title.value), hit_info(entry, url))  # type: ignore
+        bibtex[f"/rec/{key}.bib"] = entry.to_bibtex()
+    return hits, bibtex
+
+
+def answer(
+    hits: Dict[str, Dict[str, Any]],
+    bibtex: Dict[str, str],
+    path: str,
+    query: Dict[str, str],
+) -> Tuple[int, Dict[str, str], str]:
+    """Answer a search or BibTex request from the output of `index_corpus`.
+
+    Args:
+        hits (Dict[str, Dict[str, Any]]): "info" objects by normalized title.
+        bibtex (Dict[str, str]): BibTex strings by path.
+        path (str): Path of the URL.
+        query (Dict[str, str]): Query parameters.
+
+    Returns:
+        Tuple[int, Dict[str, str], str]: Status code, headers and body.
+    """
+    if path == "/search/publ/api":
+        info = hits.get(search_key(query.get("q", "")))
+        found: Dict[str, Any] = {"@total": "0"}
+        if info is not None:
+            found = {"@total": "1", "hit": [{"@score": "1", "info": info}]}
+        body = json.dumps({"result": {"hits": found}})
+        return 200, {"Content-Type": "application/json"}, body
+    if path in bibtex:
+        return 200, {"Content-Type": "text/x-bibtex"}, bibtex[path]
+    return 404, {}, "Not Found"
+
+
+class FakeResponse:
+    """Response of a `DBLPSession` with the parts of a `requests.Response` the client uses."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], text: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class DBLPSession:
+    """In-process stand-in for the session of an `HTTPClient`, answering like `MockDBLP`.
+
+    There is no latency and there are no errors, every requested URL is recorded.
+    """
+
+    def __init__(self, corpus: Bibliography, base_url: str = DBLP_URL):
+        """Index the corpus.
+
+        Args:
+            corpus (Bibliography): Publications known to the session.
+            base_url (str, optional): URL of the publication sites in the hits. Defaults to
+                DBLP_URL.
+        """
+        self.corpus = corpus
+        self.hits, self.bibtex = index_corpus(corpus, base_url.rstrip("/"))
+        self.requests: List[str] = []
+
+    def get(
+        self, url: str, params: Optional[Dict[str, str]] = None, **kwargs
+    ) -> FakeResponse:
+        """Answer a GET request like `requests.Session.get`."""
+        self.requests.append(url)
+        status, headers, body = answer(
+            self.hits, self.bibtex, urlparse(url).path, params or {}
+        )
+        return FakeResponse(status, headers, body)
+
+
+class MockDBLP:
+    """Threaded HTTP server answering dblp search and BibTex requests from a corpus.
+
+    The server implements `/search/publ/api?q=<title>&format=json` with exact title matches after
+    normalization and `/rec/<key>.bib`. Every request waits for the configured latency and is
+    answered with a 503 or a 429 with a Retry-After header at the configured rates. Requests
+    beyond an optional rate limit are answered with a 429 as well.
+    """
+
+    def __init__(
+        self,
+        corpus: Bibliography,
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        retry_after: int = 1,
+        seed: int = 0,
+    ):
+        """Create the server, it does not accept requests before `start` is called.
+
+        Args:
+            corpus (Bibliography): Publications known to the server.
+            port (int, optional): Port on 127.0.0.1, 0 picks a free port. Defaults to 0.
+            latency (float, optional): Seconds before every response. Defaults to 0.0.
+            error_rate (float, optional): Share of requests answered with a 503. Defaults to 0.0.
+            throttle_rate (float, optional): Share of requests answered with a 429. Defaults to
+                0.0.
+            rate_limit (Optional[float], optional): Requests per second, further requests are
+                answered with a 429. Defaults to no limit.
+            retry_after (int, optional): Seconds of the Retry-After header of 429 responses.
+                Defaults to 1.
+            seed (int, optional): Seed of the random errors. Defaults to 0.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.retry_after = retry_after
+        self.counts: Dict[int, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.server.daemon_threads = True
+        self.server.mock = self  # type: ignore
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.hits, self.bibtex = index_corpus(corpus, self.base_url)
+
+    def __enter__(self) -> "MockDBLP":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def requests(self) -> int:
+        """Number of requests answered so far."""
+        with self._lock:
+            return sum(self.counts.values())
+
+    def start(self):
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def respond(
+        self, path: str, query: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], str]:
+        """Answer a request.
+
+        Args:
+            path (str): Path of the URL.
+            query (Dict[str, str]): Query parameters.
+
+        Returns:
+            Tuple[int, Dict[str, str], str]: Status code, headers and body.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            draw = self._random.random()
+        throttled = self.limiter is not None and not self.limiter.try_acquire()
+        if throttled or draw < self.throttle_rate:
+            return 429, {"Retry-After": str(self.retry_after)}, "Too Many Requests"
+        if draw < self.throttle_rate + self.error_rate:
+            return 503, {}, "Service Unavailable"
+
+        return answer(self.hits, self.bibtex, path, query)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive for the pooled client
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        mock: MockDBLP = self.server.mock  # type: ignore
+        status, headers, body = mock.respond(url.path, query)
+        with mock._lock:
+            mock.counts[status] = mock.counts.get(status, 0) + 1
+
+        data = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description="Run a local mock dblp server."
+    )
+    argument_parser.add_argument("corpus", help="BibTex file of the known publications")
+    argument_parser.add_argument("--port", type=int, default=8000)
+    argument_parser.add_argument("--latency", type=float, default=0.0)
+    argument_parser.add_argument("--error_rate", type=float, default=0.0)
+    argument_parser.add_argument("--throttle_rate", type=float, default=0.0)
+    argument_parser.add_argument("--rate_limit", type=float, default=None)
+    argument_parser.add_argument("--retry_after", type=int, default=1)
+    args = argument_parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        corpus = Parser().from_file(args.corpus)
+    mock = MockDBLP(
+        corpus,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+    )
+    print(f"Serving {len(corpus)} publications at {mock.base_url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import gzip
+import html.entities
+import json
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Callable, Dict, List, Optional, cast
+
+from BibTexTools.bibliography import Entry
+from BibTexTools.cleaner import BIBSOURCE, DISAMBIGUATION, LATEX_SPECIAL
+from BibTexTools.index import normalize_text
+
+READ_SIZE = 1 << 20  # bytes fed to the XML parser at once
+BATCH_SIZE = 10000  # records inserted into the index at once
+INDEX_SUFFIX = ".sqlite"
+
+RECORD_TAGS = {
+    "article",
+    "inproceedings",
+    "proceedings",
+    "book",
+    "incollection",
+    "phdthesis",
+    "mastersthesis",
+}
+LIST_FIELDS = {"author", "editor"}
+RECORD_FIELDS = LIST_FIELDS | {
+    "title",
+    "booktitle",
+    "journal",
+    "volume",
+    "number",
+    "pages",
+    "publisher",
+    "series",
+    "school",
+    "year",
+    "ee",
+}
+# order of the fields in the BibTex export of dblp
+BIBTEX_FIELDS = [
+    "author",
+    "editor",
+    "title",
+    "booktitle",
+    "journal",
+    "volume",
+    "number",
+    "pages",
+    "publisher",
+    "series",
+    "school",
+    "year",
+]
+DOI_PREFIX = "https://doi.org/"
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def title_key(title: str) -> str:
+    """Normalize a title for exact lookups, ignoring case, LaTeX markup, accents and punctuation.
+
+    Args:
+        title (str): Title of a publication, may be wrapped in braces.
+
+    Returns:
+        str: Normalized title.
+    """
+    return NON_ALPHANUMERIC.sub(" ", normalize_text(title)).strip()
+
+
+class _RecordBuilder:
+    """Target of the XML parser collecting the fields of the dblp publication records."""
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None]):
+        self.emit = emit
+        self.record: Optional[Dict[str, Any]] = None
+        self.field: Optional[str] = None
+        self.depth = 0  # depth of markup like <i> inside a field
+        self.text: List[str] = []
+
+    def start(self, tag: str, attrib: Dict[str, str]):
+        if self.record is None:
+            if tag in RECORD_TAGS:
+                self.record = {"type": tag, "key": attrib.get("key", "")}
+        elif self.field is not None:
+            self.depth += 1
+        elif tag in RECORD_FIELDS:
+            self.field = tag
+            self.text = []
+
+    def end(self, tag: str):
+        if self.record is None:
+            return
+        if self.field is not None:
+            if self.depth:
+                self.depth -= 1
+                return
+            value = " ".join("".join(self.text).split())
+            if self.field in LIST_FIELDS:
+                self.record.setdefault(self.field, []).append(value)
+            else:
+                self.record.setdefault(self.field, value)  # keep the first ee
+            self.field = None
+        elif tag == self.record["type"]:
+            if "title" in self.record:
+                self.emit(self.record)
+            self.record = None
+
+    def data(self, data: str):
+        if self.field is not None:
+            self.text.append(data)
+
+    def close(self):
+        pass
+
+
+def iter_records(fileobj: IO[bytes], read_size: int = READ_SIZE):
+    """Stream-parse a dblp XML dump into publication records.
+
+    The named character entities declared by dblp.dtd are resolved without loading the DTD.
+
+    Args:
+        fileobj (IO[bytes]): Binary file object of the dump.
+        read_size (int, optional): Number of bytes parsed at once. Defaults to READ_SIZE.
+
+    Yields:
+        Dict[str, Any]: Records with type, key and the fields of a publication.
+    """
+    records: List[Dict[str, Any]] = []
+    parser = ET.XMLParser(target=_RecordBuilder(records.append))
+    parser.entity.update(html.entities.entitydefs)  # type: ignore
+    while chunk := fileobj.read(read_size):
+        parser.feed(chunk)
+        yield from records
+        records.clear()
+    parser.close()
+    yield from records
+
+
+def _text(value: str) -> str:
+    return LATEX_SPECIAL.sub(r"\\\1", value)
+
+
+def entry_from_record(record: Dict[str, Any]) -> Entry:
+    """Build an entry from a dblp record like the BibTex export of dblp.
+
+    Args:
+        record (Dict[str, Any]): Record of the dump.
+
+    Returns:
+        Entry: Entry of the publication.
+    """
+    entry = Entry()
+    entry.add_field("type", record["type"])
+    entry.add_field("key", "DBLP:" + record["key"])
+    for name in BIBTEX_FIELDS:
+        value = record.get(name)
+        if not value:
+            continue
+        if name in LIST_FIELDS:
+            value = " and ".join(DISAMBIGUATION.sub("", person) for person in value)
+        elif name == "title" and value.endswith("."):
+            value = value[:-1]
+        elif name == "pages":
+            value = value.replace("-", "--")
+        entry.add_field(name, "{" + _text(value) + "}")
+    ee = record.get("ee")
+    if ee:
+        entry.add_field("url", "{" + ee + "}")
+        if ee.startswith(DOI_PREFIX):
+            entry.add_field("doi", "{" + ee[len(DOI_PREFIX) :] + "}")
+    entry.add_field("biburl", "{https://dblp.org/rec/" + record["key"] + ".bib}")
+    entry.add_field("bibsource", "{" + BIBSOURCE + "}")
+    return entry
+
+
+class DBLPDump:
+    """Offline title index over a local dblp XML dump.
+
+    The dump (https://dblp.org/xml/) is parsed once into an SQLite file mapping normalized titles
+    to the publication records, afterwards entries are resolved without any network access.
+    Titles are matched exactly after normalization, if several publications share a title
+    regular publications are preferred over CoRR preprints.
+    """
+
+    def __init__(self, index_path: str):
+        """Open an index built by `DBLPDump.build`.
+
+        Args:
+            index_path (str): Path of the index file.
+        """
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No dblp index at {index_path}")
+        self.path = index_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(index_path, check_same_thread=False)
+
+    @classmethod
+    def build(
+        cls,
+        dump_path: str,
+        index_path: Optional[str] = None,
+        read_size: int = READ_SIZE,
+    ) -> "DBLPDump":
+        """Parse a dump into a new index, replacing an existing index at the same path.
+
+        Args:
+            dump_path (str): Path of dblp.xml or dblp.xml.gz.
+            index_path (Optional[str], optional): Path of the index file. Defaults to the dump
+                path with the suffix ".sqlite".
+            read_size (int, optional): Number of bytes parsed at once. Defaults to READ_SIZE.
+
+        Returns:
+            DBLPDump: Opened index.
+        """
+        index_path = index_path or dump_path + INDEX_SUFFIX
+        partial_path = index_path + ".partial"
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+        connection = sqlite3.connect(partial_path)
+        connection.execute(
+            "CREATE TABLE publications (title TEXT NOT NULL, preprint INTEGER NOT NULL, "
+            "record TEXT NOT NULL)"
+        )
+        opener = gzip.open if dump_path.endswith(".gz") else open
+        with cast(IO[bytes], opener(dump_path, "rb")) as dump_file:
+            batch = []
+            for record in iter_records(dump_file, read_size):
+                batch.append(
+                    (
+                        title_key(record["title"]),
+                        record["key"].startswith("journals/corr/"),
+                        json.dumps(record, ensure_ascii=False),
+                    )
+                )
+                if len(batch) >= BATCH_SIZE:
+                    connection.executemany(
+                        "INSERT INTO publications VALUES (?, ?, ?)", batch
+                    )
+                    batch = []
+            connection.executemany("INSERT INTO publications VALUES (?, ?, ?)", batch)
+        connection.execute("CREATE INDEX publications_title ON publications (title)")
+        connection.commit()
+        connection.close()
+        os.replace(partial_path, index_path)
+        return cls(index_path)
+
+    @classmethod
+    def from_dump(cls, dump_path: str) -> "DBLPDump":
+        """Open the index of a dump, building it first if it is missing or older than the dump.
+
+        Args:
+            dump_path (str): Path of dblp.xml, dblp.xml.gz or of an index file.
+
+        Returns:
+            DBLPDump: Opened index.
+        """
+        if dump_path.endswith(INDEX_SUFFIX):
+            return cls(dump_path)
+        index_path = dump_path + INDEX_SUFFIX
+        if not os.path.exists(index_path) or os.path.getmtime(
+            index_path
+        ) < os.path.getmtime(dump_path):
+            return cls.build(dump_path, index_path)
+        return cls(index_path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM publications"
+            ).fetchone()[0]
+
+    def lookup_record(self, title: str) -> Optional[Dict[str, Any]]:
+        """Find the record of a publication by its title.
+
+        Args:
+            title (str): Title of the publication.
+
+        Returns:
+            Optional[Dict[str, Any]]: Record or None if the dump does not contain the title.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT record FROM publications WHERE title = ? "
+                "ORDER BY preprint, rowid LIMIT 1",
+                (title_key(title),),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def lookup(self, title: str) -> Optional[Entry]:
+        """Find a publication by its title.
+
+        Args:
+            title (str): Title of the publication.
+
+        Returns:
+            Optional[Entry]: Entry of the publication or None if the dump does not contain the
+                title.
+        """
+        record = self.lookup_record(title)
+        return entry_from_record(record) if record else None
+
+    def close(self):
+        """Close the index file."""
+        with self._lock:
+            self._connection.close()
@@ -1,9 +1,47 @@
+import gc
+import hashlib
+import mmap
+import os
 import re
-from typing import Tuple
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from BibTexTools.bibliography import Bibliography, Entry, warn_nonstandard_field
+from BibTexTools.snapshot import SnapshotCache, file_key, reissue
+
+Buffer = Union[str, bytes, mmap.mmap]
+
+
+def _compile(pattern: str) -> dict:
+    """Compile a delimiter pattern for text and for binary buffers."""
+    return {str: re.compile(pattern), bytes: re.compile(pattern.encode())}
 
-from BibTexTools.bibliography import Bibliography, Entry
 
 TRAILING_WHITESPACES = re.compile(r"\s\s+")
+WHITESPACES = re.compile(r"\s+")
+# the delimiters are matched as groups, the index of the matched group identifies the delimiter
+ENTRY_DELIMITERS = _compile(r"(@)|(\{)|(\})")
+KEY_END = _compile(r"(,)|(\})")
+NAME_END = _compile(r"(=)|(,)|(\})")
+VALUE_DELIMITERS = _compile(r'(\{)|(\})|(")|(,)')
+LINE_START_ENTRY = re.compile(rb"^[ \t]*(@)", re.MULTILINE)
+# fast path for most entries: values may contain braced parts nested up to three levels deep
+# and quoted parts, entries with anything else go through `tokenize_entry`
+BRACED = r"\{[^{}]*\}"
+for _ in range(2):
+    BRACED = r"\{[^{}]*(?:" + BRACED + r"[^{}]*)*\}"
+SIMPLE_VALUE = (
+    r'[^{}",]*(?:(?:' + BRACED + r'|"[^"{}]*(?:' + BRACED + r'[^"{}]*)*")[^{}",]*)*'
+)
+# the header up to the delimiter after the key, a field up to the delimiter after its value and
+# the end of an entry after a trailing comma
+ENTRY_HEADER = _compile(r"@([^@{}]*)\{([^,{}]*)([,}])")
+SIMPLE_FIELD = _compile(r"([^=,{}]*)=(" + SIMPLE_VALUE + r")([,}])")
+ENTRY_TAIL = _compile(r"[^={}]*\}")
+ENTRY_START = {str: "@", bytes: b"@"}
+CHUNK_SIZE = 1 << 16
+CHUNKS_PER_WORKER = 4
 
 
 def clean_line(line: str) -> str:
@@ -61,16 +99,306 @@ def parse_field(line: str) -> Tuple[str, str]:
         Tuple[str, str]: Name of the BibTex field and its value.
     """
     assert "=" in line
-    field_str = line.split("=")
+    field_str = line.split("=", 1)
     field_name: str = field_str[0].strip()
-    value: str = field_str[-1]
+    value: str = field_str[1]
     value = value.strip(" ,")
     return field_name, value
 
 
+def split_entries(chunks: Iterable[str]) -> Iterator[str]:
+    """Split a stream of text chunks into the raw strings of the individual BibTex entries.
+
+    An entry starts at an "@" outside of any entry and ends with the closing brace that brings the
+    brace depth back to zero. Entries may span any number of chunks, only the current entry is kept
+    in memory.
+
+    Args:
+        chunks (Iterable[str]): Consecutive pieces of the BibTex text.
+
+    Yields:
+        str: Raw string of one BibTex entry.
+    """
+    pieces = []
+    in_entry = False
+    depth = 0
+
+    for chunk in chunks:
+        start = 0
+        for match in ENTRY_DELIMITERS[str].finditer(chunk):
+            char = match.lastindex
+            if not in_entry:
+                if char == 1:  # entry start
+                    in_entry = True
+                    start = match.start()
+            elif char == 2:
+                depth += 1
+            elif char == 3 and depth > 0:
+                depth -= 1
+                if depth == 0:  # entry end
+                    pieces.append(chunk[start : match.end()])
+                    yield "".join(pieces)
+                    pieces = []
+                    in_entry = False
+        if in_entry:
+            pieces.append(chunk[start:])
+
+    if pieces:  # unterminated last entry
+        yield "".join(pieces)
+
+
+def find_entry_spans(
+    buffer: Buffer, pos: int = 0, endpos: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """Find the start and end offsets of all BibTex entries in a text or binary buffer.
+
+    Args:
+        buffer (Buffer): Full BibTex text, bytes or memory-mapped file.
+        pos (int, optional): Offset to start scanning at, outside of any entry. Defaults to 0.
+        endpos (Optional[int], optional): Entries starting at or after this offset are not
+            returned. Defaults to the buffer end.
+
+    Yields:
+        Tuple[int, int]: Start and end offset of one entry.
+    """
+    delimiters = ENTRY_DELIMITERS[str if isinstance(buffer, str) else bytes]
+    endpos = len(buffer) if endpos is None else endpos
+    start = -1
+    depth = 0
+
+    for match in delimiters.finditer(buffer, pos):  # type: ignore
+        char = match.lastindex
+        if start < 0:
+            if match.start() >= endpos:
+                return
+            if char == 1:  # entry start
+                start = match.start()
+        elif char == 2:
+            depth += 1
+        elif char == 3 and depth > 0:
+            depth -= 1
+            if depth == 0:  # entry end
+                yield start, match.end()
+                start = -1
+
+    if start >= 0:  # unterminated last entry
+        yield start, len(buffer)
+
+
+def _decode(buffer: Buffer, start: int, end: int, encoding: str) -> str:
+    """Return a span of a buffer as string, binary buffers are decoded."""
+    value = buffer[start:end]
+    if not isinstance(value, str):
+        value = value.decode(encoding)
+    return value
+
+
+def tokenize_entry(
+    buffer: Buffer, start: int = 0, end: Optional[int] = None, encoding: str = "utf-8"
+) -> Iterator[Tuple[str, str]]:
+    """Split a single BibTex entry into its fields in one pass.
+
+    The tokenizer is a small state machine that jumps from delimiter to delimiter while tracking the
+    brace depth and whether it is inside a quoted value, so every character is looked at only once
+    and "=" or "," inside of values do not end a field. Binary buffers are scanned as they are, only
+    the spans that become field names and values are decoded.
+
+    Args:
+        buffer (Buffer): Raw string of one BibTex entry or a text or binary buffer containing it.
+        start (int, optional): Offset of the entry in the buffer. Defaults to 0.
+        end (Optional[int], optional): End offset of the entry in the buffer. Defaults to the buffer end.
+        encoding (str, optional): Encoding of binary buffers. Defaults to "utf-8".
+
+    Yields:
+        Tuple[str, str]: Field name and field value, starting with the "type" and "key" pseudo fields.
+    """
+    kind = str if isinstance(buffer, str) else bytes
+    end = len(buffer) if end is None else end
+
+    match = ENTRY_DELIMITERS[kind].search(buffer, start, end)  # type: ignore
+    if not match or match.lastindex != 1:
+        return
+    pos = match.end()
+    match = ENTRY_DELIMITERS[kind].search(buffer, pos, end)  # type: ignore
+    if not match or match.lastindex != 2:
+        return
+    yield "type", _decode(buffer, pos, match.start(), encoding).strip()
+
+    pos = match.end()
+    match = KEY_END[kind].search(buffer, pos, end)  # type: ignore
+    key_end = match.start() if match else end
+    yield "key", _decode(buffer, pos, key_end, encoding).strip()
+    pos = key_end
+    field_follows = bool(match) and match.lastindex == 1  # type: ignore
+
+    while field_follows:
+        match = NAME_END[kind].search(buffer, pos + 1, end)  # type: ignore
+        if not match or match.lastindex != 1:  # trailing comma or malformed field
+            return
+        field_name = _decode(buffer, pos + 1, match.start(), encoding).strip()
+
+        depth = 0
+        quoted = False
+        value_start = match.end()
+        for match in VALUE_DELIMITERS[kind].finditer(buffer, value_start, end):  # type: ignore
+            char = match.lastindex
+            if char == 1:
+                depth += 1
+            elif char == 2:
+                if depth == 0:  # entry end
+                    break
+                depth -= 1
+            elif depth == 0:
+                if char == 3:
+                    quoted = not quoted
+                elif not quoted:  # field end
+                    break
+        else:
+            match = None
+
+        value_end = match.start() if match else end
+        value = _decode(buffer, value_start, value_end, encoding)
+        yield field_name, WHITESPACES.sub(" ", value).strip()
+        pos = value_end
+        field_follows = bool(match) and match.lastindex == 4  # type: ignore
+
+
+def _scan_simple_entry(
+    buffer: Buffer, start: int, end: int, kind: type
+) -> Optional[Tuple[int, list]]:
+    """Match an entry without nested braces at once.
+
+    Returns:
+        Optional[Tuple[int, list]]: End offset of the entry and the raw field names and values,
+            or None if the entry needs the full tokenizer.
+    """
+    match = ENTRY_HEADER[kind].match(buffer, start, end)  # type: ignore
+    if not match:
+        return None
+    fields = [match.group(1, 2)]
+    match_field = SIMPLE_FIELD[kind].match
+    pos = match.end()
+    while match.group(3) in (",", b","):
+        match = match_field(buffer, pos, end)  # type: ignore
+        if not match:
+            tail = ENTRY_TAIL[kind].match(buffer, pos, end)  # type: ignore
+            return (tail.end(), fields) if tail else None
+        fields.append(match.group(1, 2))
+        pos = match.end()
+    return pos, fields
+
+
+def scan_entries(
+    buffer: Buffer,
+    pos: int = 0,
+    endpos: Optional[int] = None,
+    encoding: str = "utf-8",
+) -> Iterator[Tuple[int, int, List[Tuple[str, str]]]]:
+    """Find the BibTex entries of a text or binary buffer and split them into their fields.
+
+    Every entry is scanned once. Entries whose values have no nested braces, which are most of
+    them, are matched with a few regular expressions, only the others are split by
+    `tokenize_entry`. The result is the same as the one of `find_entry_spans` and
+    `tokenize_entry`.
+
+    Args:
+        buffer (Buffer): Full BibTex text, bytes or memory-mapped file.
+        pos (int, optional): Offset to start scanning at, outside of any entry. Defaults to 0.
+        endpos (Optional[int], optional): Entries starting at or after this offset are not
+            returned. Defaults to the buffer end.
+        encoding (str, optional): Encoding of binary buffers. Defaults to "utf-8".
+
+    Yields:
+        Tuple[int, int, List[Tuple[str, str]]]: Start and end offset of one entry and its field
+            names and values, starting with the "type" and "key" pseudo fields.
+    """
+    kind = str if isinstance(buffer, str) else bytes
+    size = len(buffer)
+    endpos = size if endpos is None else endpos
+    entry_start = ENTRY_START[kind]
+
+    while True:
+        start = buffer.find(entry_start, pos, endpos)  # type: ignore
+        if start < 0:
+            return
+        scanned = _scan_simple_entry(buffer, start, size, kind)
+        if scanned is None:
+            _, end = next(find_entry_spans(buffer, start))
+            fields = list(tokenize_entry(buffer, start, end, encoding))
+        else:
+            end, raw_fields = scanned
+            if kind is bytes:
+                raw_fields = [
+                    (name.decode(encoding), value.decode(encoding))
+                    for name, value in raw_fields
+                ]
+            (entry_type, key), *raw_fields = raw_fields
+            fields = [("type", entry_type.strip()), ("key", key.strip())]
+            fields.extend(
+                (name.strip(), " ".join(value.split())) for name, value in raw_fields
+            )
+        yield start, end, fields
+        pos = end
+
+
+def _entry_from_fields(fields: List[Tuple[str, str]]) -> Entry:
+    """Create an entry from scanned fields, warning about non-standard field names."""
+    entry = Entry()
+    for field_name, value in fields:
+        entry.add_field(field_name, value)
+    return entry
+
+
+def _parse_file_span(
+    args: Tuple[str, int, int, str],
+) -> Tuple[List[List[Tuple[str, str]]], int, List[str]]:
+    """Scan all entries starting in a byte range of a BibTex file, used by the worker processes.
+
+    The range has to start outside of any entry. The last entry is scanned completely, even if it
+    ends after the range. The fields are returned instead of entry objects, which are much more
+    expensive to send to the parent process. Warnings issued in a worker process do not reach
+    the caller, so they are recorded and returned.
+
+    Args:
+        args (Tuple[str, int, int, str]): Path to the file, start and end offset of the range and
+            the encoding of the file.
+
+    Returns:
+        Tuple[List[List[Tuple[str, str]]], int, List[str]]: Field names and values of every
+            entry, the end offset of the last entry and the messages of the parser warnings.
+    """
+    bibtes_path, pos, endpos, encoding = args
+    entries = []
+    last_end = pos
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with open(bibtes_path, "rb") as fin:
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for _, end, fields in scan_entries(buffer, pos, endpos, encoding):
+                    for field_name, _ in fields:
+                        warn_nonstandard_field(field_name)
+                    entries.append(fields)
+                    last_end = max(last_end, end)
+
+    return entries, last_end, [str(warning.message) for warning in caught]
+
+
 class Parser:
     """Load a BibTex bibliography."""
 
+    def parse_entry(self, entry_string: str) -> Entry:
+        """Parse the raw string of a single BibTex entry into an entry object.
+
+        Args:
+            entry_string (str): Raw string of one BibTex entry.
+
+        Returns:
+            Entry: Entry object.
+        """
+        scanned = next(scan_entries(entry_string), None)
+        return _entry_from_fields(scanned[2] if scanned else [])
+
     def parse(self, bibtex_string: str) -> Bibliography:
         """Parse a BibTex string into a BibTexTools bibliography.
 
@@ -81,48 +409,318 @@ class Parser:
             Bibliography: Bibliography object.
         """
         bibliography = Bibliography()
-        entry = Entry()
-        field_str: str = ""
-
-        for line in bibtex_string.split("\n"):
-            line = clean_line(line)
-            if line == "}":
-                continue
-            elif not line.strip():
-                continue
-            field_str += line + " "
-
-            if field_str.startswith("@"):  # entry start
-                if hasattr(entry, "key"):
-                    bibliography.entries.append(entry)  # add last entry
-                    entry = Entry()
-
-                entry.string += field_str
-                entry.add_field("type", get_type(field_str))
-                entry.add_field("key", get_key(field_str))
-                field_str = ""
-
-            elif field_str.count("{") != field_str.count("}"):  # incomplete field
-                continue
-            else:
-                field_name, value = parse_field(field_str)
-                entry.add_field(field_name, value)
-                entry.string += field_str
-                field_str = ""
-
-        bibliography.entries.append(entry)
+        for _, _, fields in scan_entries(bibtex_string):
+            bibliography.add_entry(_entry_from_fields(fields))
         return bibliography
 
-    def from_file(self, bibtes_path: str) -> Bibliography:
+    def iter_entries(
+        self, fileobj: IO[str], chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[Entry]:
+        """Lazily parse the entries of a BibTex file object.
+
+        The file is read in chunks and every entry is yielded as soon as its closing brace is read, so
+        the memory usage does not grow with the size of the file.
+
+        Args:
+            fileobj (IO[str]): File object opened in text mode.
+            chunk_size (int, optional): Number of characters read at once. Defaults to CHUNK_SIZE.
+
+        Yields:
+            Entry: Parsed entry.
+        """
+        chunks = iter(lambda: fileobj.read(chunk_size), "")
+        for entry_string in split_entries(chunks):
+            yield self.parse_entry(entry_string)
+
+    def from_file(
+        self,
+        bibtes_path: str,
+        use_mmap: bool = False,
+        encoding: str = "utf-8",
+        snapshots: Optional[SnapshotCache] = None,
+    ) -> Bibliography:
         """Parse a BibTex file into a BibTexTools bibliography.
 
+        With `use_mmap` the file is memory-mapped instead of read into a string. The mapped bytes are
+        scanned directly and only field names and values are decoded, so the operating system pages
+        the file in lazily and the file content is never copied as a whole.
+
+        With a snapshot cache, the bibliography is loaded from the snapshot of the file if the file
+        did not change since it was parsed, otherwise the file is parsed and a new snapshot is
+        stored. The warnings of the parser are issued in both cases.
+
         Args:
             bibtes_path (str): Path to the bibtex file.
+            use_mmap (bool, optional): Memory-map the file. Defaults to False.
+            encoding (str, optional): Encoding of the file. Defaults to "utf-8".
+            snapshots (Optional[SnapshotCache], optional): Snapshot cache. Defaults to None.
 
         Returns:
             Bibliography: Bibliography object.
         """
-        with open(bibtes_path, "r") as fin:
+        if snapshots is not None:
+            key = file_key(bibtes_path)
+            snapshot = snapshots.load(bibtes_path, key, encoding)
+            if snapshot is None:
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter("always")
+                    bibliography = self.from_file(bibtes_path, use_mmap, encoding)
+                snapshot = bibliography, [str(warning.message) for warning in caught]
+                snapshots.store(bibtes_path, key, *snapshot, encoding=encoding)
+            reissue(snapshot[1])
+            return snapshot[0]
+
+        if use_mmap:
+            return self._from_mmap(bibtes_path, encoding)
+
+        with open(bibtes_path, "r", encoding=encoding) as fin:
             bibtex_string = fin.read()
 
         return self.parse(bibtex_string)
+
+    def _from_mmap(self, bibtes_path: str, encoding: str) -> Bibliography:
+        """Parse a memory-mapped BibTex file.
+
+        Args:
+            bibtes_path (str): Path to the bibtex file.
+            encoding (str): Encoding of the file.
+
+        Returns:
+            Bibliography: Bibliography object.
+        """
+        bibliography = Bibliography()
+        if os.path.getsize(bibtes_path) == 0:  # empty files can not be mapped
+            return bibliography
+
+        with open(bibtes_path, "rb") as fin:
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for _, _, fields in scan_entries(buffer, encoding=encoding):
+                    bibliography.add_entry(_entry_from_fields(fields))
+
+        return bibliography
+
+    def parse_parallel(
+        self, bibtes_path: str, workers: Optional[int] = None, encoding: str = "utf-8"
+    ) -> Bibliography:
+        """Parse a BibTex file with multiple processes.
+
+        The file is split into chunks at lines starting with "@", the chunks are parsed in a process
+        pool and the entries are merged in their original order. Every chunk is checked to start
+        after the last entry of the previous chunk, if an "@" at a line start turns out to be inside
+        of an entry the file is parsed sequentially instead. The result is the same as the one of
+        `parse`, including the parser warnings, which are issued again once all chunks are parsed.
+
+        Args:
+            bibtes_path (str): Path to the bibtex file.
+            workers (Optional[int], optional): Number of processes. Defaults to the number of CPUs.
+            encoding (str, optional): Encoding of the file. Defaults to "utf-8".
+
+        Returns:
+            Bibliography: Bibliography object.
+        """
+        workers = workers or os.cpu_count() or 1
+        size = os.path.getsize(bibtes_path)
+        if workers == 1 or size == 0:
+            with open(bibtes_path, "r", encoding=encoding) as fin:
+                return self.parse(fin.read())
+
+        num_chunks = workers * CHUNKS_PER_WORKER
+        boundaries = [0]
+        with open(bibtes_path, "rb") as fin:
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for chunk in range(1, num_chunks):
+                    match = LINE_START_ENTRY.search(
+                        buffer, max(chunk * size // num_chunks, boundaries[-1] + 1)
+                    )
+                    if not match:
+                        break
+                    boundaries.append(match.start(1))
+        boundaries.append(size)
+
+        spans = [
+            (bibtes_path, start, end, encoding)
+            for start, end in zip(boundaries, boundaries[1:])
+        ]
+        bibliography = Bibliography()
+        messages: List[str] = []
+        # the entries are rebuilt while the workers scan the later chunks, they do not contain
+        # reference cycles and collecting during the rebuild of millions of objects only costs
+        # time, like in `SnapshotCache.load`
+        sequential = False
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                last_end = 0
+                for (_, start, _, _), (entries, end, chunk_messages) in zip(
+                    spans, executor.map(_parse_file_span, spans)
+                ):
+                    if start < last_end:  # chunk started inside of an entry
+                        sequential = True
+                        break
+                    bibliography.entries.extend(
+                        Entry.from_fields(fields) for fields in entries
+                    )
+                    messages.extend(chunk_messages)
+                    last_end = max(last_end, end)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if sequential:
+            with open(bibtes_path, "r", encoding=encoding) as fin:
+                return self.parse(fin.read())
+
+        reissue(messages)
+        return bibliography
+
+
+def _digest(buffer: memoryview, start: int, end: int) -> bytes:
+    return hashlib.sha1(buffer[start:end]).digest()
+
+
+class IncrementalParser:
+    """Keep a bibliography in sync with a BibTex file that is edited, re-parsing only the changes.
+
+    The byte span of every entry is remembered with two hashes, one of the entry and one of the
+    segment from the end of the previous entry to the end of the entry, which covers the text
+    between entries as well. `update` compares the segments at the start of the file at their
+    old offsets and those at the end shifted by the change of the file size, so only the region
+    in between is scanned for entries and the unchanged entries keep their objects. The new
+    entries of the region are parsed unless an entry with the same hash is among the entries
+    they replace, e.g. after entries were moved. The slice of `bibliography.entries` is then
+    replaced in place, so the citation-key index stays in sync. Entries must not be added to or
+    removed from the bibliography other than by `update`, if the number of entries does not
+    match, the file is parsed completely.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """Create a parser without a bibliography.
+
+        Args:
+            encoding (str, optional): Encoding of the file. Defaults to "utf-8".
+        """
+        self.encoding = encoding
+        self.bibliography = Bibliography()
+        self.spans: List[Tuple[int, int]] = []
+        self.hashes: List[bytes] = []
+        self._segment_hashes: List[bytes] = []
+        self._tail_hash = b""  # text after the last entry
+        self._size = 0
+
+    def parse(self, bibtes_path: str) -> Bibliography:
+        """Parse a BibTex file completely.
+
+        Args:
+            bibtes_path (str): Path to the bibtex file.
+
+        Returns:
+            Bibliography: Bibliography object, kept up to date by `update`.
+        """
+        self.bibliography = Bibliography()
+        self.spans = []
+        self.hashes = []
+        self._segment_hashes = []
+        self.update(bibtes_path)
+        return self.bibliography
+
+    def update(self, bibtes_path: str) -> Tuple[int, int, int]:
+        """Re-parse the entries that changed since the last parse or update.
+
+        Args:
+            bibtes_path (str): Path to the bibtex file.
+
+        Returns:
+            Tuple[int, int, int]: Index of the first replaced entry, number of removed entries and
+                number of added entries. Nothing changed if both numbers are 0.
+        """
+        # the file is read instead of memory-mapped, editors may truncate it at any time
+        with open(bibtes_path, "rb") as fin:
+            data = fin.read()
+        buffer = memoryview(data)
+        entries = self.bibliography.entries
+        spans, hashes, segment_hashes = self.spans, self.hashes, self._segment_hashes
+        if len(spans) != len(entries):  # changed by others, replace all entries
+            spans, hashes, segment_hashes = [], [], []
+        count = len(spans)
+
+        # unchanged entries at the start keep their offsets
+        first = 0
+        pos = 0
+        while first < count:
+            start, end = spans[first]
+            if _digest(buffer, pos, end) != segment_hashes[first]:
+                break
+            # an entry that ran to the old end of the file may have been unterminated and
+            # continue in the appended text
+            if (
+                end == self._size
+                and len(data) > end
+                and next(find_entry_spans(data, start))[1] != end
+            ):
+                break
+            pos = end
+            first += 1
+
+        # unchanged entries at the end are shifted by the change of the file size
+        shift = len(data) - self._size
+        unchanged_end = 0
+        scan_end = len(data)
+        tail_start = spans[-1][1] + shift if count else -1
+        if (
+            tail_start >= pos
+            and _digest(buffer, tail_start, len(data)) == self._tail_hash
+        ):
+            while unchanged_end < count - first:
+                index = count - 1 - unchanged_end
+                gap_start = (spans[index - 1][1] if index else 0) + shift
+                if gap_start < pos or (
+                    _digest(buffer, gap_start, spans[index][1] + shift)
+                    != segment_hashes[index]
+                ):
+                    break
+                scan_end = gap_start
+                unchanged_end += 1
+        old_end = count - unchanged_end
+
+        changed = list(scan_entries(data, pos, scan_end, self.encoding))
+        if changed and changed[-1][1] > scan_end:
+            # an entry of the region runs into the unchanged end, e.g. a brace was deleted
+            unchanged_end = 0
+            old_end = count
+            changed = list(scan_entries(data, pos, encoding=self.encoding))
+        changed_spans = [(start, end) for start, end, _ in changed]
+        kept_spans = [(start + shift, end + shift) for start, end in spans[old_end:]]
+
+        changed_hashes = [_digest(buffer, start, end) for start, end in changed_spans]
+        # the text before the first unchanged entry at the end may have changed
+        changed_segment_hashes = []
+        previous_end = pos
+        for start, end in changed_spans + kept_spans[:1]:
+            changed_segment_hashes.append(_digest(buffer, previous_end, end))
+            previous_end = end
+
+        removed_end = old_end if count == len(entries) else len(entries)
+        if first < removed_end or changed_spans:
+            reusable: Dict[bytes, List[Entry]] = {}
+            for digest, entry in zip(hashes[first:old_end], entries[first:old_end]):
+                reusable.setdefault(digest, []).append(entry)
+            replacement = []
+            for (_, _, fields), digest in zip(changed, changed_hashes):
+                if reusable.get(digest):
+                    replacement.append(reusable[digest].pop(0))
+                else:
+                    replacement.append(_entry_from_fields(fields))
+            entries[first:removed_end] = replacement
+
+        self.spans = spans[:first] + changed_spans + kept_spans
+        self.hashes = hashes[:first] + changed_hashes + hashes[old_end:]
+        self._segment_hashes = (
+            segment_hashes[:first]
+            + changed_segment_hashes
+            + segment_hashes[old_end + 1 :]
+        )
+        self._tail_hash = _digest(
+            buffer, self.spans[-1][1] if self.spans else 0, len(data)
+        )
+        self._size = len(data)
+        return first, removed_end - first, len(changed_spans)
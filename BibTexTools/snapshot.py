@@ -0,0 +1,208 @@
+import gc
+import hashlib
+import marshal
+import os
+import struct
+import sys
+import warnings
+from typing import List, NamedTuple, Optional, Tuple
+
+from BibTexTools.bibliography import Bibliography, Entry
+from BibTexTools.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(DEFAULT_CACHE_DIR, "snapshots")
+MAGIC = b"BTTSNAP\n"
+# increase whenever the layout of the snapshots changes, older snapshots are then ignored
+FORMAT_VERSION = 1
+HEADER_LENGTH = struct.Struct("<I")
+READ_SIZE = 1 << 20
+# total size of the snapshots, the least recently used ones are deleted
+MAX_BYTES = 1 << 30
+
+
+class FileKey(NamedTuple):
+    """Identity of the content of a BibTex file."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def file_key(path: str) -> FileKey:
+    """Stat and hash a file.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        FileKey: Size, modification time and SHA-1 digest of the file.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha1()
+    with open(path, "rb") as fin:
+        while chunk := fin.read(READ_SIZE):
+            digest.update(chunk)
+    return FileKey(stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+
+class SnapshotCache:
+    """Binary snapshots of parsed bibliographies.
+
+    A snapshot holds the field names and values of all entries of a parsed BibTex file,
+    serialized with marshal, and the warnings the parser issued. It is only loaded if the path,
+    size, modification time and content hash of the file and the encoding match the header of
+    the snapshot, and if the snapshot was written in the current format by the same Python
+    version. Anything else, including a damaged snapshot, counts as a miss and the file is
+    parsed again. Snapshots are written to a temporary file first and then moved into place, so
+    concurrent processes never read a partial snapshot. Once the snapshots take more than
+    `max_bytes`, the least recently used ones are deleted.
+    """
+
+    def __init__(
+        self, directory: str = DEFAULT_SNAPSHOT_DIR, max_bytes: int = MAX_BYTES
+    ):
+        """Create a cache.
+
+        Args:
+            directory (str, optional): Directory of the snapshot files. Defaults to
+                DEFAULT_SNAPSHOT_DIR.
+            max_bytes (int, optional): Maximal total size of the snapshot files. Defaults to
+                MAX_BYTES.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot_path(self, path: str) -> str:
+        """Path of the snapshot of a BibTex file."""
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".snapshot")
+
+    @staticmethod
+    def _header(path: str, key: FileKey, encoding: str) -> tuple:
+        return (
+            FORMAT_VERSION,
+            sys.version_info[:2],
+            os.path.abspath(path),
+            tuple(key),
+            encoding,
+        )
+
+    def load(
+        self, path: str, key: FileKey, encoding: str = "utf-8"
+    ) -> Optional[Tuple[Bibliography, List[str]]]:
+        """Load the snapshot of a file.
+
+        Args:
+            path (str): Path of the BibTex file.
+            key (FileKey): Current key of the file.
+            encoding (str, optional): Encoding the file is parsed with. Defaults to "utf-8".
+
+        Returns:
+            Optional[Tuple[Bibliography, List[str]]]: Bibliography and the messages of the
+                parser warnings or None if there is no valid snapshot.
+        """
+        snapshot_path = self.snapshot_path(path)
+        try:
+            with open(snapshot_path, "rb") as fin:
+                if fin.read(len(MAGIC)) != MAGIC:
+                    raise ValueError("not a snapshot")
+                (length,) = HEADER_LENGTH.unpack(fin.read(HEADER_LENGTH.size))
+                header = marshal.loads(fin.read(length))
+                if header != self._header(path, key, encoding):
+                    raise ValueError("outdated snapshot")
+                payload = fin.read()
+            # the entries and the index of the keys do not contain reference cycles, collecting
+            # during the rebuild of millions of objects only costs time
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                messages, rows = marshal.loads(payload)
+                bibliography = Bibliography(
+                    [Entry.from_fields(fields, string) for string, fields in rows]
+                )
+            finally:
+                if gc_enabled:
+                    gc.enable()
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(snapshot_path)  # mark as recently used for `prune`
+        except OSError:
+            pass
+        return bibliography, messages
+
+    def store(
+        self,
+        path: str,
+        key: FileKey,
+        bibliography: Bibliography,
+        messages: List[str],
+        encoding: str = "utf-8",
+    ):
+        """Write the snapshot of a parsed file.
+
+        Args:
+            path (str): Path of the BibTex file.
+            key (FileKey): Key of the file before it was parsed.
+            bibliography (Bibliography): Parsed bibliography.
+            messages (List[str]): Messages of the warnings issued while parsing.
+            encoding (str, optional): Encoding the file was parsed with. Defaults to "utf-8".
+        """
+        header = marshal.dumps(self._header(path, key, encoding))
+        rows = [
+            (
+                entry.string,
+                [(field.name, field.value) for field in entry._fields.values()],
+            )
+            for entry in bibliography.entries
+        ]
+        snapshot_path = self.snapshot_path(path)
+        partial_path = f"{snapshot_path}.{os.getpid()}.partial"
+        with open(partial_path, "wb") as fout:
+            fout.write(MAGIC)
+            fout.write(HEADER_LENGTH.pack(len(header)))
+            fout.write(header)
+            fout.write(marshal.dumps((messages, rows)))
+        os.replace(partial_path, snapshot_path)
+        self.prune()
+
+    def prune(self):
+        """Delete the least recently used snapshots until the rest fits into `max_bytes`.
+
+        The most recently used snapshot is always kept, even if it is larger on its own.
+        """
+        snapshots = []
+        for dir_entry in os.scandir(self.directory):
+            if not dir_entry.name.endswith(".snapshot"):
+                continue
+            try:
+                stat = dir_entry.stat()
+            except FileNotFoundError:  # deleted by another process
+                continue
+            snapshots.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+        snapshots.sort(reverse=True)
+        total = 0
+        for index, (_, size, snapshot_path) in enumerate(snapshots):
+            total += size
+            if index > 0 and total > self.max_bytes:
+                try:
+                    os.remove(snapshot_path)
+                except FileNotFoundError:
+                    pass
+
+    def remove(self, path: str):
+        """Delete the snapshot of a file if there is one."""
+        snapshot_path = self.snapshot_path(path)
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+
+def reissue(messages: List[str]):
+    """Issue the parser warnings of a snapshot again."""
+    for message in messages:
+        warnings.warn(UserWarning(message))
@@ -1,11 +1,13 @@
 import os
+import pickle
 from BibTexTools.parser import Parser
+from BibTexTools.bibliography import Bibliography, Entry
+from BibTexTools.index import BibliographyIndex
 import pytest
 import json
 
 Bib_string = """@Atype{Akey,
-author    = {A1_First von A1_Last and
-            A2_First von A2_Last},
+author    = {A1_First von A1_Last and von A2_Last, A2_First},
 title     = {A_Title},
 journal   = {A_Journal},
 volume    = {A_Volume},
@@ -15,8 +17,7 @@ url       = {A_Url},
 
 
 @Btype{Bkey,
-author    = {B1_First von B1_Last and
-            B2_First von B2_Last},
+author    = {B1_First von B1_Last and von B2_Last, B2_First},
 title     = {B_Title},
 journal   = {B_Journal},
 volume    = {B_Volume},
@@ -25,15 +26,13 @@ url       = {B_Url},
 }"""
 
 Bib_string_fields = """@Atype{Akey,
-author    = {A1_First von A1_Last and
-            A2_First von A2_Last},
+author    = {A1_First von A1_Last and von A2_Last, A2_First},
 title     = {A_Title},
 }
 
 
 @Btype{Bkey,
-author    = {B1_First von B1_Last and
-            B2_First von B2_Last},
+author    = {B1_First von B1_Last and von B2_Last, B2_First},
 title     = {B_Title},
 }"""
 
@@ -47,6 +46,29 @@ def bib_obj_full():
     return parsed_bibtex
 
 
+@pytest.fixture
+def bib_obj_keys():
+    bibliography = Bibliography()
+    for key in ["a", "b", "a", "c"]:
+        entry = Entry()
+        entry.add_field("type", "misc")
+        entry.add_field("key", key)
+        bibliography.add_entry(entry)
+    return bibliography
+
+
+@pytest.fixture
+def bib_obj_query():
+    parser_obj = Parser()
+    return parser_obj.parse(
+        """@article{a, author = {M{\\"u}ller, Anna and Bob Smith}, journal = {J. Test},
+  year = {2019}}
+@inproceedings{b, author = {Carl von Smith}, booktitle = {Proc. {Conf}}, year = 2020}
+@article{c, author = {Anna M\u00fcller}, journal = {j. test}, year = {2021}}
+@misc{d, title = {No Authors}}"""
+    )
+
+
 class TestClassBibliography:
     def test_to_bibtex(self, bib_obj_full):
         bibtex_str = bib_obj_full.to_bibtex()
@@ -57,15 +79,14 @@ class TestClassBibliography:
         bibtex_str = bib_obj_full.to_bibtex(fields)
         assert bibtex_str.replace(" ", "") == Bib_string_fields.replace(" ", "")
 
-    def test_to_bib(self, bib_obj_full):
-        file_path = os.path.join("BibTexTools", "tests", "data", "to_bib.bib")
+    def test_to_bib(self, bib_obj_full, tmp_path):
+        file_path = str(tmp_path / "to_bib.bib")
         bib_obj_full.to_bib(file_path)
         assert os.path.isfile(file_path)
-        os.remove(file_path)
 
-    def test_to_bib_fields(self, bib_obj_full):
+    def test_to_bib_fields(self, bib_obj_full, tmp_path):
         fields = ["author", "title"]
-        file_path = os.path.join("BibTexTools", "tests", "data", "to_bib.bib")
+        file_path = str(tmp_path / "to_bib.bib")
         bib_obj_full.to_bib(file_path, fields)
 
         parser_obj = Parser()
@@ -76,14 +97,13 @@ class TestClassBibliography:
         fields += ["key", "type"]  # allways present
         assert set(fields) == set(all_fields)
 
-    def test_to_json_exists(self, bib_obj_full):
-        file_path = os.path.join("BibTexTools", "tests", "data", "to_json.json")
+    def test_to_json_exists(self, bib_obj_full, tmp_path):
+        file_path = str(tmp_path / "to_json.json")
         bib_obj_full.to_json(file_path)
         assert os.path.isfile(file_path)
-        os.remove(file_path)
 
-    def test_to_json_file(self, bib_obj_full):
-        file_path = os.path.join("BibTexTools", "tests", "data", "to_json.json")
+    def test_to_json_file(self, bib_obj_full, tmp_path):
+        file_path = str(tmp_path / "to_json.json")
         bib_obj_full.to_json(file_path)
         with open(file_path, "r") as fin:
             new_file = json.load(fin)
@@ -93,11 +113,10 @@ class TestClassBibliography:
             ref_file = json.load(fin)
 
         assert ref_file == new_file
-        os.remove(file_path)
 
-    def test_to_json_fields(self, bib_obj_full):
+    def test_to_json_fields(self, bib_obj_full, tmp_path):
         fields = ["author", "title"]
-        file_path = os.path.join("BibTexTools", "tests", "data", "to_json_fields.json")
+        file_path = str(tmp_path / "to_json_fields.json")
         bib_obj_full.to_json(file_path, fields)
         with open(file_path, "r") as fin:
             to_json_fields = json.load(fin)
@@ -126,3 +145,123 @@ class TestClassBibliography:
             bib_obj_full.entries[1].author.author_list[1].name_string
             == "von B2_Last, B."
         )
+
+    def test_key_index(self, bib_obj_full):
+        assert "Akey" in bib_obj_full
+        assert "Ckey" not in bib_obj_full
+        assert bib_obj_full["Bkey"] is bib_obj_full.entries[1]
+        assert bib_obj_full.get("Ckey") is None
+        with pytest.raises(KeyError):
+            bib_obj_full["Ckey"]
+
+    def test_duplicate_keys(self, bib_obj_keys):
+        assert bib_obj_keys.duplicate_keys() == ["a"]
+        assert bib_obj_keys["a"] is bib_obj_keys.entries[0]
+
+    def test_remove_key(self, bib_obj_keys):
+        del bib_obj_keys["a"]
+        assert "a" not in bib_obj_keys
+        assert len(bib_obj_keys) == 2
+        assert [entry.key.value for entry in bib_obj_keys.entries] == ["b", "c"]
+        with pytest.raises(KeyError):
+            del bib_obj_keys["a"]
+
+    def test_remove_key_held_list(self, bib_obj_keys):
+        entries = bib_obj_keys.entries
+        entry_a = bib_obj_keys["a"]
+        del bib_obj_keys["a"]
+        entries.append(entry_a)
+        assert bib_obj_keys["a"] is entry_a
+        assert [entry.key.value for entry in bib_obj_keys.entries] == ["b", "c", "a"]
+
+        del bib_obj_keys["b"]
+        entries[0] = entry_a
+        assert "b" not in bib_obj_keys
+        assert [entry.key.value for entry in bib_obj_keys.entries] == ["a", "a"]
+
+    def test_index_list_sync(self, bib_obj_keys):
+        entry_b = bib_obj_keys.entries.pop(1)
+        assert "b" not in bib_obj_keys
+        bib_obj_keys.entries.insert(0, entry_b)
+        assert bib_obj_keys["b"] is entry_b
+        bib_obj_keys.entries[0:2] = []
+        assert "b" not in bib_obj_keys
+        assert bib_obj_keys.duplicate_keys() == []
+        bib_obj_keys.entries.clear()
+        assert "c" not in bib_obj_keys
+
+    def test_pickle(self, bib_obj_keys):
+        bibliography = pickle.loads(pickle.dumps(bib_obj_keys))
+        assert bibliography == bib_obj_keys
+        assert bibliography.duplicate_keys() == ["a"]
+
+    def test_query(self, bib_obj_query):
+        def keys(entries):
+            return [entry.key.value for entry in entries]
+
+        assert keys(bib_obj_query.query(author="Smith")) == ["a", "b"]
+        assert keys(bib_obj_query.query(author="müller")) == ["a", "c"]
+        assert keys(bib_obj_query.query(year=2020)) == ["b"]
+        assert keys(bib_obj_query.query(year=(2020, None))) == ["b", "c"]
+        assert keys(bib_obj_query.query(entry_type="Article")) == ["a", "c"]
+        assert keys(bib_obj_query.query(venue="J. Test", year=(None, 2020))) == ["a"]
+        assert keys(bib_obj_query.query(author="Smith", entry_type="misc")) == []
+        assert keys(bib_obj_query.query()) == ["a", "b", "c", "d"]
+
+    def test_query_keeps_output(self, bib_obj_query):
+        bibtex_str = bib_obj_query.to_bibtex()
+        bib_obj_query.query(author="smith")
+        [entry.to_dict() for entry in bib_obj_query.entries]
+        assert bib_obj_query.to_bibtex() == bibtex_str
+
+    def test_query_index_sync(self, bib_obj_query):
+        assert len(bib_obj_query.query(author="Smith")) == 2
+        del bib_obj_query["a"]
+        bib_obj_query.entries.append(bib_obj_query.entries.pop(0))
+        entries = bib_obj_query.query(author="smith")
+        assert [entry.key.value for entry in entries] == ["b"]
+        assert bib_obj_query.query(year=(2019, 2019)) == []
+
+    def test_index_same_entry_twice(self, bib_obj_query):
+        index = BibliographyIndex()
+        entry = bib_obj_query.entries[0]
+        index.add(entry)
+        index.add(entry)
+        assert index.query(author="Smith") == [entry]
+        index.remove(entry)
+        assert index.query(author="Smith") == [entry]
+        index.remove(entry)
+        assert index.query(author="Smith") == []
+        assert index.query(year=2019) == []
+
+        assert len(bib_obj_query.query(author="Smith")) == 2
+        bib_obj_query.entries.append(entry)
+        bib_obj_query.entries.pop()
+        assert bib_obj_query.query(venue="J. Test", year=2019) == [entry]
+
+    def test_query_index_edited_entry(self, bib_obj_query):
+        assert len(bib_obj_query.query(venue="J. Test")) == 2
+        bib_obj_query.entries[0].add_field("journal", "{Other Journal}")
+        bib_obj_query.entries[0].add_field("author", "{Someone Else}")
+        del bib_obj_query["a"]
+        entries = bib_obj_query.query(venue="J. Test")
+        assert [entry.key.value for entry in entries] == ["c"]
+        assert bib_obj_query.query(author="Smith")[0].key.value == "b"
+
+    def test_to_json_duplicate_keys(self, bib_obj_keys, tmp_path):
+        file_path = str(tmp_path / "to_json.json")
+        bib_obj_keys.entries[2].add_field("title", "{second a}")
+        bib_obj_keys.to_json(file_path)
+        with open(file_path, "r") as fin:
+            to_json = json.load(fin)
+
+        assert list(to_json.keys()) == ["a", "b", "c"]
+        assert to_json["a"]["title"] == "second a"
+
+    def test_to_jsonl(self, bib_obj_full, tmp_path):
+        file_path = str(tmp_path / "to_json.jsonl")
+        bib_obj_full.to_jsonl(file_path, ["title"])
+        with open(file_path, "r") as fin:
+            lines = [json.loads(line) for line in fin]
+
+        assert lines == [{"Akey": {"title": "A_Title"}}, {"Bkey": {"title": "B_Title"}}]
@@ -0,0 +1,54 @@
+import pytest
+from BibTexTools.cache import DBLPCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DBLPCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+class TestClassDBLPCache:
+    def test_search(self, cache):
+        assert cache.get_search("title") == (False, None)
+        cache.put_search("title", {"url": "https://dblp.org/rec/key"})
+        assert cache.get_search("title") == (True, {"url": "https://dblp.org/rec/key"})
+
+    def test_negative_search(self, cache):
+        cache.put_search("unknown", None)
+        assert cache.get_search("unknown") == (True, None)
+
+    def test_bibtex(self, cache):
+        assert cache.get_bibtex("https://dblp.org/rec/key") is None
+        cache.put_bibtex("https://dblp.org/rec/key", "@article{key}")
+        assert cache.get_bibtex("https://dblp.org/rec/key") == "@article{key}"
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_persistent(self, cache, tmp_path):
+        cache.put_bibtex("https://dblp.org/rec/key", "@article{key}")
+        cache.close()
+        reopened = DBLPCache(str(tmp_path))
+        assert reopened.get_bibtex("https://dblp.org/rec/key") == "@article{key}"
+        reopened.close()
+
+    def test_ttl(self, tmp_path):
+        cache = DBLPCache(str(tmp_path), ttl=60, negative_ttl=-1)
+        cache.put_search("title", {"url": "https://dblp.org/rec/key"})
+        cache.put_search("unknown", None)
+        assert cache.get_search("title")[0]
+        assert not cache.get_search("unknown")[0]
+        cache.close()
+
+    def test_lru_eviction(self, tmp_path):
+        cache = DBLPCache(str(tmp_path), max_entries=10)
+        for index in range(10):
+            cache.put_bibtex(str(index), "bibtex")
+        cache.get_bibtex("0")  # most recently used
+        cache.put_bibtex("10", "bibtex")
+
+        assert cache.get_bibtex("0") == "bibtex"
+        assert cache.get_bibtex("1") is None
+        assert cache.get_bibtex("10") == "bibtex"
+        cache.close()
@@ -1,10 +1,42 @@
 import os
+import time
 
 import pytest
-from BibTexTools.cleaner import Cleaner
+from BibTexTools.bibliography import Bibliography, extract_content_of_field
+from BibTexTools.cache import DBLPCache
+from BibTexTools.cleaner import Cleaner, entry_from_hit
+from BibTexTools.client import HTTPClient, RateLimiter
+from BibTexTools.journal import CleanJournal, FingerprintStore
+from BibTexTools.metrics import Metrics
+from BibTexTools.mock_dblp import DBLPSession
 from BibTexTools.parser import Parser
 
 
+@pytest.fixture
+def fake_dblp():
+    with pytest.warns(UserWarning):
+        parser = Parser()
+        file_path = os.path.join("BibTexTools", "tests", "data", "cleaned.bib")
+        return DBLPSession(parser.from_file(file_path))
+
+
+@pytest.fixture
+def fake_client(fake_dblp):
+    return HTTPClient(crawl_delay=0, session=fake_dblp)
+
+
+@pytest.fixture
+def bib_dirty(fake_dblp):
+    bibliography = Bibliography()
+    for index, entry in enumerate(fake_dblp.corpus.entries[:20]):
+        dirty = Parser().parse(
+            f"@article{{dirty{index}, title = {{{extract_content_of_field(entry.title.value)}}}}}"
+        )
+        bibliography.add_entry(dirty.entries[0])
+    bibliography.add_entry(Parser().parse("@article{unknown, title={_}}").entries[0])
+    return bibliography
+
+
 @pytest.fixture
 def cleaner_obj_simple():
     cleaner = Cleaner()
@@ -88,3 +120,164 @@ class TestClassCleaner:
             cleaned_bib = cleaner_obj_ignore_unknown.clean(bib_unknown)
         assert len(cleaned_bib.entries) == 1
         assert cleaned_bib.entries[0].key.value == "DBLP:conf/naacl/DevlinCLT19"
+
+    def test_clean_concurrent(self, fake_dblp, fake_client, bib_dirty):
+        with pytest.warns(UserWarning):
+            sequential = Cleaner(keep_unknown=True, client=fake_client).clean(bib_dirty)
+            concurrent = Cleaner(
+                keep_unknown=True, workers=8, client=fake_client
+            ).clean(bib_dirty)
+
+        assert len(concurrent.entries) == 21
+        assert concurrent.to_bibtex() == sequential.to_bibtex()
+        assert concurrent.entries[-1].key.value == "unknown"
+        assert [entry.key.value for entry in concurrent.entries[:20]] == [
+            entry.key.value for entry in fake_dblp.corpus.entries[:20]
+        ]
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+
+    def test_clean_cached(self, fake_dblp, fake_client, bib_dirty, tmp_path):
+        cache = DBLPCache(str(tmp_path))
+        cleaner = Cleaner(keep_unknown=True, cache=cache, client=fake_client)
+        with pytest.warns(UserWarning):
+            cleaned_bib = cleaner.clean(bib_dirty)
+        assert len(fake_dblp.requests) == 41
+
+        fake_dblp.requests = []
+        with pytest.warns(UserWarning):
+            recleaned_bib = cleaner.clean(bib_dirty)
+        assert fake_dblp.requests == []
+        assert recleaned_bib.to_bibtex() == cleaned_bib.to_bibtex()
+        cache.close()
+
+    def test_clean_metrics(self, fake_client, bib_dirty, tmp_path):
+        cache = DBLPCache(str(tmp_path))
+        metrics = Metrics()
+        cleaner = Cleaner(cache=cache, client=fake_client, metrics=metrics)
+        with pytest.warns(UserWarning):
+            cleaner.clean(bib_dirty)
+        assert metrics.counters == {"cache_misses": 41, "resolved": 20, "not_found": 1}
+
+        metrics.counters = {}
+        with pytest.warns(UserWarning):
+            cleaner.clean(bib_dirty)
+        assert metrics.counters == {"cache_hits": 41, "resolved": 20, "not_found": 1}
+        cache.close()
+
+    def test_clean_resume(self, fake_dblp, fake_client, bib_dirty, tmp_path):
+        path = str(tmp_path / "clean.journal")
+        cleaner = Cleaner(keep_unknown=True, client=fake_client)
+        with pytest.warns(UserWarning):
+            cleaned_bib = cleaner.clean(bib_dirty)
+
+        # simulate a run that was killed after ten entries
+        journal = CleanJournal(path)
+        partial = Bibliography(bib_dirty.entries[:10])
+        with pytest.warns(UserWarning):
+            cleaner.clean(partial, journal=journal)
+        journal.close()
+
+        fake_dblp.requests = []
+        journal = CleanJournal(path, resume=True)
+        with pytest.warns(UserWarning):
+            resumed_bib = cleaner.clean(bib_dirty, journal=journal)
+        journal.close()
+        assert len(fake_dblp.requests) == 21
+        assert resumed_bib.to_bibtex() == cleaned_bib.to_bibtex()
+
+    def test_unavailable_not_journaled(self, fake_dblp, bib_dirty, tmp_path):
+        fake_dblp.get = lambda url, **kwargs: None
+        client = HTTPClient(crawl_delay=0, retries=0, session=fake_dblp)
+        journal = CleanJournal(str(tmp_path / "clean.journal"))
+        cleaned_bib = Cleaner(keep_unknown=True, client=client).clean(
+            bib_dirty, journal=journal
+        )
+        journal.close()
+        assert cleaned_bib.to_bibtex() == bib_dirty.to_bibtex()
+        assert len(journal) == 0
+
+    def test_clean_from_hit(self, fake_dblp, fake_client, bib_dirty):
+        with pytest.warns(UserWarning):
+            cleaned_bib = Cleaner(keep_unknown=True, client=fake_client).clean(
+                bib_dirty
+            )
+        fake_dblp.requests = []
+        with pytest.warns(UserWarning):
+            hit_bib = Cleaner(
+                keep_unknown=True, client=fake_client, from_hit=True
+            ).clean(bib_dirty)
+
+        fallbacks = [
+            entry
+            for entry in fake_dblp.corpus.entries[:20]
+            if entry.type.value not in ["article", "inproceedings"]
+        ]
+        assert len(fake_dblp.requests) == 21 + len(fallbacks)
+        assert len(hit_bib) == len(cleaned_bib)
+        for hit_entry, entry in zip(hit_bib, cleaned_bib):
+            assert hit_entry.key.value == entry.key.value
+            assert hit_entry.type.value == entry.type.value
+        article = hit_bib["DBLP:journals/jet/Dietrich15"]
+        reference = cleaned_bib["DBLP:journals/jet/Dietrich15"]
+        assert article.to_bibtex() == reference.to_bibtex(article.fields)
+
+    def test_clean_incremental(self, fake_dblp, fake_client, bib_dirty, tmp_path):
+        path = str(tmp_path / "clean.fingerprints")
+        cleaner = Cleaner(keep_unknown=True, client=fake_client)
+        fingerprints = FingerprintStore(path)
+        with pytest.warns(UserWarning):
+            cleaned_bib = cleaner.clean(bib_dirty, fingerprints=fingerprints)
+        fingerprints.save()
+        cleaned_path = str(tmp_path / "cleaned.bib")
+        cleaned_bib.to_bib(cleaned_path)
+
+        # a later run on the cleaned file with one edited and one new entry
+        with pytest.warns(UserWarning):
+            bib = Parser().from_file(cleaned_path)
+        bib.entries[0].year.value = "{1999}"
+        bib.add_entry(bib_dirty.entries[1])
+        fake_dblp.requests = []
+        fingerprints = FingerprintStore(path)
+        with pytest.warns(UserWarning):
+            recleaned_bib = cleaner.clean(bib, fingerprints=fingerprints)
+        fingerprints.save()
+
+        # two requests for each of the edited and the new entry, one for the unknown entry
+        assert len(fake_dblp.requests) == 5
+        assert len(recleaned_bib) == 22
+        assert (
+            recleaned_bib.entries[0].to_bibtex() == cleaned_bib.entries[0].to_bibtex()
+        )
+        assert (
+            recleaned_bib.entries[-1].to_bibtex() == cleaned_bib.entries[1].to_bibtex()
+        )
+        assert len(FingerprintStore(path).known) == 20
+
+
+def test_entry_from_hit():
+    info = {
+        "authors": {"author": {"@pid": "w/WeiWang1", "text": "Wei Wang 0001"}},
+        "title": "Fast & Robust Parsing.",
+        "venue": "ACL",
+        "year": "2020",
+        "type": "Conference and Workshop Papers",
+        "key": "conf/acl/Wang20",
+        "url": "https://dblp.org/rec/conf/acl/Wang20",
+    }
+    with pytest.warns(UserWarning):
+        entry = entry_from_hit(info)
+    assert entry.type.value == "inproceedings"
+    assert entry.key.value == "DBLP:conf/acl/Wang20"
+    assert entry.author.value == "{Wei Wang}"
+    assert entry.title.value == r"{Fast \& Robust Parsing}"
+    assert entry.booktitle.value == "{ACL}"
+
+    assert entry_from_hit(dict(info, type="Editorship")) is None
+    assert entry_from_hit(dict(info, venue=["ACL", "EMNLP"])) is None
+    assert entry_from_hit({k: v for k, v in info.items() if k != "year"}) is None
@@ -0,0 +1,99 @@
+import pytest
+import requests
+from BibTexTools.client import HTTPClient, percentile, retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Answer requests with a fixed sequence of responses or exceptions."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params, timeout))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("BibTexTools.client.time.sleep", sleeps.append)
+
+    def make(responses, **kwargs):
+        session = FakeSession(responses)
+        client = HTTPClient(crawl_delay=0, session=session, **kwargs)
+        return client, session, sleeps
+
+    return make
+
+
+class TestClassHTTPClient:
+    def test_success(self, make_client):
+        client, session, sleeps = make_client([FakeResponse(200)])
+        assert client.get("https://dblp.org", {"q": "title"}).status_code == 200
+        assert session.calls == [("https://dblp.org", {"q": "title"}, (5.0, 30.0))]
+        assert sleeps == []
+
+    def test_backoff(self, make_client):
+        client, session, sleeps = make_client(
+            [FakeResponse(503), requests.Timeout(), FakeResponse(200)], backoff=0.5
+        )
+        assert client.get("https://dblp.org").status_code == 200
+        assert sleeps == [0.5, 1.0]
+        assert client.stats.retries == 2
+
+    def test_retry_after(self, make_client):
+        client, session, sleeps = make_client(
+            [FakeResponse(429, {"Retry-After": "7"}), FakeResponse(200)]
+        )
+        assert client.get("https://dblp.org").status_code == 200
+        assert sleeps == [7.0]
+
+    def test_failure(self, make_client):
+        client, session, sleeps = make_client(
+            [requests.ConnectionError()] * 2 + [FakeResponse(500)], retries=2
+        )
+        assert client.get("https://dblp.org").status_code == 500
+        assert len(session.calls) == 3
+        summary = client.stats.summary()
+        assert summary["requests"] == 3
+        assert summary["retries"] == 2
+        assert summary["failures"] == 1
+
+    def test_request_exceptions(self, make_client):
+        client, session, sleeps = make_client(
+            [requests.exceptions.ChunkedEncodingError(), FakeResponse(200)]
+            + [requests.TooManyRedirects()] * 2,
+            retries=1,
+        )
+        assert client.get("https://dblp.org").status_code == 200
+        assert client.get("https://dblp.org") is None
+        assert client.stats.summary()["failures"] == 1
+
+    def test_no_retry_on_client_error(self, make_client):
+        client, session, sleeps = make_client([FakeResponse(404)])
+        assert client.get("https://dblp.org").status_code == 404
+        assert client.stats.failures == 0
+
+
+def test_retry_after_date():
+    response = FakeResponse(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert retry_after(response) == 0.0
+    assert retry_after(FakeResponse(429)) is None
+    assert retry_after(None) is None
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 0.5) == 2.0
+    assert percentile(list(range(1, 101)), 0.95) == 95
@@ -0,0 +1,106 @@
+import pytest
+from BibTexTools.dedupe import MinHasher, find_duplicates, jaccard, shingles
+from BibTexTools.parser import Parser
+
+BIBTEX = r"""
+@inproceedings{devlin2019bert,
+  author = {Jacob Devlin and Ming-Wei Chang and Kenton Lee and Kristina Toutanova},
+  title = {{BERT}: Pre-training of Deep Bidirectional Transformers for Language Understanding},
+  booktitle = {NAACL-HLT},
+  year = {2019}
+}
+@article{mueller2017,
+  author = {J{\"u}rgen M{\"u}ller},
+  title = {Fast Search for Sets},
+  year = {2017}
+}
+@misc{bert,
+  author = {Devlin, Jacob and Chang, Ming-Wei},
+  title = {BERT: pre-training of deep bidirectional transformers for language understanding.},
+  year = {2019},
+  note = {arXiv}
+}
+@article{muller2017fast,
+  author = {Jürgen Müller},
+  title = {Fast {S}earch for {S}ets},
+  journal = {CoRR}
+}
+@article{mueller2018,
+  author = {Jürgen Müller},
+  title = {Fast Search for Sets},
+  year = {2018}
+}
+@article{other,
+  author = {Jane Doe},
+  title = {Fast Search for Sets},
+  year = {2017}
+}
+@article{unrelated,
+  author = {Jacob Devlin},
+  title = {Deep Bidirectional Language Models},
+  year = {2019}
+}
+"""
+
+
+@pytest.fixture
+def bib():
+    return Parser().parse(BIBTEX)
+
+
+def keys(groups):
+    return [[entry.key.value for entry in group] for group in groups]
+
+
+class TestClassDedupe:
+    def test_shingles(self):
+        assert shingles("{BERT}: Pre-training") == shingles("bert pre training.")
+        assert (
+            shingles(r"J{\"u}rgen")
+            == shingles("Jürgen")
+            == {"jur", "urg", "rge", "gen"}
+        )
+        assert shingles("ab") == {"ab"}
+        assert shingles("{}") == set()
+
+    def test_signature(self):
+        hasher = MinHasher()
+        first = shingles("deep learning for natural language processing tasks")
+        second = shingles("deep learning for natural language processing task")
+        signatures = hasher.signature(first), hasher.signature(second)
+        estimate = sum(a == b for a, b in zip(*signatures)) / hasher.num_perm
+        assert abs(estimate - jaccard(first, second)) < 0.1
+        assert hasher.signature(first) == MinHasher().signature(first)
+        assert len(hasher.band_keys(signatures[0])) == hasher.bands
+
+    def test_find_duplicates(self, bib):
+        assert keys(bib.find_duplicates()) == [
+            ["devlin2019bert", "bert"],
+            ["mueller2017", "muller2017fast"],
+        ]
+        assert keys(find_duplicates(bib.entries, threshold=1.01)) == []
+
+    def test_remove_duplicates(self, bib):
+        bib.remove_duplicates()
+        assert [entry.key.value for entry in bib] == [
+            "devlin2019bert",
+            "mueller2017",
+            "mueller2018",
+            "other",
+            "unrelated",
+        ]
+        assert "note" not in bib["devlin2019bert"].fields
+
+    def test_merge_duplicates(self, bib):
+        bib.remove_duplicates(merge=True)
+        assert len(bib) == 5
+        assert bib["devlin2019bert"].note.value == "{arXiv}"
+        assert bib["mueller2017"].journal.value == "{CoRR}"
+        assert bib.query(venue="CoRR") == [bib["mueller2017"]]
+
+    def test_merge_copies_fields(self, bib):
+        dropped = bib["muller2017fast"]
+        bib.remove_duplicates(merge=True)
+        assert bib["mueller2017"].journal is not dropped.journal
+        bib["mueller2017"].journal.value = "{Other}"
+        assert dropped.journal.value == "{CoRR}"
@@ -1,4 +1,6 @@
+import copy
 import os
+import pickle
 from BibTexTools.parser import Parser
 from BibTexTools.bibliography import (
     Author_field,
@@ -6,12 +8,12 @@ from BibTexTools.bibliography import (
     Author_field,
     Journal_field,
     Author,
+    AuthorPool,
 )
 import pytest
 
 A_string = """@Atype{Akey,
-author    = {A1_First von A1_Last and
-            A2_First von A2_Last},
+author    = {A1_First von A1_Last and von A2_Last, A2_First},
 title     = {A_Title},
 journal   = {A_Journal},
 volume    = {A_Volume},
@@ -20,8 +22,7 @@ url       = {A_Url},
 }"""
 
 A_string_fields = """@Atype{Akey,
-author    = {A1_First von A1_Last and
-            A2_First von A2_Last},
+author    = {A1_First von A1_Last and von A2_Last, A2_First},
 title     = {A_Title},
 }"""
 
@@ -113,3 +114,99 @@ class TestClassEntety:
         assert len(entry_dict["Akey"].keys()) == 3
 
         assert set(entry_dict["Akey"].keys()) == set(fields)
+
+    def test_to_dict_author_names(self, empty_entry):
+        empty_entry.add_field(
+            "author",
+            "{von A3_Last, A3_Jr, A3_First and A4_First A4_Mid A4_Mid2 A4_Last}",
+        )
+        # the name strings leave out the middle names
+        assert empty_entry.author.to_dict() == {
+            "author": ["A3_First von A3_Last", "A4_First A4_Last"]
+        }
+        assert empty_entry.author.author_list[1].mid == ["A4_Mid", "A4_Mid2"]
+
+    def test_fields_order(self, empty_entry):
+        empty_entry.add_field("title", "{my title}")
+        empty_entry.add_field("year", "2020")
+        assert empty_entry.fields == ["title", "year"]
+
+    def test_slotted_fields(self, entry_obj_full):
+        assert not hasattr(entry_obj_full.title, "__dict__")
+        assert not hasattr(entry_obj_full.author, "__dict__")
+        with pytest.raises(AttributeError):
+            entry_obj_full.booktitle
+
+    def test_replace_field(self, entry_obj_full):
+        entry_obj_full.title = entry_obj_full.journal
+        assert entry_obj_full.title.value == "{A_Journal}"
+        assert entry_obj_full.fields.count("journal") == 1
+
+    def test_pickle(self, entry_obj_full):
+        entry = pickle.loads(pickle.dumps(entry_obj_full))
+        assert entry == entry_obj_full
+        assert entry.to_dict() == entry_obj_full.to_dict()
+
+    def test_equal(self):
+        parser_obj = Parser()
+        entry = parser_obj.parse("@misc{a, title={A}}").entries[0]
+        assert entry == parser_obj.parse("@misc{a,\n  title = {A}\n}").entries[0]
+        other = parser_obj.parse("@misc{zzz, title={Completely different}}").entries[0]
+        assert entry != other
+
+    def test_copy(self, entry_obj):
+        names = [author.name_string for author in entry_obj.author.author_list]
+        abbreviated = copy.copy(entry_obj).abbreviate_names(middle=True)
+        assert abbreviated.author.author_list[0].name_string == "A1_Last, A. B."
+        assert abbreviated.author_full is entry_obj.author
+        assert [a.name_string for a in entry_obj.author.author_list] == names
+        assert not hasattr(entry_obj, "author_full")
+        assert abbreviated.type is entry_obj.type
+
+    def test_author_list_lazy(self, empty_entry):
+        empty_entry.add_field("author", "{last1, first1 and first2 last2}")
+        raw = "author = {last1, first1 and first2 last2}"
+        assert empty_entry.author._author_list is None
+        assert empty_entry.author.to_bibtex() == raw
+
+        # reading the author list does not change the output
+        assert empty_entry.author.author_list is empty_entry.author.author_list
+        assert empty_entry.author.to_bibtex() == raw
+
+        empty_entry.author.author_list = empty_entry.author.author_list[::-1]
+        assert (
+            empty_entry.author.to_bibtex()
+            == "author = {first2 last2 and\nfirst1 last1}"
+        )
+
+
+class TestClassAuthorPool:
+    def test_interned(self, empty_entry):
+        empty_entry.add_field("author", "{first mid last and first mid last}")
+        first, second = empty_entry.author.author_list
+        assert first is second
+        other = Entry()
+        other.add_field("author", "{first mid last}")
+        assert other.author.author_list[0] is first
+
+    def test_abbreviate_keeps_original(self):
+        pool = AuthorPool()
+        author = pool.get("First Mid Last")
+        abbreviated = pool.abbreviate(author, middle=True)
+        assert abbreviated.name_string == "Last, F. M."
+        assert author.name_string == "First Last"
+        assert author.first == "First"
+        assert author.mid == ["Mid"]
+        assert pool.abbreviate(pool.get("First Mid Last"), middle=True) is abbreviated
+        assert pool.abbreviate(author, middle=False).name_string == "Last, F."
+
+    def test_bounded(self):
+        pool = AuthorPool(maxsize=2)
+        first = pool.get("A First")
+        pool.get("B Second")
+        assert pool.get("A First") is first  # most recently used again
+        pool.get("C Third")
+        assert len(pool) == 2
+        assert pool.get("A First") is first
+        assert pool.hits == 2
+        assert pool.misses == 3
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from BibTexTools.journal import CleanJournal, default_journal_path, fingerprint
+from BibTexTools.parser import Parser
+
+
+@pytest.fixture
+def entries():
+    bib = Parser().parse(
+        "@article{a, title={First}}\n@article{b, title={Second}}\n@article{c, title={Third}}"
+    )
+    return bib.entries
+
+
+class TestClassCleanJournal:
+    def test_fingerprint(self, entries):
+        assert fingerprint(entries[0]) == fingerprint(
+            Parser().parse_entry("@article{a, title={First}}")
+        )
+        assert fingerprint(entries[0]) != fingerprint(entries[1])
+
+    def test_default_journal_path(self, tmp_path):
+        directory = str(tmp_path / "journals")
+        path = default_journal_path("refs.bib", directory)
+        assert os.path.dirname(path) == directory
+        assert os.path.isdir(directory)
+        assert default_journal_path(os.path.abspath("refs.bib"), directory) == path
+        assert default_journal_path("other.bib", directory) != path
+
+    def test_resume(self, entries, tmp_path):
+        path = str(tmp_path / "clean.journal")
+        journal = CleanJournal(path)
+        journal.record(entries[0], "@article{dblp, title={First}}")
+        journal.record(entries[1], None)
+        journal.close()
+
+        resumed = CleanJournal(path, resume=True)
+        assert len(resumed) == 2
+        assert resumed.get(entries[0]) == (True, "@article{dblp, title={First}}")
+        assert resumed.get(entries[1]) == (True, None)
+        assert resumed.get(entries[2]) == (False, None)
+        resumed.remove()
+        assert not (tmp_path / "clean.journal").exists()
+
+    def test_restart(self, entries, tmp_path):
+        path = str(tmp_path / "clean.journal")
+        journal = CleanJournal(path)
+        journal.record(entries[0], None)
+        journal.close()
+
+        restarted = CleanJournal(path)
+        assert len(restarted) == 0
+        assert restarted.get(entries[0]) == (False, None)
+        restarted.close()
+
+    def test_truncated_line(self, entries, tmp_path):
+        path = str(tmp_path / "clean.journal")
+        journal = CleanJournal(path)
+        journal.record(entries[0], None)
+        journal.close()
+        with open(path, "a") as journal_file:
+            journal_file.write('{"fingerprint": "abc", "bib')
+
+        resumed = CleanJournal(path, resume=True)
+        assert len(resumed) == 1
+        resumed.record(entries[1], None)
+        resumed.close()
+        assert len(CleanJournal(path, resume=True)) == 2
@@ -0,0 +1,57 @@
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from BibTexTools.client import RequestStats
+from BibTexTools.metrics import Metrics
+
+
+class TestClassMetrics:
+    def test_stage(self):
+        metrics = Metrics()
+        with metrics.stage("parse") as stage:
+            time.sleep(0.01)
+            stage["entries"] = 10
+        with metrics.stage("write"):
+            pass
+
+        parse = metrics.stages["parse"]
+        assert parse["seconds"] >= 0.01
+        assert parse["entries_per_second"] == 10 / parse["seconds"]
+        assert "peak_mb" not in parse
+        assert metrics.stages["write"]["entries"] is None
+        assert "entries_per_second" not in metrics.stages["write"]
+
+    def test_trace_memory(self):
+        metrics = Metrics(trace_memory=True)
+        with metrics.stage("allocate", 1):
+            data = bytearray(10**7)
+        del data
+        assert metrics.stages["allocate"]["peak_mb"] >= 10
+
+    def test_count(self):
+        metrics = Metrics()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(1000):
+                executor.submit(metrics.count, "cache_hits")
+        metrics.count("not_found", 3)
+        assert metrics.counters == {"cache_hits": 1000, "not_found": 3}
+
+    def test_report(self):
+        metrics = Metrics()
+        with metrics.stage("clean", 2):
+            metrics.count("resolved", 2)
+        requests = RequestStats()
+        requests.record(0.1)
+        requests.record(0.3, retry=True)
+
+        output = io.StringIO()
+        metrics.write(output, requests=requests)
+        report = json.loads(output.getvalue())
+        assert report["stages"]["clean"]["entries"] == 2
+        assert report["counters"] == {"resolved": 2}
+        assert report["seconds"] == report["stages"]["clean"]["seconds"]
+        assert report["requests"]["requests"] == 2
+        assert report["requests"]["retries"] == 1
+        assert report["requests"]["latency_max"] == 0.3
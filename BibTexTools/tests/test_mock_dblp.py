@@ -0,0 +1,90 @@
+import os
+
+import pytest
+import requests
+from BibTexTools.bibliography import Bibliography, extract_content_of_field
+from BibTexTools.cleaner import Cleaner
+from BibTexTools.client import HTTPClient
+from BibTexTools.mock_dblp import MockDBLP
+from BibTexTools.parser import Parser
+
+
+@pytest.fixture
+def corpus():
+    with pytest.warns(UserWarning):
+        parser = Parser()
+        file_path = os.path.join("BibTexTools", "tests", "data", "cleaned.bib")
+        return parser.from_file(file_path)
+
+
+@pytest.fixture
+def bib_dirty(corpus):
+    bibliography = Bibliography()
+    for index, entry in enumerate(corpus.entries[:10]):
+        dirty = Parser().parse(
+            f"@article{{dirty{index}, title = {{{extract_content_of_field(entry.title.value)}}}}}"
+        )
+        bibliography.add_entry(dirty.entries[0])
+    bibliography.add_entry(Parser().parse("@article{unknown, title={_}}").entries[0])
+    return bibliography
+
+
+def clean_against(mock, bibliography, workers=1, **client_options):
+    client = HTTPClient(crawl_delay=0, pool_size=workers, **client_options)
+    cleaner = Cleaner(workers=workers, client=client, base_url=mock.base_url)
+    cleaned = cleaner.clean(bibliography)
+    client.close()
+    return cleaned, client
+
+
+class TestClassMockDBLP:
+    def test_search_and_bibtex(self, corpus):
+        entry = corpus.entries[0]
+        with MockDBLP(corpus) as mock:
+            response = requests.get(
+                mock.base_url + "/search/publ/api",
+                params={"q": entry.title.value, "format": "json"},
+            )
+            assert response.status_code == 200
+            hits = response.json()["result"]["hits"]
+            assert hits["@total"] == "1"
+            url = hits["hit"][0]["info"]["url"]
+            assert url.startswith(mock.base_url)
+
+            response = requests.get(url + ".bib")
+            assert response.status_code == 200
+            assert response.text == entry.to_bibtex()
+
+            response = requests.get(mock.base_url + "/rec/unknown.bib")
+            assert response.status_code == 404
+        assert mock.counts == {200: 2, 404: 1}
+
+    def test_clean(self, corpus, bib_dirty):
+        with MockDBLP(corpus) as mock:
+            cleaned, client = clean_against(mock, bib_dirty, workers=4)
+        assert [entry.to_bibtex() for entry in cleaned.entries] == [
+            entry.to_bibtex() for entry in corpus.entries[:10]
+        ]
+        # a search per entry and a BibTex export per known entry
+        assert mock.counts == {200: 21}
+        assert client.stats.summary()["requests"] == 21
+
+    def test_errors_are_retried(self, corpus, bib_dirty):
+        with MockDBLP(
+            corpus, error_rate=0.2, throttle_rate=0.2, retry_after=0, seed=1
+        ) as mock:
+            cleaned, client = clean_against(mock, bib_dirty, retries=20, backoff=0)
+        assert len(cleaned) == 10
+        assert mock.counts[503] > 0 and mock.counts[429] > 0
+        assert client.stats.retries == mock.counts[503] + mock.counts[429]
+        assert client.stats.failures == 0
+
+    def test_rate_limit(self, corpus):
+        with MockDBLP(corpus, rate_limit=1) as mock:
+            statuses = [
+                requests.get(mock.base_url + "/rec/unknown.bib").status_code
+                for _ in range(3)
+            ]
+            response = requests.get(mock.base_url + "/rec/unknown.bib")
+        assert statuses == [404, 429, 429]
+        assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,89 @@
+import gzip
+import os
+import shutil
+
+import pytest
+from BibTexTools.cleaner import Cleaner
+from BibTexTools.offline import DBLPDump, iter_records, title_key
+from BibTexTools.parser import Parser
+
+DUMP_PATH = os.path.join("BibTexTools", "tests", "data", "dblp_sample.xml")
+
+
+@pytest.fixture
+def dump(tmp_path):
+    dump = DBLPDump.build(DUMP_PATH, str(tmp_path / "dblp.sqlite"), read_size=64)
+    yield dump
+    dump.close()
+
+
+class TestClassDBLPDump:
+    def test_iter_records(self):
+        with open(DUMP_PATH, "rb") as dump_file:
+            records = list(iter_records(dump_file, read_size=64))
+        assert [record["key"] for record in records] == [
+            "journals/jet/Dietrich15",
+            "journals/corr/abs-1810-04805",
+            "conf/naacl/DevlinCLT19",
+            "conf/www/Muller0017",
+        ]
+        assert records[2]["ee"] == "https://doi.org/10.18653/v1/n19-1423"
+        assert records[3]["author"] == ["Jürgen Müller", "Wei Wang 0001"]
+        assert records[3]["title"] == "Fast k-NN Search for Sets & Sequences."
+
+    def test_lookup(self, dump):
+        assert len(dump) == 4
+        assert (
+            dump.lookup("{Bert: Pre-training of deep bidirectional transformers}")
+            is None
+        )
+
+        with pytest.warns(UserWarning):
+            entry = dump.lookup(
+                "{Bert: Pre-training of deep bidirectional transformers for language understanding}"
+            )
+        assert entry.key.value == "DBLP:conf/naacl/DevlinCLT19"
+        assert entry.type.value == "inproceedings"
+        assert entry.booktitle.value == "{NAACL-HLT (1)}"
+        assert entry.pages.value == "{4171--4186}"
+        assert entry.doi.value == "{10.18653/v1/n19-1423}"
+
+    def test_entry(self, dump):
+        assert dump.lookup("Fast k-NN search for sets and sequences") is None
+        with pytest.warns(UserWarning):
+            entry = dump.lookup("Fast {$k$}-NN search for sets & sequences")
+        assert entry.author.value == "{Jürgen Müller and Wei Wang}"
+        assert entry.title.value == r"{Fast k-NN Search for Sets \& Sequences}"
+        assert "doi" not in entry.fields
+
+    def test_from_dump(self, tmp_path):
+        dump_path = str(tmp_path / "dblp.xml.gz")
+        with open(DUMP_PATH, "rb") as source, gzip.open(dump_path, "wb") as target:
+            shutil.copyfileobj(source, target)
+        dump = DBLPDump.from_dump(dump_path)
+        assert os.path.exists(dump_path + ".sqlite")
+        assert len(dump) == 4
+        dump.close()
+        assert len(DBLPDump.from_dump(dump_path + ".sqlite")) == 4
+
+    def test_clean_offline(self, dump):
+        bib = Parser().parse(
+            "@article{devlin2018bert, title={Bert: Pre-training of deep bidirectional "
+            "transformers for language understanding}, year={2018}}\n"
+            "@article{unknown, title={Unknown}}"
+        )
+        cleaner = Cleaner(keep_unknown=True, dump=dump)
+        with pytest.warns(UserWarning):
+            cleaned_bib = cleaner.clean(bib)
+        assert [entry.key.value for entry in cleaned_bib] == [
+            "DBLP:conf/naacl/DevlinCLT19",
+            "unknown",
+        ]
+        assert cleaner.client.stats.requests == 0
+
+
+def test_title_key():
+    assert (
+        title_key("{BERT:} Pre-training of {D}eep Models.")
+        == "bert pre training of deep models"
+    )
@@ -1,6 +1,13 @@
 import pytest
 import os
-from BibTexTools.parser import Parser
+import random
+from BibTexTools.parser import (
+    IncrementalParser,
+    Parser,
+    find_entry_spans,
+    scan_entries,
+    tokenize_entry,
+)
 
 
 @pytest.fixture
@@ -10,6 +17,29 @@ def bib_simple():
     return bibtex_string
 
 
+@pytest.fixture
+def bib_delimiters():
+    return """@misc{key,
+  title     = "A = B, {and} C",
+  url       = {https://example.org/?a=1&b=2},
+  note      = {first line
+               second line},
+  year      = 2021
+}"""
+
+
+@pytest.fixture
+def bib_many(tmp_path):
+    file_path = tmp_path / "many.bib"
+    entries = [
+        f"@article{{key{i},\n  author = {{First{i} Last{i} and\n    Other Author}},\n"
+        f"  title  = {{Title {i}}},\n  year   = {{{2000 + i % 20}}},\n}}\n"
+        for i in range(200)
+    ]
+    file_path.write_text("\n".join(entries))
+    return str(file_path)
+
+
 @pytest.fixture
 def parser_obj():
     return Parser()
@@ -89,3 +119,278 @@ class TestClassParser:
         assert entry.author.author_list[3].first == "A4_First"
         assert entry.author.author_list[3].last == "A4_Last Jr."
         assert entry.author.author_list[3].mid == ["B4_Mid"]
+
+    def test_iter_entries(self, parser_obj):
+        file_path = os.path.join("BibTexTools", "tests", "data", "full.bib")
+        with pytest.warns(UserWarning):
+            parsed_bibtex = parser_obj.from_file(file_path)
+            with open(file_path, "r") as fin:
+                entries = list(parser_obj.iter_entries(fin, chunk_size=7))
+
+        assert len(entries) == len(parsed_bibtex.entries)
+        for entry, ref_entry in zip(entries, parsed_bibtex.entries):
+            assert entry.to_dict() == ref_entry.to_dict()
+
+    def test_iter_entries_lazy(self, parser_obj):
+        file_path = os.path.join("BibTexTools", "tests", "data", "simple.bib")
+        with open(file_path, "r") as fin:
+            entries = parser_obj.iter_entries(fin)
+            assert not isinstance(entries, list)
+            entry = next(entries)
+
+        assert entry.key.value == "key"
+        assert entry.title.value == r"{mytitle}"
+
+    def test_parse_value_delimiters(self, parser_obj, bib_delimiters):
+        with pytest.warns(UserWarning):
+            parsed_bibtex = parser_obj.parse(bib_delimiters)
+        entry = parsed_bibtex.entries[0]
+
+        assert entry.fields == ["type", "key", "title", "url", "note", "year"]
+        assert entry.title.value == r'"A = B, {and} C"'
+        assert entry.url.value == r"{https://example.org/?a=1&b=2}"
+        assert entry.note.value == r"{first line second line}"
+        assert entry.year.value == "2021"
+
+    @pytest.mark.parametrize(
+        "bibtex_string",
+        [
+            "@misc{a, title = {One {Two {Three {Four}}}}, year = 2020}",
+            '@misc{a, title = "A {B} C", note = "x, y" # z,\n}',
+            '@misc{a, title = "unterminated, year = 1}',
+            "@misc{a, title = {A}, junk, year = {2}}",
+            "@misc{a, title = {A}} text @ {b} @book{b}",
+            "@misc{a, title = {A},\n  year = {20",
+            "@ comment @misc{a, title = {A}}",
+        ],
+    )
+    def test_scan_entries(self, bibtex_string):
+        for buffer in (bibtex_string, bibtex_string.encode()):
+            expected = [
+                (start, end, list(tokenize_entry(buffer, start, end)))
+                for start, end in find_entry_spans(buffer)
+            ]
+            assert list(scan_entries(buffer)) == expected
+
+    def test_from_file_mmap(self, parser_obj):
+        file_path = os.path.join("BibTexTools", "tests", "data", "full.bib")
+        with pytest.warns(UserWarning):
+            parsed_bibtex = parser_obj.from_file(file_path)
+            mapped_bibtex = parser_obj.from_file(file_path, use_mmap=True)
+
+        assert len(mapped_bibtex.entries) == len(parsed_bibtex.entries)
+        for entry, ref_entry in zip(mapped_bibtex.entries, parsed_bibtex.entries):
+            assert entry.to_dict() == ref_entry.to_dict()
+
+    def test_from_file_mmap_encoding(self, parser_obj, tmp_path):
+        file_path = tmp_path / "utf8.bib"
+        file_path.write_text("@type{key,\n  title = {Über Ähnlichkeit},\n}", "utf-8")
+        parsed_bibtex = parser_obj.from_file(str(file_path), use_mmap=True)
+
+        assert parsed_bibtex.entries[0].title.value == r"{Über Ähnlichkeit}"
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_from_file_encoding(self, parser_obj, tmp_path, use_mmap):
+        file_path = tmp_path / "latin1.bib"
+        file_path.write_text("@type{key,\n  title = {Über Ähnlichkeit},\n}", "latin-1")
+        parsed_bibtex = parser_obj.from_file(
+            str(file_path), use_mmap=use_mmap, encoding="latin-1"
+        )
+
+        assert parsed_bibtex.entries[0].title.value == r"{Über Ähnlichkeit}"
+
+    def test_from_file_mmap_empty(self, parser_obj, tmp_path):
+        file_path = tmp_path / "empty.bib"
+        file_path.write_text("")
+        parsed_bibtex = parser_obj.from_file(str(file_path), use_mmap=True)
+
+        assert parsed_bibtex.entries == []
+
+    def test_parse_parallel(self, parser_obj, bib_many):
+        parsed_bibtex = parser_obj.from_file(bib_many)
+        parallel_bibtex = parser_obj.parse_parallel(bib_many, workers=2)
+
+        assert parallel_bibtex.entries == parsed_bibtex.entries
+        assert [entry.to_dict() for entry in parallel_bibtex.entries] == [
+            entry.to_dict() for entry in parsed_bibtex.entries
+        ]
+
+    def test_parse_parallel_at_in_value(self, parser_obj, tmp_path):
+        file_path = tmp_path / "at.bib"
+        note = "\n".join(["@note{line}"] * 50)
+        file_path.write_text(
+            f"@misc{{a,\n  title = {{A}},\n  note = {{{note}}},\n}}\n@misc{{b,\n  title = {{B}},\n}}"
+        )
+        parsed_bibtex = parser_obj.from_file(str(file_path))
+        parallel_bibtex = parser_obj.parse_parallel(str(file_path), workers=2)
+
+        assert [entry.key.value for entry in parallel_bibtex.entries] == ["a", "b"]
+        assert parallel_bibtex.entries == parsed_bibtex.entries
+
+    def test_parse_parallel_warnings(self, parser_obj, bib_many):
+        replace_text(bib_many, "{Title 150}", "{Title 150},\n  my_field = {value}")
+        with pytest.warns(UserWarning, match="my_field"):
+            parallel_bibtex = parser_obj.parse_parallel(bib_many, workers=2)
+        assert parallel_bibtex["key150"].my_field.value == "{value}"
+
+
+def replace_text(path, old, new):
+    with open(path) as fin:
+        text = fin.read()
+    assert old in text
+    with open(path, "w") as fout:
+        fout.write(text.replace(old, new))
+
+
+def field_values(bibliography):
+    return [
+        [getattr(entry, name).value for name in entry.fields]
+        for entry in bibliography.entries
+    ]
+
+
+class TestClassIncrementalParser:
+    def test_parse(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        parsed_bibtex = parser_obj.from_file(bib_many)
+        assert bibliography.entries == parsed_bibtex.entries
+        assert bibliography.to_bibtex() == parsed_bibtex.to_bibtex()
+        assert len(incremental.spans) == len(incremental.hashes) == 200
+        assert incremental.update(bib_many) == (200, 0, 0)
+
+    def test_edit(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        before = list(bibliography.entries)
+
+        replace_text(bib_many, "@article{key50,", "@article{renamed50,")
+        replace_text(bib_many, "title  = {Title 51}", "title  = {Edited Title}")
+        assert incremental.update(bib_many) == (50, 2, 2)
+
+        entries = bibliography.entries
+        assert all(a is b for a, b in zip(entries[:50], before[:50]))
+        assert all(a is b for a, b in zip(entries[52:], before[52:]))
+        assert entries[51].title.value == "{Edited Title}"
+        assert "key50" not in bibliography
+        assert bibliography["renamed50"] is entries[50]
+        assert bibliography.to_bibtex() == parser_obj.from_file(bib_many).to_bibtex()
+
+    def test_insert_and_delete(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        key10 = bibliography["key10"]
+
+        replace_text(
+            bib_many, "@article{key10,", "@misc{new, title={New}}\n@article{key10,"
+        )
+        # the text before key10 changed, but the entry is kept
+        assert incremental.update(bib_many) == (10, 1, 2)
+        assert bibliography.entries[10].key.value == "new"
+        assert bibliography.entries[11] is key10
+
+        with open(bib_many) as fin:
+            text = fin.read()
+        start = text.index("@article{key20,")
+        with open(bib_many, "w") as fout:
+            fout.write(text[:start] + text[text.index("@article{key21,") :])
+        assert incremental.update(bib_many) == (21, 1, 0)
+        assert "key20" not in bibliography
+        assert len(bibliography) == 200
+        assert bibliography.to_bibtex() == parser_obj.from_file(bib_many).to_bibtex()
+
+    def test_move(self, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        first, second = bibliography["key1"], bibliography["key2"]
+
+        with open(bib_many) as fin:
+            text = fin.read()
+        one, two = text.index("@article{key1,"), text.index("@article{key2,")
+        three = text.index("@article{key3,")
+        with open(bib_many, "w") as fout:
+            fout.write(text[:one] + text[two:three] + text[one:two] + text[three:])
+        assert incremental.update(bib_many) == (1, 2, 2)
+        assert bibliography.entries[1] is second
+        assert bibliography.entries[2] is first
+
+    def test_changed_bibliography(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        del bibliography["key5"]
+        assert incremental.update(bib_many) == (0, 199, 200)
+        assert bibliography.to_bibtex() == parser_obj.from_file(bib_many).to_bibtex()
+
+    def test_start_and_end(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        with open(bib_many) as fin:
+            text = fin.read()
+        with open(bib_many, "w") as fout:
+            fout.write("@misc{first, title={First}}\n" + text)
+        assert incremental.update(bib_many) == (0, 0, 1)
+        with open(bib_many, "a") as fout:
+            fout.write("\n@misc{last, title={Last}}\n")
+        assert incremental.update(bib_many) == (201, 0, 1)
+        assert bibliography.to_bibtex() == parser_obj.from_file(bib_many).to_bibtex()
+
+    def test_unbalanced_brace(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        replace_text(bib_many, "title  = {Title 100}", "title  = {Title 100")
+        incremental.update(bib_many)
+        assert bibliography.to_bibtex() == parser_obj.from_file(bib_many).to_bibtex()
+        replace_text(bib_many, "title  = {Title 100", "title  = {Title 100}")
+        incremental.update(bib_many)
+        assert len(bibliography) == 200
+        assert bibliography.to_bibtex() == parser_obj.from_file(bib_many).to_bibtex()
+
+    def test_unterminated_end(self, parser_obj, bib_many):
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        with open(bib_many, "a") as fout:
+            fout.write("@book{new,\n title = {Half")
+        assert incremental.update(bib_many) == (200, 0, 1)
+        with open(bib_many, "a") as fout:
+            fout.write(" done},\n year = {2020}\n}\n")
+        assert incremental.update(bib_many) == (200, 1, 1)
+        assert bibliography["new"].title.value == "{Half done}"
+        assert bibliography["new"].year.value == "{2020}"
+
+    def test_random_edits(self, parser_obj, bib_many):
+        rng = random.Random(0)
+        incremental = IncrementalParser()
+        bibliography = incremental.parse(bib_many)
+        for step in range(50):
+            with open(bib_many) as fin:
+                text = fin.read()
+            position = rng.randrange(len(text) + 1)
+            kind = rng.choice(["insert", "delete", "entry", "typing"])
+            if kind == "insert":
+                text = (
+                    text[:position]
+                    + rng.choice(["x", " ", "\n", "}", "{"])
+                    + text[position:]
+                )
+            elif kind == "delete":
+                text = text[:position] + text[position + rng.randint(1, 50) :]
+            elif kind == "entry":
+                start = text.rfind("\n", 0, position) + 1
+                text = (
+                    text[:start]
+                    + f"@misc{{random{step}, year={{{step}}}}}\n"
+                    + text[start:]
+                )
+            # an entry typed at the end is saved unterminated before it is completed
+            versions = [text]
+            if kind == "typing":
+                typed = f"\n@book{{typed{step},\n title = {{Typed}},\n year = {{{step}}}\n}}"
+                versions = [text + typed[: rng.randrange(2, len(typed))], text + typed]
+
+            for text in versions:
+                with open(bib_many, "w") as fout:
+                    fout.write(text)
+                incremental.update(bib_many)
+                parsed_bibtex = parser_obj.from_file(bib_many)
+                assert bibliography.entries == parsed_bibtex.entries
+                assert field_values(bibliography) == field_values(parsed_bibtex)
@@ -0,0 +1,101 @@
+import os
+import shutil
+
+import pytest
+from BibTexTools import snapshot
+from BibTexTools.parser import Parser
+from BibTexTools.snapshot import SnapshotCache, file_key
+
+
+@pytest.fixture
+def bib_path(tmp_path):
+    path = str(tmp_path / "cleaned.bib")
+    shutil.copy(os.path.join("BibTexTools", "tests", "data", "cleaned.bib"), path)
+    return path
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    return SnapshotCache(str(tmp_path / "snapshots"))
+
+
+def parse(path, snapshots):
+    with pytest.warns(UserWarning, match="not a standard Bibtex field"):
+        return Parser().from_file(path, snapshots=snapshots)
+
+
+class TestClassSnapshotCache:
+    def test_warm_start(self, bib_path, snapshots):
+        parsed = parse(bib_path, snapshots)
+        assert snapshots.misses == 1
+        assert os.path.exists(snapshots.snapshot_path(bib_path))
+
+        loaded = parse(bib_path, snapshots)
+        assert snapshots.hits == 1
+        assert loaded == parsed
+        assert loaded.to_bibtex() == parsed.to_bibtex()
+        assert loaded[parsed.entries[0].key.value] is loaded.entries[0]
+        assert loaded.entries[0].author.author_list[0].last
+
+    def test_changed_file(self, bib_path, snapshots):
+        parse(bib_path, snapshots)
+        with open(bib_path, "a") as fout:
+            fout.write("\n@article{added, title={Added}, year={2020}}\n")
+        bibliography = parse(bib_path, snapshots)
+        assert snapshots.hits == 0
+        assert "added" in bibliography
+
+        # the new snapshot holds the changed file
+        assert "added" in parse(bib_path, snapshots)
+        assert snapshots.hits == 1
+
+    def test_same_size_and_mtime(self, bib_path, snapshots):
+        parse(bib_path, snapshots)
+        stat = os.stat(bib_path)
+        with open(bib_path, "r+") as fout:
+            fout.write("@ARTICLE")
+        os.utime(bib_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert file_key(bib_path)[:2] == (stat.st_size, stat.st_mtime_ns)
+
+        bibliography = parse(bib_path, snapshots)
+        assert snapshots.hits == 0
+        assert bibliography.entries[0].type.value == "ARTICLE"
+
+    def test_damaged_snapshot(self, bib_path, snapshots):
+        parsed = parse(bib_path, snapshots)
+        snapshot_path = snapshots.snapshot_path(bib_path)
+        with open(snapshot_path, "r+b") as fout:
+            fout.truncate(os.path.getsize(snapshot_path) // 2)
+        assert parse(bib_path, snapshots) == parsed
+        assert snapshots.misses == 2
+        assert parse(bib_path, snapshots) == parsed
+        assert snapshots.hits == 1
+
+    def test_format_version(self, bib_path, snapshots, monkeypatch):
+        parse(bib_path, snapshots)
+        monkeypatch.setattr(snapshot, "FORMAT_VERSION", snapshot.FORMAT_VERSION + 1)
+        parse(bib_path, snapshots)
+        assert snapshots.hits == 0
+
+    def test_prune(self, bib_path, tmp_path):
+        other_path = str(tmp_path / "other.bib")
+        shutil.copy(bib_path, other_path)
+        snapshots = SnapshotCache(str(tmp_path / "snapshots"))
+        parse(bib_path, snapshots)
+        size = os.path.getsize(snapshots.snapshot_path(bib_path))
+        snapshots.max_bytes = size * 3 // 2
+
+        # the snapshot of bib_path is the least recently used one
+        parse(other_path, snapshots)
+        assert not os.path.exists(snapshots.snapshot_path(bib_path))
+        assert os.path.exists(snapshots.snapshot_path(other_path))
+
+        snapshots.max_bytes = 0  # the most recently used snapshot is kept
+        parse(bib_path, snapshots)
+        assert os.listdir(snapshots.directory) == [
+            os.path.basename(snapshots.snapshot_path(bib_path))
+        ]
+
+    def test_disabled(self, bib_path, snapshots):
+        parse(bib_path, None)
+        assert os.listdir(snapshots.directory) == []
@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import threading
+
+import pytest
+from BibTexTools.watch import BuildError, FileWatcher, HotBibliography, atomic_write
+
+
+@pytest.fixture
+def bib_path(tmp_path):
+    path = str(tmp_path / "authors_abbreviate.bib")
+    shutil.copy(
+        os.path.join("BibTexTools", "tests", "data", "authors_abbreviate.bib"), path
+    )
+    return path
+
+
+def append_entry(path, key):
+    with open(path, "a") as fout:
+        fout.write(f"\n@article{{{key}, author={{First Mid Last}}, title={{T}}}}\n")
+
+
+class TestClassFileWatcher:
+    def test_debounce(self, bib_path):
+        watcher = FileWatcher(bib_path, debounce=1.0)
+        assert not watcher.poll(now=0.0)
+        append_entry(bib_path, "added")
+        assert not watcher.poll(now=10.0)  # changed, wait for the file to settle
+        assert not watcher.poll(now=10.5)
+        assert watcher.poll(now=11.0)
+        assert not watcher.poll(now=12.0)  # reported once
+
+    def test_missing_file(self, bib_path):
+        watcher = FileWatcher(bib_path, debounce=0.0)
+        os.rename(bib_path, bib_path + ".old")
+        assert not watcher.poll(now=0.0)
+        assert not watcher.poll(now=1.0)
+        os.rename(bib_path + ".old", bib_path)
+        assert not watcher.poll(now=2.0)  # unchanged since it was seen last
+
+    def test_wait(self, bib_path):
+        watcher = FileWatcher(bib_path, interval=0.01, debounce=0.0)
+        append_entry(bib_path, "added")
+        assert watcher.wait()
+        stop = threading.Event()
+        threading.Timer(0.05, stop.set).start()
+        assert not watcher.wait(stop)
+
+
+class TestClassHotBibliography:
+    def test_abbreviate(self, bib_path, tmp_path):
+        output = str(tmp_path / "out.bib")
+        hot = HotBibliography(bib_path, output, abbreviate=True, middle=True)
+        assert hot.build() == (0, 0, 1)
+        assert "A1_Last, A. B." in open(output).read()
+        # the bibliography in memory keeps the full names
+        assert "A1_First" in hot.bibliography.entries[0].author.to_bibtex()
+
+        assert hot.build() is None  # nothing changed
+        transformed = hot.transform().entries
+        append_entry(bib_path, "added")
+        assert hot.build() == (1, 0, 1)
+        assert hot.transform().entries[:1] == transformed
+        assert hot.transform().entries[0] is transformed[0]
+        assert hot.cache.hits == 1  # the unchanged entry was not rendered again
+        assert "Last, F. M." in open(output).read()
+        assert sorted(os.listdir(tmp_path)) == ["authors_abbreviate.bib", "out.bib"]
+
+    def test_json(self, bib_path, tmp_path):
+        output = str(tmp_path / "out.json")
+        hot = HotBibliography(bib_path, output, format="json")
+        hot.build()
+        append_entry(bib_path, "added")
+        hot.build()
+        with open(output) as fin:
+            written = json.load(fin)
+        assert list(written) == ["key", "added"]
+        assert written["added"]["author"] == ["First Last"]
+
+    def test_half_typed_entry(self, bib_path, tmp_path):
+        output = str(tmp_path / "out.bib")
+        hot = HotBibliography(bib_path, output)
+        hot.build()
+        with open(output) as fin:
+            written = fin.read()
+        with open(bib_path, "a") as fout:
+            fout.write("\n@art")
+        with pytest.raises(BuildError):
+            hot.build()
+        with open(output) as fin:
+            assert fin.read() == written  # the last good output is kept
+
+        with open(bib_path, "a") as fout:
+            fout.write("icle{added, author={First Mid Last}, title={T}}\n")
+        assert hot.build() == (1, 1, 1)
+        assert [entry.key.value for entry in hot.bibliography] == ["key", "added"]
+        assert "First Mid Last" in open(output).read()
+
+    def test_no_entries(self, bib_path, tmp_path):
+        output = str(tmp_path / "out.bib")
+        with open(bib_path, "w") as fout:
+            fout.write("% nothing yet\n")
+        hot = HotBibliography(bib_path, output)
+        with pytest.warns(UserWarning, match="no entries"):
+            assert hot.build() is None
+        assert not os.path.exists(output)
+
+    def test_unknown_format(self, bib_path):
+        with pytest.raises(ValueError):
+            HotBibliography(bib_path, "out.xml", format="xml")
+
+
+def test_atomic_write(tmp_path):
+    path = str(tmp_path / "out.txt")
+    atomic_write(path, lambda fout: fout.write("old"))
+
+    def fail(fout):
+        fout.write("partial")
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        atomic_write(path, fail)
+    with open(path) as fin:
+        assert fin.read() == "old"
+    assert os.listdir(tmp_path) == ["out.txt"]
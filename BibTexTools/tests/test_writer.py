@@ -0,0 +1,108 @@
+import io
+import json
+import os
+
+import pytest
+from BibTexTools.parser import Parser
+from BibTexTools.writer import BibTexWriter, JSONLinesWriter, JSONWriter, RenderCache
+
+
+class CountingIO(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, s):
+        self.writes.append(len(s))
+        return super().write(s)
+
+
+@pytest.fixture
+def json_ref():
+    file_path = os.path.join("BibTexTools", "tests", "data", "to_json_ref.json")
+    with open(file_path, "r") as fin:
+        return fin.read()
+
+
+@pytest.fixture
+def bib_obj_full():
+    with pytest.warns(UserWarning):
+        parser_obj = Parser()
+        file_path = os.path.join("BibTexTools", "tests", "data", "full.bib")
+        parsed_bibtex = parser_obj.from_file(file_path)
+    return parsed_bibtex
+
+
+class TestClassBibTexWriter:
+    def test_write_all(self, bib_obj_full):
+        fout = io.StringIO()
+        BibTexWriter(fout).write_all(bib_obj_full.entries)
+        assert fout.getvalue() == bib_obj_full.to_bibtex()
+
+    def test_write_fields(self, bib_obj_full):
+        fout = io.StringIO()
+        bib_obj_full.write_bibtex(fout, ["author", "title"])
+        assert fout.getvalue() == bib_obj_full.to_bibtex(["author", "title"])
+
+    def test_bounded_buffer(self, bib_obj_full):
+        fout = CountingIO()
+        with BibTexWriter(fout, buffer_size=10) as writer:
+            writer.write(bib_obj_full.entries[0])
+            assert len(fout.writes) == 1  # flushed as soon as the buffer is full
+
+        fout = CountingIO()
+        with BibTexWriter(fout) as writer:
+            writer.write(bib_obj_full.entries[0])
+            assert len(fout.writes) == 0
+        assert len(fout.writes) == 1
+        assert fout.getvalue() == bib_obj_full.entries[0].to_bibtex()
+
+
+class TestClassJSONWriter:
+    def test_byte_compatible(self, bib_obj_full, json_ref):
+        fout = io.StringIO()
+        JSONWriter(fout).write_all(bib_obj_full.entries)
+        assert fout.getvalue() == json_ref
+
+    def test_json_dump_compatible(self, bib_obj_full):
+        fields = ["author", "title"]
+        fout = io.StringIO()
+        JSONWriter(fout, fields, buffer_size=1).write_all(bib_obj_full.entries)
+
+        reference = {}
+        for entry in bib_obj_full.entries:
+            reference.update(entry.to_dict(fields))
+        assert fout.getvalue() == json.dumps(reference, indent=4)
+
+    def test_empty(self):
+        fout = io.StringIO()
+        JSONWriter(fout).write_all([])
+        assert fout.getvalue() == "{}"
+
+    def test_json_lines(self, bib_obj_full):
+        fout = io.StringIO()
+        JSONLinesWriter(fout).write_all(bib_obj_full.entries)
+        lines = fout.getvalue().splitlines()
+
+        assert len(lines) == 2
+        assert json.loads(lines[1]) == bib_obj_full.entries[1].to_dict()
+
+
+class TestClassRenderCache:
+    def test_reuse(self, bib_obj_full, json_ref):
+        cache = RenderCache()
+        for _ in range(2):
+            fout = io.StringIO()
+            bib_obj_full.write_json(fout, cache=cache)
+            assert fout.getvalue() == json_ref
+        assert cache.misses == 2
+        assert cache.hits == 2
+
+    def test_prune(self, bib_obj_full):
+        cache = RenderCache()
+        BibTexWriter(io.StringIO(), cache=cache).write_all(bib_obj_full.entries)
+        cache.prune()
+        BibTexWriter(io.StringIO(), cache=cache).write_all(bib_obj_full.entries[1:])
+        assert len(cache) == 2
+        cache.prune()
+        assert len(cache) == 1
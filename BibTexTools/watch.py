@@ -0,0 +1,232 @@
+import copy
+import os
+import threading
+import time
+import warnings
+from typing import IO, Callable, Dict, Optional, Tuple
+
+from BibTexTools.bibliography import Bibliography, Entry
+from BibTexTools.parser import IncrementalParser
+from BibTexTools.writer import RenderCache
+
+POLL_INTERVAL = 0.5  # seconds
+DEBOUNCE = 0.2  # seconds the file has to stay unchanged
+FORMATS: Dict[str, Callable[..., None]] = {
+    "bibtex": Bibliography.write_bibtex,
+    "json": Bibliography.write_json,
+    "jsonl": Bibliography.write_jsonl,
+}
+# raised by the parser and the writers on entries that are still being typed
+BUILD_ERRORS = (ValueError, AssertionError, IndexError, KeyError, AttributeError)
+
+
+class BuildError(Exception):
+    """The input could not be parsed or the output could not be rendered."""
+
+
+def atomic_write(path: str, write: Callable[[IO[str]], None], encoding: str = "utf-8"):
+    """Write a file so that readers see either the old or the complete new content.
+
+    The content is written to a temporary file next to the target, which then replaces it.
+
+    Args:
+        path (str): Path of the file.
+        write (Callable[[IO[str]], None]): Writes the content into the given file object.
+        encoding (str, optional): Encoding of the file. Defaults to "utf-8".
+    """
+    partial_path = f"{path}.{os.getpid()}.partial"
+    try:
+        with open(partial_path, "w", encoding=encoding) as fout:
+            write(fout)
+            fout.flush()
+            os.fsync(fout.fileno())
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+
+class FileWatcher:
+    """Detect changes of a file by polling its modification time and size.
+
+    A change is only reported once the file stayed unchanged for the debounce time, so an editor
+    that writes a file in several steps or replaces it triggers a single rebuild. A missing file,
+    e.g. between the deletion and the rename of a save, is not reported.
+    """
+
+    def __init__(
+        self, path: str, interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE
+    ):
+        """Start watching a file, its current state counts as seen.
+
+        Args:
+            path (str): Path of the file.
+            interval (float, optional): Seconds between two polls. Defaults to POLL_INTERVAL.
+            debounce (float, optional): Seconds the file has to stay unchanged. Defaults to
+                DEBOUNCE.
+        """
+        self.path = path
+        self.interval = interval
+        self.debounce = debounce
+        self._seen = self._last = self.stat()
+        self._changed_at = time.monotonic()
+
+    def stat(self) -> Optional[Tuple[int, int]]:
+        """Modification time in nanoseconds and size of the file or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self, now: Optional[float] = None) -> bool:
+        """Check the file once.
+
+        Args:
+            now (Optional[float], optional): Current time of `time.monotonic`. Defaults to now.
+
+        Returns:
+            bool: True if the file changed since the last reported change and then stayed
+                unchanged for the debounce time.
+        """
+        now = time.monotonic() if now is None else now
+        current = self.stat()
+        if current != self._last:
+            self._last = current
+            self._changed_at = now
+            return False
+        if (
+            current is not None
+            and current != self._seen
+            and now - self._changed_at >= self.debounce
+        ):
+            self._seen = current
+            return True
+        return False
+
+    def wait(self, stop: Optional[threading.Event] = None) -> bool:
+        """Block until the file changed.
+
+        Args:
+            stop (Optional[threading.Event], optional): Event to stop waiting. Defaults to None.
+
+        Returns:
+            bool: True if the file changed, False if `stop` was set.
+        """
+        stop = stop or threading.Event()
+        while not stop.wait(self.interval):
+            if self.poll():
+                return True
+        return False
+
+
+class HotBibliography:
+    """Bibliography that is kept in memory and written again whenever its BibTex file changes.
+
+    The file is parsed once, later builds only re-parse the changed entries with an
+    `IncrementalParser`. The author names are abbreviated on copies of the entries, so the parsed
+    entries stay unchanged, and the copies and their rendered text are kept as long as their
+    entry is unchanged. The output is replaced atomically.
+    """
+
+    def __init__(
+        self,
+        input: str,
+        output: str,
+        format: str = "bibtex",
+        abbreviate: bool = False,
+        middle: bool = False,
+        encoding: str = "utf-8",
+    ):
+        """Create the bibliography, nothing is parsed before the first `build`.
+
+        Args:
+            input (str): Path of the BibTex file.
+            output (str): Path of the output file.
+            format (str, optional): One of "bibtex", "json" and "jsonl". Defaults to "bibtex".
+            abbreviate (bool, optional): Abbreviate the author names. Defaults to False.
+            middle (bool, optional): Abbreviate the middle names instead of deleting them.
+                Defaults to False.
+            encoding (str, optional): Encoding of the input and the output. Defaults to "utf-8".
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format}, use one of {list(FORMATS)}")
+        self.input = input
+        self.output = output
+        self.format = format
+        self.abbreviate = abbreviate
+        self.middle = middle
+        self.encoding = encoding
+        self.parser = IncrementalParser(encoding)
+        self.builds = 0
+        self.cache = RenderCache()
+        self._transformed: Dict[int, Tuple[Entry, Entry]] = {}
+
+    @property
+    def bibliography(self) -> Bibliography:
+        """Parsed bibliography of the input."""
+        return self.parser.bibliography
+
+    def _transform(self, entry: Entry) -> Entry:
+        if self.abbreviate and "author" in entry.fields:
+            return copy.copy(entry).abbreviate_names(self.middle)
+        return entry
+
+    def transform(self) -> Bibliography:
+        """Apply the transformation to the current entries.
+
+        Returns:
+            Bibliography: New bibliography of the transformed entries.
+        """
+        transformed: Dict[int, Tuple[Entry, Entry]] = {}
+        entries = []
+        for entry in self.bibliography.entries:
+            cached = self._transformed.get(id(entry))
+            # ids of entries that were dropped can be reused by new entries
+            if cached is None or cached[0] is not entry:
+                cached = (entry, self._transform(entry))
+            transformed[id(entry)] = cached
+            entries.append(cached[1])
+        self._transformed = transformed
+        return Bibliography(entries)
+
+    def build(self) -> Optional[Tuple[int, int, int]]:
+        """Bring the bibliography up to date with the input and write the output.
+
+        Returns:
+            Optional[Tuple[int, int, int]]: Index of the first replaced entry, number of removed
+                entries and number of added entries like `IncrementalParser.update` or None if
+                the output was not written because nothing changed or there are no entries.
+
+        Raises:
+            BuildError: The input could not be parsed or the output could not be rendered, the
+                output is left unchanged and the next build tries again.
+        """
+        try:
+            if self.builds == 0:
+                self.parser.parse(self.input)
+                changes = (0, 0, len(self.bibliography))
+            else:
+                changes = self.parser.update(self.input)
+                if changes[1:] == (0, 0):
+                    return None
+        except BUILD_ERRORS as error:
+            raise BuildError(f"Could not parse {self.input}: {error!r}") from error
+        self.builds += 1
+        if len(self.bibliography) == 0:
+            warnings.warn(
+                f"{self.input} contains no entries, the output is not written"
+            )
+            return None
+        bibliography = self.transform()
+        try:
+            atomic_write(
+                self.output,
+                lambda fout: FORMATS[self.format](bibliography, fout, cache=self.cache),
+                self.encoding,
+            )
+        except BUILD_ERRORS as error:
+            raise BuildError(f"Could not render {self.input}: {error!r}") from error
+        self.cache.prune()
+        return changes
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import json
+from typing import IO, TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from BibTexTools.bibliography import Entry
+
+BUFFER_SIZE = 1 << 16
+ENTRY_SEPARATOR = "\n\n\n"
+JSON_INDENT = 4
+
+
+class RenderCache:
+    """Rendered text of entries, reused while the same entry objects are written again.
+
+    Entries are identified by the object, so they must not be changed in place after they were
+    rendered. The texts depend on the writer and the fields, a cache must only be used with one
+    of each. Texts of entries that were not rendered or reused since the last `prune` are
+    dropped by it.
+    """
+
+    def __init__(self):
+        self._texts: Dict[int, Tuple[Entry, str]] = {}
+        self._used: Dict[int, Tuple[Entry, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._texts.keys() | self._used.keys())
+
+    def get(self, entry: Entry, render: Callable[[Entry], str]) -> str:
+        """Return the text of an entry, rendering it if it is not cached.
+
+        Args:
+            entry (Entry): Entry to be rendered.
+            render (Callable[[Entry], str]): Renders the entry.
+
+        Returns:
+            str: Rendered text.
+        """
+        # the entry is kept with its text, so its id can not be reused by another object
+        cached = self._used.get(id(entry)) or self._texts.get(id(entry))
+        if cached is not None and cached[0] is entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+            cached = (entry, render(entry))
+        self._used[id(entry)] = cached
+        return cached[1]
+
+    def prune(self):
+        """Drop the texts of all entries that were not used since the last prune."""
+        self._texts = self._used
+        self._used = {}
+
+
+class BufferedWriter:
+    """Base class for writers that render entries one at a time into a file object.
+
+    The rendered entries are collected in a buffer that is written to the file object as soon as
+    it holds more than `buffer_size` characters, so the memory usage does not depend on the size
+    of the bibliography. With a `RenderCache`, entries that were rendered by an earlier writer are
+    not rendered again.
+    """
+
+    def __init__(
+        self,
+        fileobj: IO[str],
+        fields: List[str] = [],
+        buffer_size: int = BUFFER_SIZE,
+        cache: Optional[RenderCache] = None,
+    ):
+        self.fileobj = fileobj
+        self.fields = fields
+        self.buffer_size = buffer_size
+        self.cache = cache
+        self.count = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def __enter__(self) -> BufferedWriter:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _append(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered > self.buffer_size:
+            self.flush()
+
+    def render(self, entry: Entry) -> str:
+        """Render a single entry.
+
+        Args:
+            entry (Entry): Entry to be rendered.
+
+        Returns:
+            str: Text of the entry without the separators between entries.
+        """
+        raise NotImplementedError
+
+    def _render(self, entry: Entry) -> str:
+        if self.cache is None:
+            return self.render(entry)
+        return self.cache.get(entry, self.render)
+
+    def write(self, entry: Entry):
+        """Render an entry into the buffer and flush the buffer if it is full.
+
+        Args:
+            entry (Entry): Entry to be written.
+        """
+        raise NotImplementedError
+
+    def write_all(self, entries: Iterable[Entry]):
+        """Write all entries of an iterable and close the writer.
+
+        Args:
+            entries (Iterable[Entry]): Entries to be written.
+        """
+        for entry in entries:
+            self.write(entry)
+        self.close()
+
+    def flush(self):
+        """Write the buffered entries to the file object."""
+        if self._buffer:
+            self.fileobj.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Finish the output and flush the buffer, the file object is not closed."""
+        self.flush()
+
+
+class BibTexWriter(BufferedWriter):
+    """Write entries as BibTex, the output is the same as the one of `Bibliography.to_bibtex`."""
+
+    def render(self, entry: Entry) -> str:
+        return entry.to_bibtex(self.fields)
+
+    def write(self, entry: Entry):
+        if self.count:
+            self._append(ENTRY_SEPARATOR)
+        self._append(self._render(entry))
+        self.count += 1
+
+
+class JSONWriter(BufferedWriter):
+    """Write entries as one JSON object mapping the citation keys to the fields of the entries.
+
+    The output is the same as `json.dump` with an indent of four spaces produces for the full
+    dictionary, but only one entry is held in memory at a time.
+    """
+
+    def render(self, entry: Entry) -> str:
+        ((key, fields),) = entry.to_dict(self.fields).items()
+        rendered = json.dumps(fields, indent=JSON_INDENT)
+        # JSON strings can not contain newlines, so every newline starts an indented line
+        return (
+            " " * JSON_INDENT
+            + json.dumps(key)
+            + ": "
+            + rendered.replace("\n", "\n" + " " * JSON_INDENT)
+        )
+
+    def write(self, entry: Entry):
+        self._append(("{\n" if not self.count else ",\n") + self._render(entry))
+        self.count += 1
+
+    def close(self):
+        self._append("\n}" if self.count else "{}")
+        self.flush()
+
+
+class JSONLinesWriter(BufferedWriter):
+    """Write every entry as a single line JSON object mapping its citation key to its fields."""
+
+    def render(self, entry: Entry) -> str:
+        return json.dumps(entry.to_dict(self.fields)) + "\n"
+
+    def write(self, entry: Entry):
+        self._append(self._render(entry))
+        self.count += 1
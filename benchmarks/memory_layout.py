@@ -0,0 +1,104 @@
+"""Compare the memory used by parsed entries with the previous attribute based layout.
+
+The previous layout kept every field as a dynamic attribute of a dataclass entry, a list of the
+field names and the concatenated raw text of the entry, and every field was an object with a
+`__dict__`. It is replicated here to measure against.
+
+Run from the repository root:
+    python benchmarks/memory_layout.py
+"""
+
+import gc
+import tracemalloc
+import warnings
+from dataclasses import dataclass, field
+from typing import List
+
+from BibTexTools.parser import Parser, find_entry_spans, tokenize_entry
+
+ENTRY_TEMPLATE = """@inproceedings{{key{index},
+  author    = {{First{index} Last{index} and Second Author and Third Author}},
+  title     = {{A Title of Entry Number {index}}},
+  booktitle = {{Proceedings of the Conference}},
+  pages     = {{{index}--{end}}},
+  publisher = {{Publisher}},
+  year      = {{2021}},
+  doi       = {{10.1000/{index}}},
+}}
+"""
+
+
+class LegacyField:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class LegacyAuthor:
+    def __init__(self, first, last):
+        self.first = first
+        self.last = last
+        self.mid = []
+        self.name_string = " ".join([self.first] + self.mid + [self.last])
+
+
+class LegacyAuthor_field(LegacyField):
+    def __init__(self, name, value):
+        super().__init__(name, value)
+        self.author_list = []
+        for author in value.strip("{}").split(" and "):
+            author_parts = author.split(" ")
+            self.author_list.append(LegacyAuthor(author_parts[0], author_parts[-1]))
+
+
+@dataclass
+class LegacyEntry:
+    string: str = ""
+    fields: List[str] = field(default_factory=list)
+
+    def add_field(self, field_name: str, value: str):
+        if field_name == "author":
+            setattr(self, field_name, LegacyAuthor_field(field_name, value))
+        else:
+            setattr(self, field_name, LegacyField(field_name, value))
+        self.fields.append(field_name)
+
+
+def parse_legacy(bibtex_string: str) -> List[LegacyEntry]:
+    """Parse into the previous layout, the raw text is concatenated field by field."""
+    entries = []
+    for start, end in find_entry_spans(bibtex_string):
+        entry = LegacyEntry()
+        for field_name, value in tokenize_entry(bibtex_string, start, end):
+            entry.add_field(field_name, value)
+            entry.string += f"{field_name} = {value}, "
+        entries.append(entry)
+    return entries
+
+
+def measure(function, *args) -> int:
+    """Return the memory retained by the result of a function call in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")  # "doi" is not a standard field
+    parser = Parser()
+    print(f"{'entries':>10} {'legacy MB':>10} {'compact MB':>11} {'ratio':>7}")
+    for num_entries in [1000, 10000, 50000]:
+        bibtex_string = "\n".join(
+            ENTRY_TEMPLATE.format(index=index, end=index + 10)
+            for index in range(num_entries)
+        )
+        legacy = measure(parse_legacy, bibtex_string) / 2**20
+        compact = measure(parser.parse, bibtex_string) / 2**20
+        print(
+            f"{num_entries:>10} {legacy:>10.1f} {compact:>11.1f} {compact / legacy:>7.2f}"
+        )
@@ -0,0 +1,166 @@
+"""Measure how the parse time of `Parser.parse` grows with the field length and the entry count,
+compare it to the line-accumulating parser it replaced and measure the speedup of
+`Parser.parse_parallel` with the number of workers.
+
+Run from the repository root:
+    python benchmarks/parse_scaling.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generator import make_bibliography  # noqa: E402
+
+from BibTexTools.bibliography import Bibliography, Entry  # noqa: E402
+from BibTexTools.parser import Parser, clean_line, get_key, get_type  # noqa: E402
+
+ENTRY_TEMPLATE = """@article{{key{index},
+  author    = {{{authors}}},
+  title     = {{Title of entry {index}}},
+  abstract  = {{{abstract}}},
+  year      = {{2021}},
+}}
+"""
+
+
+def make_bibtex(num_entries: int, field_lines: int) -> str:
+    """Create a BibTex string with multi-line author and abstract fields.
+
+    Args:
+        num_entries (int): Number of entries.
+        field_lines (int): Number of lines of the author and abstract fields.
+
+    Returns:
+        str: BibTex string.
+    """
+    authors = " and\n               ".join(
+        f"First{i} Last{i}" for i in range(field_lines)
+    )
+    abstract = "\n               ".join(
+        f"Line {i} of the abstract, a = b." for i in range(field_lines)
+    )
+    return "\n".join(
+        ENTRY_TEMPLATE.format(index=index, authors=authors, abstract=abstract)
+        for index in range(num_entries)
+    )
+
+
+def legacy_parse(bibtex_string: str) -> Bibliography:
+    """Parse a BibTex string line by line like `Parser.parse` did before the tokenizer.
+
+    Args:
+        bibtex_string (str): Multiline string containing one or more BibTex entries to be parsed.
+
+    Returns:
+        Bibliography: Bibliography object.
+    """
+    bibliography = Bibliography()
+    entry = Entry()
+    field_str = ""
+
+    for line in bibtex_string.split("\n"):
+        line = clean_line(line)
+        if line == "}" or not line.strip():
+            continue
+        field_str += line + " "
+
+        if field_str.startswith("@"):  # entry start
+            if "key" in entry.fields:
+                bibliography.add_entry(entry)
+                entry = Entry()
+            entry.add_field("type", get_type(field_str))
+            entry.add_field("key", get_key(field_str))
+            field_str = ""
+        elif field_str.count("{") != field_str.count("}"):  # incomplete field
+            continue
+        else:
+            field_name, value = field_str.split("=")[0], field_str.split("=")[-1]
+            entry.add_field(field_name.strip(), value.strip(" ,"))
+            field_str = ""
+
+    bibliography.add_entry(entry)
+    return bibliography
+
+
+def time_parse(
+    bibtex_string: str,
+    repeat: int = 3,
+    parse: Callable[[str], Bibliography] = Parser().parse,
+) -> float:
+    """Return the best wall time of parsing a BibTex string in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(bibtex_string)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(title: str, parameter: str, values, make):
+    print(title)
+    print(f"{parameter:>10} {'seconds':>10} {'ratio':>8}")
+    previous = None
+    for value in values:
+        seconds = time_parse(make(value))
+        ratio = f"{seconds / previous:8.2f}" if previous else f"{'':>8}"
+        print(f"{value:>10} {seconds:>10.4f} {ratio}")
+        previous = seconds
+    print()
+
+
+def compare(title: str, bibtex_string: str):
+    legacy = time_parse(bibtex_string, parse=legacy_parse)
+    seconds = time_parse(bibtex_string)
+    print(f"{title:<40} {legacy:>10.3f} {seconds:>10.3f} {legacy / seconds:>8.2f}")
+
+
+def scale_workers(num_entries: int):
+    """Print the speedup of `parse_parallel` over `parse` for up to one worker per CPU."""
+    warnings.simplefilter("ignore")
+    fd, path = tempfile.mkstemp(suffix=".bib")
+    with os.fdopen(fd, "w") as fout:
+        fout.write(make_bibliography(num_entries))
+    with open(path, "r") as fin:
+        sequential = time_parse(fin.read(), repeat=1)
+    print(f"{'workers':>10} {'seconds':>10} {'speedup':>8}")
+    print(f"{'parse':>10} {sequential:>10.3f} {1:>8.2f}")
+    workers = 2
+    while workers <= max(os.cpu_count() or 1, 2):
+        start = time.perf_counter()
+        Parser().parse_parallel(path, workers=workers)
+        seconds = time.perf_counter() - start
+        print(f"{workers:>10} {seconds:>10.3f} {sequential / seconds:>8.2f}")
+        workers *= 2
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")  # "abstract" is not a standard field
+    report(
+        "Field length (100 entries), a ratio of ~2 per doubling is linear:",
+        "lines",
+        [100, 200, 400, 800, 1600],
+        lambda lines: make_bibtex(100, lines),
+    )
+    report(
+        "Entry count (10 line fields), a ratio of ~2 per doubling is linear:",
+        "entries",
+        [1000, 2000, 4000, 8000, 16000],
+        lambda entries: make_bibtex(entries, 10),
+    )
+    print("Against the line-accumulating parser, a speedup above 1 is faster:")
+    print(f"{'input':<40} {'legacy':>10} {'seconds':>10} {'speedup':>8}")
+    compare("generated, 5000 entries", make_bibliography(5000))
+    cleaned_path = os.path.join("BibTexTools", "tests", "data", "cleaned.bib")
+    with open(cleaned_path, "r") as fin:
+        cleaned = fin.read()
+    compare("cleaned.bib x 100, dblp style", "\n".join([cleaned] * 100))
+    print()
+    print(f"parse_parallel on {os.cpu_count()} CPUs, generated, 40000 entries:")
+    scale_workers(40000)
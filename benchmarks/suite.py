@@ -0,0 +1,204 @@
+"""Time and measure the memory of the main operations on synthetic bibliographies.
+
+Every case runs on bibliographies from the seeded generator, its best wall time of several
+repeats and its peak memory traced by tracemalloc in a separate run are saved to a JSON file.
+Passing the results of an earlier version with --compare prints the time ratios to it.
+
+Run from the repository root:
+    python benchmarks/suite.py --output benchmarks/results/new.json
+    python benchmarks/suite.py --compare benchmarks/results/old.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generator import make_bibliography  # noqa: E402
+
+from BibTexTools.bibliography import AUTHOR_POOL, Bibliography  # noqa: E402
+from BibTexTools.cleaner import Cleaner  # noqa: E402
+from BibTexTools.client import HTTPClient  # noqa: E402
+from BibTexTools.mock_dblp import DBLPSession  # noqa: E402
+from BibTexTools.parser import Parser  # noqa: E402
+
+SIZES = [1000, 10000]
+QUICK_SIZES = [200]
+REPEAT = 3
+# entries cleaned per run, cleaning is much slower than the other cases
+CLEAN_LIMIT = 2000
+
+
+def measure(
+    run: Callable[[Any], Any], setup: Callable[[], Any], repeat: int
+) -> Dict[str, float]:
+    """Measure the best wall time and the peak memory of a case.
+
+    Every run starts with an empty author pool, otherwise the runs after the first one would
+    find all authors and abbreviations of the shared pool already memoized.
+
+    Args:
+        run (Callable[[Any], Any]): Measured operation, called with the result of `setup`.
+        setup (Callable[[], Any]): Prepares the input of every run, it is not measured.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        Dict[str, float]: Seconds of the fastest run and peak traced memory in MB.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        AUTHOR_POOL.clear()
+        data = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(data)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    AUTHOR_POOL.clear()
+    data = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_mb": peak / 1e6}
+
+
+def run_cases(num_entries: int, repeat: int, options: Dict[str, Any]) -> List[Dict]:
+    bibtex = make_bibliography(num_entries, **options)
+    parsed = Parser().parse(bibtex)
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, "bibliography.json")
+    clean_entries = min(num_entries, CLEAN_LIMIT)
+    clean_bib = Bibliography(parsed.entries[:clean_entries])
+    fake_dblp = DBLPSession(clean_bib)
+
+    cases = [
+        ("parse", lambda: bibtex, lambda text: Parser().parse(text)),
+        ("to_bibtex", lambda: parsed, lambda bib: bib.to_bibtex()),
+        ("to_json", lambda: parsed, lambda bib: bib.to_json(json_path)),
+        (
+            "abbreviate_names",
+            lambda: Parser().parse(bibtex),
+            lambda bib: bib.abbreviate_names(middle=True),
+        ),
+        (
+            "clean",
+            lambda: Cleaner(client=HTTPClient(crawl_delay=0, session=fake_dblp)),
+            lambda cleaner: cleaner.clean(clean_bib),
+        ),
+    ]
+    results = []
+    for name, setup, run in cases:
+        result = measure(run, setup, repeat)
+        entries = clean_entries if name == "clean" else num_entries
+        results.append(
+            {
+                "case": name,
+                "entries": entries,
+                "entries_per_second": entries / result["seconds"],
+                **result,
+            }
+        )
+    os.remove(json_path)
+    os.rmdir(directory)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict], previous: Optional[Dict] = None):
+    baseline = {}
+    if previous:
+        baseline = {(r["case"], r["entries"]): r for r in previous["results"]}
+    print(f"{'case':<18} {'entries':>8} {'seconds':>10} {'peak MB':>9} {'ratio':>7}")
+    for result in results:
+        old = baseline.get((result["case"], result["entries"]))
+        ratio = f"{result['seconds'] / old['seconds']:7.2f}" if old else f"{'':>7}"
+        print(
+            f"{result['case']:<18} {result['entries']:>8} {result['seconds']:>10.4f} "
+            f"{result['peak_mb']:>9.1f} {ratio}"
+        )
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    argument_parser.add_argument(
+        "--quick", action="store_true", help="small sizes only"
+    )
+    argument_parser.add_argument("--repeat", type=int, default=REPEAT)
+    argument_parser.add_argument("--seed", type=int, default=0)
+    argument_parser.add_argument("--authors", type=int, default=4)
+    argument_parser.add_argument("--field_length", type=int, default=12)
+    argument_parser.add_argument("--nonstandard", type=int, default=2)
+    argument_parser.add_argument("--single_line", action="store_true")
+    argument_parser.add_argument(
+        "--output",
+        default=os.path.join(
+            "benchmarks",
+            "results",
+            datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json",
+        ),
+    )
+    argument_parser.add_argument("--compare", help="results of an earlier run")
+    args = argument_parser.parse_args()
+
+    warnings.simplefilter("ignore")  # non-standard fields
+    options = {
+        "authors": args.authors,
+        "field_length": args.field_length,
+        "nonstandard": args.nonstandard,
+        "multiline": not args.single_line,
+        "seed": args.seed,
+    }
+    results = []
+    for size in QUICK_SIZES if args.quick else args.sizes:
+        results.extend(run_cases(size, args.repeat, options))
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)
+    print_results(results, previous)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as output_file:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "generator": options,
+                "results": results,
+            },
+            output_file,
+            indent=4,
+        )
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()